@@ -0,0 +1,161 @@
+"""CPU cost of the bot's per-response hot paths on large synthetic payloads.
+
+Payloads are generated from a fixed seed in the gateway's shapes: a
+/port/v1/positions response with thousands of positions and an
+infoprices/list response with hundreds of quotes. Each case reports the
+best of --repeat runs as milliseconds per payload and microseconds per
+item, so a regression in decoding, formatting or row building shows up as
+a bigger number here. --json saves the numbers for comparing runs;
+--profile writes a cProfile of the whole run.
+
+    python -m benchmarks.bench_cpu [--positions 5000] [--quotes 500] [--json out.json] [--profile out.prof]
+"""
+import argparse
+import contextlib
+import io
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+import requests
+
+from bot.account import print_positions_summary
+from bot.core import SaxoTradingBot
+from bot.execution import quotes_by_uic
+from bot.instruments import SEED
+from bot.utils import format_datetime
+
+
+def positions_payload(n, seed=1):
+    rng = random.Random(seed)
+    opened = datetime(2024, 3, 1, 8, 0, tzinfo=timezone.utc)
+    data = []
+    for i in range(n):
+        uic = rng.choice(list(SEED))
+        open_price = round(rng.uniform(0.8, 1.6), 5)
+        current = round(open_price * (1 + rng.gauss(0, 0.002)), 5)
+        amount = rng.choice((-1, 1)) * rng.randrange(1, 100) * 1000
+        ts = opened + timedelta(seconds=rng.randrange(30 * 86400), microseconds=rng.randrange(1_000_000))
+        pnl = round((current - open_price) * amount, 2)
+        data.append({
+            "PositionId": str(5_000_000 + i),
+            "NetPositionId": f"{uic}__FxSpot",
+            "DisplayAndFormat": {"Symbol": SEED[uic], "Decimals": 5, "Currency": SEED[uic][3:]},
+            "PositionBase": {
+                "Uic": uic, "AssetType": "FxSpot", "Amount": amount, "OpenPrice": open_price,
+                "SourceOrderId": str(7_000_000 + i), "Status": "Open", "CanBeClosed": True,
+                "ExecutionTimeOpen": ts.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+                "ValueDate": (ts + timedelta(days=2)).strftime("%Y-%m-%dT00:00:00.000000Z"),
+            },
+            "PositionView": {
+                "CurrentPrice": current, "CurrentPriceType": "Bid",
+                "ProfitLossOnTradeInBaseCurrency": pnl, "MarketValueInBaseCurrency": pnl,
+                "Exposure": amount, "ExposureCurrency": SEED[uic][:3],
+            },
+        })
+    return {"__count": n, "Data": data}
+
+
+def infoprices_payload(n, seed=2):
+    rng = random.Random(seed)
+    data = []
+    for uic in range(1, n + 1):
+        mid = rng.uniform(0.5, 160)
+        half = mid * rng.uniform(2e-6, 2e-5)
+        data.append({
+            "Uic": uic, "AssetType": "FxSpot", "LastUpdated": "2024-03-01T08:00:00.123000Z",
+            "PriceSource": "SBFX",
+            "DisplayAndFormat": {"Currency": "USD", "Decimals": 5, "Description": f"Pair {uic}", "Symbol": f"SIM{uic}"},
+            "Quote": {"Amount": 100000, "Ask": round(mid + half, 5), "Bid": round(mid - half, 5),
+                      "Mid": round(mid, 6), "DelayedByMinutes": 0, "ErrorCode": "None", "MarketState": "Open"},
+        })
+    return {"Data": data}
+
+
+def response(body):
+    """A requests.Response holding body, decoded the way SaxoClient decodes replies"""
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.headers["Content-Type"] = "application/json"
+    resp._content = body
+    return resp
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_cases(positions, quotes, repeat):
+    positions_body = json.dumps(positions_payload(positions)).encode()
+    prices_body = json.dumps(infoprices_payload(quotes)).encode()
+    positions_doc = json.loads(positions_body)
+    prices = quotes_by_uic([json.loads(prices_body)])
+    stamps = [p["PositionBase"]["ExecutionTimeOpen"] for p in positions_doc["Data"]]
+
+    bot = SaxoTradingBot("token", base_url="http://127.0.0.1:9", instrument_cache="/nonexistent/instruments.json",
+                         quote_feed="")
+    uics = sorted(prices)
+    bot.quotes.apply(prices.values())   # analytics has something to show for every row
+    prev_prices = {}
+    bot._ticker_rows(uics, prices, prev_prices, "08:00:00")
+
+    def print_summary():
+        with contextlib.redirect_stdout(io.StringIO()):
+            print_positions_summary(positions_doc)
+
+    def format_all():
+        for stamp in stamps:
+            format_datetime(stamp)
+
+    cases = [
+        ("decode positions (json.loads)", positions, lambda: json.loads(positions_body)),
+        ("decode positions (Response.json)", positions, lambda: response(positions_body).json()),
+        ("decode infoprices (Response.json)", quotes, lambda: response(prices_body).json()),
+        ("quotes_by_uic", quotes, lambda: quotes_by_uic([json.loads(prices_body)])),
+        ("print_positions_summary", positions, print_summary),
+        ("ticker rows (make_table)", quotes, lambda: bot._ticker_rows(uics, prices, prev_prices, "08:00:01")),
+        ("format_datetime", positions, format_all),
+    ]
+    results = {}
+    for name, items, fn in cases:
+        seconds = best_of(fn, repeat)
+        results[name] = {"items": items, "ms": seconds * 1e3, "us_per_item": seconds / items * 1e6}
+    bot.client.close()
+    return results, {"positions_bytes": len(positions_body), "infoprices_bytes": len(prices_body)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--positions", type=int, default=5000)
+    parser.add_argument("--quotes", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=7, help="runs per case; the best is reported")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    parser.add_argument("--profile", metavar="PATH", help="write a cProfile of the benchmark run")
+    args = parser.parse_args()
+
+    if args.profile:
+        from bot.profiling import profiled
+        with profiled(args.profile):
+            results, sizes = run_cases(args.positions, args.quotes, args.repeat)
+    else:
+        results, sizes = run_cases(args.positions, args.quotes, args.repeat)
+
+    print(f"{args.positions:,} positions ({sizes['positions_bytes'] / 1e6:.1f} MB), "
+          f"{args.quotes:,} quotes ({sizes['infoprices_bytes'] / 1e3:.0f} kB), best of {args.repeat}")
+    print(f"  {'case':<36}{'ms/payload':>12}{'µs/item':>10}")
+    for name, result in results.items():
+        print(f"  {name:<36}{result['ms']:>12.2f}{result['us_per_item']:>10.2f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"positions": args.positions, "quotes": args.quotes, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
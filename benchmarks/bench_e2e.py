@@ -0,0 +1,63 @@
+"""End-to-end latency of setup, ticker refresh and order placement.
+
+Runs offline against bot.simulator with injected latency, jitter and error
+rate, and reports p50/p99 per scenario.
+
+    python -m benchmarks.bench_e2e --latency 0.02 --jitter 0.005 --rounds 200
+"""
+import argparse
+import contextlib
+import io
+import statistics
+import time
+
+from bot.core import SaxoTradingBot
+from bot.scheduler import RequestScheduler
+from bot.simulator import SimulatorServer
+
+TICKER_UICS = [16, 21, 31, 22, 17]
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def timed(fn, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(name, samples):
+    print(f"{name:<22} p50 {percentile(samples, 50):8.2f} ms   p99 {percentile(samples, 99):8.2f} ms   "
+          f"mean {statistics.mean(samples):8.2f} ms   n={len(samples)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.005)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rounds", type=int, default=100)
+    args = parser.parse_args()
+
+    with SimulatorServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, seed=1) as server:
+        bot = SaxoTradingBot("token", base_url=server.base_url)
+        bot.client.scheduler = RequestScheduler.unlimited()
+        print(f"simulator latency {args.latency * 1000:.0f} ms ± {args.jitter * 1000:.0f} ms, "
+              f"error rate {args.error_rate:.1%}\n")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            setup = timed(bot.setup, max(args.rounds // 5, 5))
+        report("setup", setup)
+        report("ticker refresh (5)", timed(lambda: bot.get_prices(TICKER_UICS), args.rounds))
+        report("market order", timed(lambda: bot.place_market_order(21, 1000, "Buy"), args.rounds))
+        bot.client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Refresh latency of get_fx_prices for 5, 50 and 500 instruments.
+
+Runs offline against a local HTTP stand-in for /trade/v1/infoprices/list
+whose response time grows with the number of Uics requested, and which
+returns quotes in shuffled order. Compares one request for every Uic
+against the chunked, concurrent fetch.
+
+    python -m benchmarks.bench_prices
+"""
+import json
+import random
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from bot.client import SaxoClient
+from bot.execution import PRICE_CHUNK_SIZE, get_fx_prices
+from bot.scheduler import RequestScheduler
+
+BASE_LATENCY = 0.020   # seconds per request (network round-trip)
+PER_UIC_LATENCY = 0.0002  # seconds per quote priced and serialized
+SIZES = (5, 50, 500)
+ROUNDS = 10
+
+
+class InfoPricesHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        uics = [int(uic) for uic in query["Uics"][0].split(",")]
+        time.sleep(BASE_LATENCY + PER_UIC_LATENCY * len(uics))
+
+        data = [{"Uic": uic, "Quote": {"Bid": 1.0, "Ask": 1.0002, "Mid": 1.0001}} for uic in uics]
+        random.shuffle(data)
+        body = json.dumps({"Data": data}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def measure(client, uics, chunk_size):
+    timings = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        quotes = get_fx_prices(client, "acc", uics, chunk_size=chunk_size)
+        timings.append(time.perf_counter() - start)
+        assert len(quotes) == len(uics)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), InfoPricesHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = SaxoClient("token", base_url=f"http://127.0.0.1:{server.server_port}",
+                        scheduler=RequestScheduler.unlimited())
+
+    print(f"{'instruments':>12} {'single (ms)':>12} {'chunked (ms)':>13}")
+    for size in SIZES:
+        uics = list(range(1, size + 1))
+        single = measure(client, uics, chunk_size=size)
+        chunked = measure(client, uics, chunk_size=PRICE_CHUNK_SIZE)
+        print(f"{size:>12} {single:>12.1f} {chunked:>13.1f}")
+
+    client.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Overhead the pre-trade risk check adds to the order path.
+
+Times RiskEngine.check (plus the release that undoes it) on its own, then
+place_market_order against a no-op client with and without a risk engine,
+so the network is out of the picture.
+
+    python -m benchmarks.bench_risk [iterations]
+"""
+import sys
+import time
+
+from bot.execution import place_market_order
+from bot.risk import RiskEngine
+
+INSTRUMENTS = {16: "EUR/DKK", 21: "EUR/USD", 31: "USD/JPY", 22: "GBP/USD", 17: "EUR/GBP"}
+
+
+class NullClient:
+    def __init__(self, risk=None):
+        self.risk = risk
+
+    def post(self, path, json=None):
+        return {"OrderId": "1"}
+
+
+def per_call_us(fn, n):
+    start = time.perf_counter()
+    for i in range(n):
+        fn(i)
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    risk = RiskEngine(max_uic_exposure=float("inf"), max_currency_exposure=float("inf"), instruments=INSTRUMENTS)
+    for uic in INSTRUMENTS:
+        risk.on_quote(uic, {"Mid": 1.1})
+    uics = list(INSTRUMENTS)
+
+    def check(i):
+        risk.release(risk.check(uics[i % 5], 100000, "Buy" if i % 2 else "Sell", price=1.1))
+
+    bare, guarded = NullClient(), NullClient(risk)
+
+    def order(client):
+        return lambda i: place_market_order(client, "acc", uics[i % 5], 100000, "Buy" if i % 2 else "Sell")
+
+    check_us = per_call_us(check, n)
+    bare_us = per_call_us(order(bare), n)
+    guarded_us = per_call_us(order(guarded), n)
+
+    print(f"{n:,} iterations")
+    print(f"  check + release        {check_us:6.2f} µs")
+    print(f"  order path, no risk    {bare_us:6.2f} µs")
+    print(f"  order path, with risk  {guarded_us:6.2f} µs  (+{guarded_us - bare_us:.2f} µs)")
+
+
+if __name__ == "__main__":
+    main()
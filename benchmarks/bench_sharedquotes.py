@@ -0,0 +1,44 @@
+"""Read and publish latency of the shared-memory quote book.
+
+    python -m benchmarks.bench_sharedquotes [iterations]
+"""
+import os
+import sys
+import time
+
+from bot.sharedquotes import SharedQuoteReader, SharedQuoteWriter
+
+INSTRUMENTS = 500
+
+
+def per_call_us(fn, n):
+    start = time.perf_counter()
+    for i in range(n):
+        fn(i)
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    writer = SharedQuoteWriter(f"fxbot-bench-{os.getpid()}")
+    reader = SharedQuoteReader(writer.name)
+    try:
+        for uic in range(1, INSTRUMENTS + 1):
+            writer.publish(uic, {"Bid": 1.08, "Ask": 1.0802})
+        reader.uics()
+
+        publish_us = per_call_us(lambda i: writer.publish(i % INSTRUMENTS + 1, {"Bid": 1.08, "Ask": 1.0802}), n)
+        read_us = per_call_us(lambda i: reader.read(i % INSTRUMENTS + 1), n)
+        get_us = per_call_us(lambda i: reader.get(i % INSTRUMENTS + 1), n)
+
+        print(f"{n:,} operations over {INSTRUMENTS} instruments")
+        print(f"  publish          {publish_us:6.3f} µs")
+        print(f"  read (tuple)     {read_us:6.3f} µs")
+        print(f"  get (dict)       {get_us:6.3f} µs")
+    finally:
+        reader.close()
+        writer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,30 @@
-import requests
 from .utils import format_datetime
 
-BASE_URL = "https://gateway.saxobank.com/sim/openapi"
 
+def get_user_info(client):
+    return client.get("/port/v1/users/me")
 
-def get_user_info(headers):
-    url = f"{BASE_URL}/port/v1/users/me"
-    return requests.get(url, headers=headers).json()
+def get_client_info(client):
+    return client.get("/port/v1/clients/me")
 
-def get_client_info(headers):
-    url = f"{BASE_URL}/port/v1/clients/me"
-    return requests.get(url, headers=headers).json()
+def get_accounts(client):
+    return client.get("/port/v1/accounts/me")
 
-def get_accounts(headers):
-    url = f"{BASE_URL}/port/v1/accounts/me"
-    return requests.get(url, headers=headers).json()
+def get_balance(client, client_key, account_key):
+    params = {"ClientKey": client_key, "AccountKey": account_key}
+    return client.get("/port/v1/balances", params=params)
 
-def get_balance(headers, client_key, account_key):
-    url = f"{BASE_URL}/port/v1/balances?ClientKey={client_key}&AccountKey={account_key}"
-    return requests.get(url, headers=headers).json()
+def get_positions(client, client_key):
+    params = {"ClientKey": client_key, "FieldGroups": "DisplayAndFormat,PositionBase,PositionView"}
+    return client.get("/port/v1/positions", params=params)
 
-def get_positions(headers, client_key):
-    url = f"{BASE_URL}/port/v1/positions?ClientKey={client_key}&FieldGroups=DisplayAndFormat,PositionBase,PositionView"
-    return requests.get(url, headers=headers).json()
+def get_orders(client, client_key):
+    params = {"ClientKey": client_key, "FieldGroups": "DisplayAndFormat"}
+    return client.get("/port/v1/orders", params=params)
+
+def get_order_activities(client, client_key, order_id):
+    params = {"ClientKey": client_key, "OrderId": order_id}
+    return client.get("/cs/v1/audit/orderactivities", params=params)
 
 def print_balance_summary(balance):
     print("\nAccount Balance Summary:")
@@ -0,0 +1,164 @@
+"""Asyncio mirror of the account and execution helpers.
+
+The helpers in account.py and execution.py only build a request and return
+whatever ``client.get/post/patch`` returns, so handing them an
+AsyncSaxoClient yields an awaitable. The coroutines below wrap them so the
+request shapes stay defined in one place. get_fx_prices post-processes its
+responses, so its chunked fetch is rebuilt here on asyncio.gather.
+"""
+import asyncio
+import json as json_module
+import time
+
+import aiohttp
+
+from . import account, execution
+from .client import BASE_URL, POOL_SIZE, RETRY_STATUSES, timeout_for
+from .metrics import Metrics, aiohttp_phases, aiohttp_trace_config
+from .scheduler import RequestScheduler, group_for
+
+
+class AsyncSaxoClient:
+    """aiohttp counterpart of SaxoClient. Use as ``async with``; the session is bound to the running loop."""
+
+    def __init__(self, access_token=None, base_url=BASE_URL, pool_size=POOL_SIZE, max_retries=3, backoff_factor=0.2,
+                 headers=None, metrics=None, scheduler=None, risk=None):
+        self.base_url = base_url.rstrip("/")
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.scheduler = scheduler if scheduler is not None else RequestScheduler()
+        self.risk = risk
+        self._inflight = {}
+        self.headers = headers or {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json"
+        }
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.session = None
+
+    @classmethod
+    def from_client(cls, client, **kwargs):
+        """Build an async client sharing a SaxoClient's base URL, headers, metrics, scheduler and risk engine"""
+        return cls(base_url=client.base_url, headers=dict(client.headers), metrics=client.metrics,
+                   scheduler=client.scheduler, risk=getattr(client, "risk", None), **kwargs)
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=30)
+        self.session = aiohttp.ClientSession(headers=self.headers, connector=connector,
+                                             trace_configs=[aiohttp_trace_config()])
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def request(self, method, path, params=None, json=None):
+        if method != "GET":
+            return await self._send(method, path, params, json)
+
+        # Identical GETs already in flight share that response
+        key = (path, tuple(sorted((params or {}).items())))
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.ensure_future(self._send(method, path, params, json))
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _acquire(self, group):
+        if not self.scheduler.try_acquire(group):
+            await asyncio.to_thread(self.scheduler.acquire, group)
+
+    async def _send(self, method, path, params, json):
+        group = group_for(path)
+        connect, read = timeout_for(path)
+        timeout = aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+        # Mirror SaxoClient: only idempotent GETs are retried
+        attempts = self.max_retries + 1 if method == "GET" else 1
+
+        for attempt in range(attempts):
+            last = attempt == attempts - 1
+            marks = {}
+            await self._acquire(group)
+            start = time.perf_counter()
+            try:
+                async with self.session.request(method, self.base_url + path, params=params, json=json,
+                                                timeout=timeout, trace_request_ctx=marks) as resp:
+                    body = await resp.read()
+                    dns, connect, ttfb = aiohttp_phases(marks)
+                    self.metrics.record(method, path, time.perf_counter() - start, status=resp.status,
+                                        dns=dns, connect=connect, ttfb=ttfb,
+                                        sent=len(json_module.dumps(json)) if json is not None else 0,
+                                        received=len(body))
+                    self.scheduler.observe(group, resp.status, resp.headers)
+                    if resp.status == 429 and not last:
+                        continue  # observe() paused the group until the window resets
+                    if resp.status in RETRY_STATUSES and not last:
+                        await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+                        continue
+                    return json_module.loads(body) if body else None
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                dns, connect, _ = aiohttp_phases(marks)
+                self.metrics.record(method, path, time.perf_counter() - start, dns=dns, connect=connect)
+                if last:
+                    raise
+                await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+
+    async def get(self, path, params=None):
+        return await self.request("GET", path, params=params)
+
+    async def post(self, path, json=None):
+        return await self.request("POST", path, json=json)
+
+    async def patch(self, path, json=None):
+        return await self.request("PATCH", path, json=json)
+
+    async def delete(self, path, params=None):
+        return await self.request("DELETE", path, params=params)
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+
+async def get_user_info(client):
+    return await account.get_user_info(client)
+
+async def get_client_info(client):
+    return await account.get_client_info(client)
+
+async def get_accounts(client):
+    return await account.get_accounts(client)
+
+async def get_balance(client, client_key, account_key):
+    return await account.get_balance(client, client_key, account_key)
+
+async def get_positions(client, client_key):
+    return await account.get_positions(client, client_key)
+
+async def get_orders(client, client_key):
+    return await account.get_orders(client, client_key)
+
+async def get_order_activities(client, client_key, order_id):
+    return await account.get_order_activities(client, client_key, order_id)
+
+async def get_fx_prices(client, account_key, uics, chunk_size=execution.PRICE_CHUNK_SIZE):
+    responses = await asyncio.gather(*(
+        client.get(execution.INFOPRICES_PATH, params=execution.price_params(account_key, chunk))
+        for chunk in execution.chunked(uics, chunk_size)
+    ))
+    return execution.quotes_by_uic(responses)
+
+async def place_limit_order(client, account_key, uic, price, amount=100000, buy_sell="Buy",
+                            duration="GoodTillCancel"):
+    return await execution.place_limit_order(client, account_key, uic, price, amount=amount, buy_sell=buy_sell,
+                                             duration=duration)
+
+async def place_market_order(client, account_key, uic, amount, buy_sell="Sell"):
+    return await execution.place_market_order(client, account_key, uic, amount, buy_sell=buy_sell)
+
+async def convert_to_market_order(client, account_key, order_id, uic):
+    return await execution.convert_to_market_order(client, account_key, order_id, uic)
+
+async def cancel_order(client, account_key, order_id):
+    return await execution.cancel_order(client, account_key, order_id)
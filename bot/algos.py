@@ -0,0 +1,389 @@
+"""Execution algorithms that work a parent order through child orders.
+
+An algo is a small state machine over a broker with SimulatedBroker's call
+shapes (place_limit_order, place_market_order, convert_to_market_order,
+cancel_order, order_status, touch, mid). Drive it with step(now) until
+done: from run() against the gateway via GatewayBroker, or from each tick
+of backtest.replay against a SimulatedBroker, with no network at all.
+
+    TWAP              equal slices at evenly spaced times
+    Iceberg           one visible clip resting at a time
+    LimitThenMarket   rest a single limit, cross the spread if it times out
+
+Limit children join the near touch (bid for a buy, ask for a sell) unless
+given a price. A child still working `timeout` seconds after it was placed
+is converted to market with convert_to_market_order. report() gives the
+average fill against the arrival mid as implementation shortfall.
+"""
+import math
+import time
+from abc import ABC, abstractmethod
+
+from . import account, execution
+from .pnl import fill_price
+from .risk import RiskError
+
+
+# Order activity statuses that end an order
+FINAL_ACTIVITIES = ("FinalFill", "Cancelled", "Expired")
+
+
+def round_to_tick(price, tick, buy_sell):
+    """price on the tick grid, rounded to the passive side: down for a buy, up for a sell"""
+    if not tick:
+        return price
+    ticks = price / tick
+    ticks = math.floor(ticks + 1e-9) if buy_sell == "Buy" else math.ceil(ticks - 1e-9)
+    # Round away the binary noise of ticks * tick so the gateway sees e.g. 1.08418, not 1.0841800000000001
+    return round(ticks * tick, max(0, -math.floor(math.log10(tick))) + 2)
+
+
+def split(amount, parts, lot=1000):
+    """amount as `parts` child sizes in whole lots, the remainder on the last"""
+    lots = int(amount) // lot
+    parts = max(1, min(int(parts), lots or 1))
+    sizes = [lots // parts * lot + (lot if i < lots % parts else 0) for i in range(parts)]
+    sizes[-1] += int(amount) - lots * lot
+    return [size for size in sizes if size > 0]
+
+
+class GatewayBroker:
+    """SimulatedBroker call shapes over the Saxo gateway, for running an algo live.
+
+    quote(uic) returns a {'Bid', 'Ask', 'Mid'} dict. Working orders are read
+    from /port/v1/orders at most once per status_ttl seconds. An order that
+    has left that list is settled from its order activities: FinalFill is a
+    fill (a netted fill opens no position, so positions cannot tell), a
+    Cancelled or Expired one was pulled. One with neither on record after
+    max_missing polls is written off as Rejected, which stops the algo
+    rather than resending an amount that may have filled.
+    on_fill(uic, amount, buy_sell, response) runs per fill, e.g.
+    bot.record_order.
+    """
+
+    def __init__(self, client, account_key, client_key, quote, on_fill=None, status_ttl=1.0, clock=time.time,
+                 instruments=None, max_missing=2):
+        self.client = client
+        self.account_key = account_key
+        self.client_key = client_key
+        self.quote = quote
+        self.instruments = instruments   # InstrumentCache for tick sizes
+        self.on_fill = on_fill
+        self.status_ttl = status_ttl
+        self.clock = clock
+        self.max_missing = max_missing
+        self.orders = {}     # OrderId -> order dict, same fields as SimulatedBroker
+        self._open_at = None
+        self._missing = {}   # OrderId -> consecutive polls absent from /port/v1/orders
+
+    def _error(self, code, message):
+        return {"ErrorInfo": {"ErrorCode": code, "Message": message}}
+
+    def _submit(self, send, uic, amount, buy_sell, order_type, price=None):
+        try:
+            resp = send()
+        except RiskError as e:
+            return self._error(f"Risk.{e.reason}", str(e))
+        if not isinstance(resp, dict) or "OrderId" not in resp or resp.get("ErrorInfo"):
+            return resp
+        order = {"OrderId": resp["OrderId"], "Uic": uic, "Amount": amount, "BuySell": buy_sell,
+                 "OrderType": order_type, "OrderPrice": price, "Status": "Working",
+                 "FilledAmount": 0, "FillPrice": None}
+        self.orders[order["OrderId"]] = order
+        if order_type == "Market":
+            self._filled(order, fill_price(resp, buy_sell, self.quote(uic)))
+        self._open_at = None
+        return resp
+
+    def _filled(self, order, price):
+        order.update(Status="Filled", FilledAmount=order["Amount"], FillPrice=price)
+        if self.on_fill is not None:
+            self.on_fill(order["Uic"], order["Amount"], order["BuySell"],
+                         {"OrderId": order["OrderId"], "ExecutionPrice": price})
+
+    def _release(self, order):
+        """Hand back the risk engine's reservation for an order that will never fill"""
+        risk = getattr(self.client, "risk", None)
+        if risk is None:
+            return
+        signed = order["Amount"] if order["BuySell"] == "Buy" else -order["Amount"]
+        risk.release((order["Uic"], signed, order["OrderPrice"] or self.mid(order["Uic"])))
+
+    def _sync(self):
+        now = self.clock()
+        if self._open_at is not None and now - self._open_at < self.status_ttl:
+            return
+        resp = account.get_orders(self.client, self.client_key) or {}
+        open_ids = {item.get("OrderId") for item in resp.get("Data", [])}
+        self._open_at = now
+        gone = [order for order in self.orders.values()
+                if order["Status"] == "Working" and order["OrderId"] not in open_ids]
+        if not gone:
+            return
+        # Leaving the order list is not a fill by itself: the gateway also drops rejected,
+        # expired and cancelled orders. The order's own activity log says which it was.
+        for order in gone:
+            order_id = order["OrderId"]
+            resp = account.get_order_activities(self.client, self.client_key, order_id) or {}
+            final = [row for row in resp.get("Data", []) if row.get("Status") in FINAL_ACTIVITIES]
+            if final:
+                self._missing.pop(order_id, None)
+                if final[-1]["Status"] == "FinalFill":
+                    price = final[-1].get("ExecutionPrice") or order["OrderPrice"]
+                    self._filled(order, price or fill_price(None, order["BuySell"], self.quote(order["Uic"])))
+                else:
+                    order["Status"] = "Cancelled"
+                    self._release(order)
+                continue
+            self._missing[order_id] = self._missing.get(order_id, 0) + 1
+            if self._missing[order_id] >= self.max_missing:
+                order["Status"] = "Rejected"
+                del self._missing[order_id]
+                self._release(order)
+
+    def tick_size(self, uic):
+        return self.instruments.tick_size(uic) if self.instruments is not None else None
+
+    def touch(self, uic):
+        quote = self.quote(uic)
+        return quote.get("Bid") or quote.get("Mid"), quote.get("Ask") or quote.get("Mid")
+
+    def mid(self, uic):
+        bid, ask = self.touch(uic)
+        return (bid + ask) / 2
+
+    def place_market_order(self, uic, amount, buy_sell="Sell"):
+        return self._submit(lambda: execution.place_market_order(self.client, self.account_key, uic, amount,
+                                                                 buy_sell=buy_sell),
+                            uic, amount, buy_sell, "Market")
+
+    def place_limit_order(self, uic, price, amount=100000, buy_sell="Buy"):
+        # Day orders: a child the algo loses track of must not rest past the session
+        return self._submit(lambda: execution.place_limit_order(self.client, self.account_key, uic, price,
+                                                                amount=amount, buy_sell=buy_sell,
+                                                                duration="DayOrder"),
+                            uic, amount, buy_sell, "Limit", price)
+
+    def convert_to_market_order(self, order_id, uic):
+        order = self.orders.get(order_id)
+        if order is None or order["Status"] != "Working":
+            return self._error("OrderNotFound", f"No working order {order_id}")
+        resp = execution.convert_to_market_order(self.client, self.account_key, order_id, uic)
+        if isinstance(resp, dict) and resp.get("ErrorInfo"):
+            return resp
+        order["OrderType"] = "Market"
+        self._open_at = None
+        return resp or {"OrderId": order_id}
+
+    def cancel_order(self, order_id):
+        order = self.orders.get(order_id)
+        if order is None or order["Status"] != "Working":
+            return self._error("OrderNotFound", f"No working order {order_id}")
+        resp = execution.cancel_order(self.client, self.account_key, order_id)
+        if isinstance(resp, dict) and resp.get("ErrorInfo"):
+            return resp
+        order["Status"] = "Cancelled"
+        self._release(order)
+        return resp or {"OrderId": order_id}
+
+    def order_status(self, order_id):
+        order = self.orders.get(order_id)
+        if order is not None and order["Status"] == "Working":
+            self._sync()
+        return order
+
+
+class ExecutionAlgo(ABC):
+    """Parent order worked through child orders; call step(now) until done"""
+
+    def __init__(self, broker, uic, amount, buy_sell, timeout=None, price=None):
+        if buy_sell not in ("Buy", "Sell"):
+            raise ValueError(f"BuySell must be 'Buy' or 'Sell', got {buy_sell!r}")
+        if amount <= 0:
+            raise ValueError("amount must be positive")
+        self.broker = broker
+        self.uic = uic
+        self.amount = amount
+        self.buy_sell = buy_sell
+        self.timeout = timeout   # seconds before a working child is converted to market; None rests forever
+        self.price = price       # limit price for children; None joins the near touch
+        self.children = []       # {'OrderId', 'Amount', 'OrderType', 'Placed', 'Converted', 'Status', 'FillPrice'}
+        self.arrival = None
+        self.started = None
+        self.finished = None
+        self.error = None
+
+    @property
+    def filled(self):
+        return sum(child["Amount"] for child in self.children if child["Status"] == "Filled")
+
+    @property
+    def working(self):
+        return [child for child in self.children if child["Status"] == "Working"]
+
+    @property
+    def remaining(self):
+        """Amount neither filled nor resting in a working child"""
+        return self.amount - self.filled - sum(child["Amount"] for child in self.working)
+
+    @property
+    def done(self):
+        return self.finished is not None
+
+    def step(self, now):
+        """Poll working children, convert the timed-out ones, and send whatever is due"""
+        if self.done:
+            return
+        if self.started is None:
+            self.started = now
+            self.arrival = self.broker.mid(self.uic)
+        for child in self.working:
+            if self.timeout is not None and not child["Converted"] and now - child["Placed"] >= self.timeout:
+                resp = self.broker.convert_to_market_order(child["OrderId"], self.uic)
+                child["Converted"] = True
+                if isinstance(resp, dict) and resp.get("ErrorInfo"):
+                    self.error = resp
+            self._refresh(child)
+        if self.error is None and self.remaining > 0:
+            self._schedule(now)
+        if not self.working and (self.remaining <= 0 or self.error is not None):
+            self.finished = now
+
+    @abstractmethod
+    def _schedule(self, now):
+        """Send whatever child orders are due at now"""
+
+    def _refresh(self, child):
+        order = self.broker.order_status(child["OrderId"]) or {}
+        if order.get("Status") in ("Filled", "Cancelled", "Rejected"):
+            child.update(Status=order["Status"], FillPrice=order.get("FillPrice"))
+        if order.get("Status") == "Rejected":
+            self.error = {"ErrorInfo": {"ErrorCode": "OrderRejected",
+                                        "Message": f"Order {child['OrderId']} left the order list with no fill "
+                                                   "or cancel on record"}}
+
+    def limit_price(self):
+        if self.price is not None:
+            price = self.price
+        else:
+            bid, ask = self.broker.touch(self.uic)
+            price = bid if self.buy_sell == "Buy" else ask
+        return round_to_tick(price, self.broker.tick_size(self.uic), self.buy_sell)
+
+    def send(self, now, amount, order_type="Limit"):
+        """Place one child; a rejection stops the algo with the response in .error"""
+        if order_type == "Limit":
+            price = self.limit_price()
+            resp = self.broker.place_limit_order(self.uic, price, amount=amount, buy_sell=self.buy_sell)
+        else:
+            price = None
+            resp = self.broker.place_market_order(self.uic, amount, buy_sell=self.buy_sell)
+        if not isinstance(resp, dict) or "OrderId" not in resp or resp.get("ErrorInfo"):
+            self.error = resp
+            return None
+        child = {"OrderId": resp["OrderId"], "Amount": amount, "OrderType": order_type, "Price": price,
+                 "Placed": now, "Converted": False, "Status": "Working", "FillPrice": None}
+        self.children.append(child)
+        self._refresh(child)
+        return child
+
+    def cancel(self, now):
+        """Pull every working child and stop; the unfilled rest counts as opportunity cost"""
+        for child in self.working:
+            self.broker.cancel_order(child["OrderId"])
+            self._refresh(child)
+        self.finished = now
+
+    def report(self):
+        """Fills and implementation shortfall against the arrival mid.
+
+        shortfall_bps and execution_cost are signed so that positive is a
+        cost: paid above arrival on a buy, sold below it on a sell.
+        Unfilled amount is marked at the current mid as opportunity_cost.
+        Costs are in the instrument's quote currency.
+        """
+        filled = [child for child in self.children if child["Status"] == "Filled"]
+        amount = sum(child["Amount"] for child in filled)
+        side = 1 if self.buy_sell == "Buy" else -1
+        average = sum(child["Amount"] * child["FillPrice"] for child in filled) / amount if amount else None
+
+        execution_cost = side * (average - self.arrival) * amount if amount else 0.0
+        unfilled = self.amount - amount
+        end = self.finished if self.finished is not None else self.started
+        opportunity_cost = 0.0
+        if unfilled and self.arrival is not None:
+            opportunity_cost = side * (self.broker.mid(self.uic) - self.arrival) * unfilled
+        return {
+            "uic": self.uic,
+            "buy_sell": self.buy_sell,
+            "amount": self.amount,
+            "filled": amount,
+            "average_price": average,
+            "arrival_mid": self.arrival,
+            "shortfall_bps": side * (average - self.arrival) / self.arrival * 1e4 if amount else None,
+            "execution_cost": execution_cost,
+            "opportunity_cost": opportunity_cost,
+            "total_cost": execution_cost + opportunity_cost,
+            "children": len(self.children),
+            "converted": sum(1 for child in self.children if child["Converted"]),
+            "elapsed": end - self.started if self.started is not None else 0.0,
+            "error": self.error,
+        }
+
+
+class TWAP(ExecutionAlgo):
+    """amount in `slices` children, one every duration/slices seconds from the first step.
+
+    Each limit child converts to market when the next one is due (or after
+    timeout, if shorter), so the schedule completes in about `duration`.
+    """
+
+    def __init__(self, broker, uic, amount, buy_sell, duration, slices, order_type="Limit", timeout=None,
+                 price=None, lot=1000):
+        self.sizes = split(amount, slices, lot)
+        self.interval = duration / len(self.sizes)
+        self.order_type = order_type
+        timeout = self.interval if timeout is None else min(timeout, self.interval)
+        super().__init__(broker, uic, amount, buy_sell, timeout=timeout, price=price)
+        self.sent = 0
+
+    def _schedule(self, now):
+        while self.sent < len(self.sizes) and now >= self.started + self.sent * self.interval:
+            if self.send(now, self.sizes[self.sent], self.order_type) is None:
+                return
+            self.sent += 1
+
+
+class Iceberg(ExecutionAlgo):
+    """Show at most `display` at a time; the next clip goes out when the last one fills"""
+
+    def __init__(self, broker, uic, amount, buy_sell, display, price=None, timeout=None):
+        if display <= 0:
+            raise ValueError("display must be positive")
+        super().__init__(broker, uic, amount, buy_sell, timeout=timeout, price=price)
+        self.display = display
+
+    def _schedule(self, now):
+        if not self.working:
+            self.send(now, min(self.display, self.remaining))
+
+
+class LimitThenMarket(Iceberg):
+    """One limit for the whole amount, converted to market if still working after timeout"""
+
+    def __init__(self, broker, uic, amount, buy_sell, timeout, price=None):
+        super().__init__(broker, uic, amount, buy_sell, display=amount, price=price, timeout=timeout)
+
+
+def run(algo, interval=0.5, clock=time.time, sleep=time.sleep, on_step=None):
+    """Step algo on the wall clock until it finishes; Ctrl+C cancels the working children"""
+    try:
+        while not algo.done:
+            algo.step(clock())
+            if on_step is not None:
+                on_step(algo)
+            if not algo.done:
+                sleep(interval)
+    except KeyboardInterrupt:
+        algo.cancel(clock())
+    return algo.report()
@@ -0,0 +1,153 @@
+"""Rolling per-instrument quote analytics in fixed-size ring buffers.
+
+Each Uic gets one row in preallocated NumPy arrays: a ring of the last
+``capacity`` mids and timestamps, per-minute high/low buckets for the last
+``window_minutes``, and running spread, EWMA volatility and decayed tick
+rate. An update writes a few array cells and allocates nothing that
+outlives it, so memory stays flat over an all-day session; rows are only
+added (in blocks) when a new instrument first quotes.
+"""
+import math
+import threading
+import time
+
+import numpy as np
+
+SPARK = "▁▂▃▄▅▆▇█"
+
+
+def pip_size(decimals):
+    """Pip for a quote shown with decimals places: 5 -> 0.0001, 3 -> 0.01 (last digit is a fractional pip)"""
+    return 10.0 ** -(decimals - 1) if decimals in (3, 5) else 10.0 ** -decimals
+
+
+class TickAnalytics:
+    """Per-Uic ring buffers of recent mids with O(1) rolling statistics"""
+
+    def __init__(self, instruments=None, capacity=256, window_minutes=5, vol_alpha=0.06, rate_tau=60.0,
+                 rows=64):
+        self.instruments = instruments if instruments is not None else {}
+        self.capacity = capacity
+        self.window_minutes = window_minutes
+        self.vol_alpha = vol_alpha   # EWMA weight of the newest squared log return
+        self.rate_tau = rate_tau     # seconds over which the tick rate decays
+        self._rows = {}
+        self._lock = threading.Lock()
+        self._allocate(rows)
+
+    def _allocate(self, rows):
+        cap, window = self.capacity, self.window_minutes
+        self.mids = np.full((rows, cap), np.nan)
+        self.stamps = np.zeros((rows, cap))
+        self.head = np.zeros(rows, dtype=np.int64)     # next ring slot to write
+        self.count = np.zeros(rows, dtype=np.int64)
+        self.last_mid = np.full(rows, np.nan)
+        self.last_ts = np.zeros(rows)
+        self.spread = np.full(rows, np.nan)            # in pips
+        self.pip = np.full(rows, 1e-4)
+        self.var = np.zeros(rows)                      # EWMA of squared log returns
+        self.rate = np.zeros(rows)                     # decayed ticks per second at last_ts
+        self.minute = np.full((rows, window), -1, dtype=np.int64)
+        self.high = np.full((rows, window), np.nan)
+        self.low = np.full((rows, window), np.nan)
+
+    def _grow(self):
+        extra = len(self.head)
+        old = {name: getattr(self, name) for name in ("mids", "stamps", "head", "count", "last_mid", "last_ts",
+                                                      "spread", "pip", "var", "rate", "minute", "high", "low")}
+        self._allocate(extra)
+        for name, array in old.items():
+            setattr(self, name, np.concatenate([array, getattr(self, name)]))
+
+    def _row(self, uic):
+        row = self._rows.get(uic)
+        if row is None:
+            row = len(self._rows)
+            if row == len(self.head):
+                self._grow()
+            decimals = getattr(self.instruments, "decimals", None)
+            self.pip[row] = pip_size(decimals(uic) if decimals else 5)
+            self._rows[uic] = row
+        return row
+
+    def on_quote(self, uic, quote, now=None):
+        """QuoteBook listener: fold one quote into the Uic's ring and running stats"""
+        bid, ask = quote.get("Bid"), quote.get("Ask")
+        mid = quote.get("Mid")
+        if not mid and bid and ask:
+            mid = (bid + ask) / 2
+        if not mid:
+            return
+        now = time.time() if now is None else now
+        with self._lock:
+            row = self._row(uic)
+            last = self.last_mid[row]
+            if last == last:  # not NaN: we have a previous tick
+                ret = math.log(mid / last)
+                self.var[row] += self.vol_alpha * (ret * ret - self.var[row])
+                decay = math.exp(-(now - self.last_ts[row]) / self.rate_tau)
+                self.rate[row] = self.rate[row] * decay + 1 / self.rate_tau
+            else:
+                self.rate[row] = 1 / self.rate_tau
+            self.last_mid[row] = mid
+            self.last_ts[row] = now
+            if bid and ask:
+                self.spread[row] = (ask - bid) / self.pip[row]
+
+            slot = self.head[row]
+            self.mids[row, slot] = mid
+            self.stamps[row, slot] = now
+            self.head[row] = (slot + 1) % self.capacity
+            if self.count[row] < self.capacity:
+                self.count[row] += 1
+
+            minute = int(now // 60)
+            bucket = minute % self.window_minutes
+            if self.minute[row, bucket] != minute:
+                self.minute[row, bucket] = minute
+                self.high[row, bucket] = mid
+                self.low[row, bucket] = mid
+            elif mid > self.high[row, bucket]:
+                self.high[row, bucket] = mid
+            elif mid < self.low[row, bucket]:
+                self.low[row, bucket] = mid
+
+    def history(self, uic, n=None):
+        """Up to n most recent mids for uic, oldest first (a new array)"""
+        with self._lock:
+            row = self._rows.get(uic)
+            if row is None:
+                return np.empty(0)
+            count = int(self.count[row]) if n is None else min(n, int(self.count[row]))
+            index = (self.head[row] - count + np.arange(count)) % self.capacity
+            return self.mids[row, index]
+
+    def stats(self, uic, now=None):
+        """{'spread_pips', 'vol_bp', 'tick_rate', 'high', 'low', 'ticks'} for uic, or None if never quoted"""
+        now = time.time() if now is None else now
+        with self._lock:
+            row = self._rows.get(uic)
+            if row is None:
+                return None
+            recent = self.minute[row] > int(now // 60) - self.window_minutes
+            high = float(self.high[row, recent].max()) if recent.any() else None
+            low = float(self.low[row, recent].min()) if recent.any() else None
+            return {
+                "spread_pips": float(self.spread[row]),
+                "vol_bp": math.sqrt(self.var[row]) * 1e4,
+                "tick_rate": float(self.rate[row] * math.exp(-(now - self.last_ts[row]) / self.rate_tau)),
+                "high": high,
+                "low": low,
+                "ticks": int(self.count[row]),
+            }
+
+    def sparkline(self, uic, width=20):
+        """The last width mids as block characters scaled between their min and max"""
+        mids = self.history(uic, width)
+        if len(mids) < 2:
+            return ""
+        low, high = mids.min(), mids.max()
+        if high == low:
+            return SPARK[len(SPARK) // 2 - 1] * len(mids)
+        levels = ((mids - low) / (high - low) * (len(SPARK) - 1)).round().astype(int)
+        return "".join(SPARK[level] for level in levels)
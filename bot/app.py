@@ -0,0 +1,221 @@
+"""Asyncio trading terminal built on textual.
+
+Market-data refresh, position refresh and order entry are independent
+tasks on one event loop, all talking to the gateway through
+AsyncSaxoClient. Orders go out while the quote table keeps updating, and
+no handler ever waits on the network.
+
+Commands typed into the prompt:
+    buy <uic> <amount>      sell <uic> <amount>
+    watch <uic,uic,...>     quit
+"""
+import asyncio
+import time
+from datetime import datetime
+
+from rich.text import Text
+from textual.app import App, ComposeResult
+from textual.containers import Horizontal
+from textual.widgets import DataTable, Footer, Header, Input, RichLog
+
+from . import aio
+
+QUOTE_COLUMNS = ("Symbol", "Bid", "Ask", "Mid", "Change", "Time")
+POSITION_COLUMNS = ("Symbol", "Size", "Open", "Current", "P&L")
+
+
+class TradingApp(App):
+    TITLE = "FX Execution Bot"
+    CSS = """
+    #tables { height: 1fr; }
+    #quotes { width: 3fr; }
+    #positions { width: 2fr; }
+    #log { height: 10; border-top: solid $accent; }
+    """
+    BINDINGS = [("ctrl+c", "quit", "Quit")]
+
+    def __init__(self, bot, uics, quote_interval=1.0, position_interval=5.0):
+        super().__init__()
+        self.bot = bot
+        self.uics = list(uics)
+        self.quote_interval = quote_interval
+        self.position_interval = position_interval
+        self.client = None
+        self._prev_mid = {}
+
+    def compose(self) -> ComposeResult:
+        yield Header(show_clock=True)
+        with Horizontal(id="tables"):
+            yield DataTable(id="quotes", cursor_type="row")
+            yield DataTable(id="positions", cursor_type="row")
+        yield RichLog(id="log", markup=True)
+        yield Input(placeholder="buy 21 100000 | sell 21 50000 | watch 16,21,31 | quit", id="prompt")
+        yield Footer()
+
+    async def on_mount(self):
+        self.query_one("#quotes", DataTable).add_columns(*QUOTE_COLUMNS)
+        self.query_one("#positions", DataTable).add_columns(*POSITION_COLUMNS)
+        self._reset_quote_rows()
+        self.query_one("#prompt", Input).focus()
+
+        self.client = aio.AsyncSaxoClient.from_client(self.bot.client)
+        await self.client.__aenter__()
+        if self.bot.account_key is None:
+            await self.bot.setup_async()
+        self.log_line(f"Connected: ClientKey {self.bot.client_key}, AccountKey {self.bot.account_key}")
+
+        self.run_worker(self._quote_loop(), group="quotes", exclusive=True)
+        self.run_worker(self._position_loop(), group="positions", exclusive=True)
+
+    async def on_unmount(self):
+        if self.client is not None:
+            await self.client.close()
+
+    def log_line(self, message):
+        stamp = datetime.now().strftime("%H:%M:%S")
+        self.query_one("#log", RichLog).write(f"[dim]{stamp}[/dim] {message}")
+
+    def _symbol(self, uic):
+        return self.bot.instruments.get(uic, f"UIC {uic}")
+
+    def _reset_quote_rows(self):
+        table = self.query_one("#quotes", DataTable)
+        table.clear()
+        for uic in self.uics:
+            table.add_row(self._symbol(uic), "…", "…", "…", Text("WAITING", style="dim"), "", key=str(uic))
+
+    def _quote_uics(self):
+        # Held and currency-conversion pairs ride along so the P&L header stays current
+        return list(dict.fromkeys(self.uics + self.bot.pnl.quote_uics()))
+
+    async def _fetch_prices(self):
+        uics = self._quote_uics()
+        prices = self.bot.cached_prices(uics)
+        if prices is not None:
+            return prices
+        prices = await aio.get_fx_prices(self.client, self.bot.account_key, uics)
+        self.bot.quotes.apply(prices.values())
+        return prices
+
+    async def _watch(self, uics):
+        # Resubscribing makes blocking REST calls; keep them off the event loop
+        try:
+            await asyncio.to_thread(self.bot.start_price_stream, uics)
+        except (OSError, ValueError, KeyError) as e:
+            self.log_line(f"[red]Stream restart failed: {type(e).__name__}; polling instead[/red]")
+
+    async def _quote_loop(self):
+        table = self.query_one("#quotes", DataTable)
+        while True:
+            started = time.monotonic()
+            try:
+                prices = await self._fetch_prices()
+            except Exception as e:
+                self.log_line(f"[red]Quote refresh failed: {type(e).__name__}[/red]")
+                prices = {}
+
+            stamp = datetime.now().strftime("%H:%M:%S")
+            for uic, item in prices.items():
+                if str(uic) not in table.rows:
+                    continue
+                quote = item.get("Quote", {})
+                mid = quote.get("Mid")
+                if mid is None or mid == self._prev_mid.get(uic):
+                    continue
+                prev = self._prev_mid.get(uic)
+                if prev is None:
+                    change = Text("NEW", style="blue")
+                else:
+                    delta = mid - prev
+                    style = "green" if delta > 0 else "red"
+                    change = Text(f"{delta:+.5f}", style=style)
+                self._prev_mid[uic] = mid
+
+                row = str(uic)
+                fmt = self.bot.instruments.format_price
+                table.update_cell(row, table.ordered_columns[1].key, fmt(uic, quote.get('Bid', 0)))
+                table.update_cell(row, table.ordered_columns[2].key, fmt(uic, quote.get('Ask', 0)))
+                table.update_cell(row, table.ordered_columns[3].key, fmt(uic, mid))
+                table.update_cell(row, table.ordered_columns[4].key, change)
+                table.update_cell(row, table.ordered_columns[5].key, stamp)
+
+            if self.bot.pnl.size:
+                pnl = self.bot.pnl.totals()
+                self.sub_title = (f"P&L €{pnl['total']:,.2f} "
+                                  f"(unrealized €{pnl['unrealized']:,.2f}, realized €{pnl['realized']:,.2f})")
+            await asyncio.sleep(max(0.0, self.quote_interval - (time.monotonic() - started)))
+
+    async def _position_loop(self):
+        table = self.query_one("#positions", DataTable)
+        while True:
+            try:
+                positions = await aio.get_positions(self.client, self.bot.client_key)
+                self.bot.positions.load(positions)
+                table.clear()
+                for pos in positions.get("Data", []):
+                    base = pos["PositionBase"]
+                    view = pos.get("PositionView", {})
+                    pnl = view.get("ProfitLossOnTradeInBaseCurrency", 0)
+                    table.add_row(
+                        pos.get("DisplayAndFormat", {}).get("Symbol", f"UIC {base['Uic']}"),
+                        f"{int(base['Amount']):,}",
+                        self.bot.instruments.format_price(base["Uic"], base["OpenPrice"]),
+                        self.bot.instruments.format_price(base["Uic"], view.get("CurrentPrice", 0)),
+                        Text(f"€{pnl:.2f}", style="green" if pnl >= 0 else "red"),
+                    )
+            except Exception as e:
+                self.log_line(f"[red]Position refresh failed: {type(e).__name__}[/red]")
+            await asyncio.sleep(self.position_interval)
+
+    async def on_input_submitted(self, event: Input.Submitted):
+        command = event.value.strip()
+        event.input.value = ""
+        if not command:
+            return
+
+        parts = command.split()
+        verb = parts[0].lower()
+        if verb in ("quit", "exit"):
+            self.exit()
+        elif verb == "watch" and len(parts) == 2:
+            try:
+                self.uics = [int(uic) for uic in parts[1].split(",")]
+            except ValueError:
+                self.log_line("[red]watch expects comma-separated UICs[/red]")
+                return
+            self._prev_mid.clear()
+            self._reset_quote_rows()
+            self.run_worker(self._watch(self._quote_uics()), group="stream", exclusive=True)
+            self.log_line(f"Watching {', '.join(self._symbol(uic) for uic in self.uics)}")
+        elif verb in ("buy", "sell") and len(parts) == 3:
+            try:
+                uic, amount = int(parts[1]), int(float(parts[2].replace(",", "")))
+            except ValueError:
+                self.log_line("[red]usage: buy|sell <uic> <amount>[/red]")
+                return
+            # Orders run as their own task so the prompt and tables stay live
+            self.run_worker(self._submit_order(uic, amount, verb.capitalize()), group="orders")
+        else:
+            self.log_line(f"[red]Unknown command: {command}[/red]")
+
+    async def _submit_order(self, uic, amount, buy_sell):
+        if buy_sell == "Sell":
+            current, _ = self.bot.positions.size(uic)
+            if amount > current:
+                self.log_line(f"[red]Cannot sell {amount:,} {self._symbol(uic)}: position is {current:,}[/red]")
+                return
+
+        self.log_line(f"Sending {buy_sell} {amount:,} {self._symbol(uic)}…")
+        started = time.perf_counter()
+        try:
+            resp = await aio.place_market_order(self.client, self.bot.account_key, uic, amount, buy_sell=buy_sell)
+        except Exception as e:
+            self.log_line(f"[red]{buy_sell} {self._symbol(uic)} failed: {type(e).__name__}: {e}[/red]")
+            return
+        elapsed = (time.perf_counter() - started) * 1000
+
+        if self.bot.record_order(uic, amount, buy_sell, resp):
+            self.log_line(f"[green]{buy_sell} {amount:,} {self._symbol(uic)} accepted[/green] "
+                          f"OrderId {resp['OrderId']} ({elapsed:.0f} ms)")
+        else:
+            self.log_line(f"[red]{buy_sell} {self._symbol(uic)} rejected ({elapsed:.0f} ms): {resp}[/red]")
@@ -0,0 +1,190 @@
+"""Backtesting on recorded bid/ask ticks.
+
+SimulatedBroker replays ticks one at a time behind the same order calls as
+bot.execution (market orders fill at bid/ask, limit orders fill on touch),
+for strategies and execution algos that need per-order behaviour.
+
+backtest_positions and sweep_ma_crossover are the vectorized path: a
+strategy is a target position per tick, and trades, costs and PnL come out
+of whole-array NumPy operations with the same fill rules.
+"""
+import itertools
+
+import numpy as np
+
+
+class SimulatedBroker:
+    """In-memory broker with the call shapes of place_market_order/place_limit_order/convert_to_market_order"""
+
+    def __init__(self, tick_sizes=None):
+        self.tick_sizes = tick_sizes or {}   # uic -> price increment limit orders must respect
+        self.quotes = {}     # uic -> (ts, bid, ask)
+        self.orders = {}     # OrderId -> order dict
+        self.working = {}    # OrderId -> order dict still resting
+        self.fills = []      # (ts, OrderId, uic, signed amount, price)
+        self.positions = {}  # uic -> signed amount
+        self.cash = {}       # uic -> quote-currency cash from fills
+        self._next_id = 1
+
+    def _new_order(self, uic, amount, buy_sell, order_type, price=None):
+        order_id = str(self._next_id)
+        self._next_id += 1
+        order = {"OrderId": order_id, "Uic": uic, "Amount": amount, "BuySell": buy_sell,
+                 "OrderType": order_type, "OrderPrice": price, "Status": "Working",
+                 "FilledAmount": 0, "FillPrice": None}
+        self.orders[order_id] = order
+        return order
+
+    def _fill(self, order, price):
+        ts = self.quotes[order["Uic"]][0]
+        signed = order["Amount"] if order["BuySell"] == "Buy" else -order["Amount"]
+        order.update(Status="Filled", FilledAmount=order["Amount"], FillPrice=price)
+        self.working.pop(order["OrderId"], None)
+        self.fills.append((ts, order["OrderId"], order["Uic"], signed, price))
+        self.positions[order["Uic"]] = self.positions.get(order["Uic"], 0) + signed
+        self.cash[order["Uic"]] = self.cash.get(order["Uic"], 0.0) - signed * price
+
+    def _market_price(self, uic, buy_sell):
+        if uic not in self.quotes:
+            return None
+        _, bid, ask = self.quotes[uic]
+        return ask if buy_sell == "Buy" else bid
+
+    def _error(self, code, message):
+        return {"ErrorInfo": {"ErrorCode": code, "Message": message}}
+
+    def on_tick(self, ts, uic, bid, ask):
+        """Advance the market for uic and fill any limit order it touches"""
+        self.quotes[uic] = (ts, bid, ask)
+        for order in list(self.working.values()):
+            if order["Uic"] != uic:
+                continue
+            if order["BuySell"] == "Buy" and ask <= order["OrderPrice"]:
+                self._fill(order, order["OrderPrice"])
+            elif order["BuySell"] == "Sell" and bid >= order["OrderPrice"]:
+                self._fill(order, order["OrderPrice"])
+
+    def place_market_order(self, uic, amount, buy_sell="Sell"):
+        price = self._market_price(uic, buy_sell)
+        if price is None:
+            return self._error("NoMarketData", f"No quote for Uic {uic}")
+        order = self._new_order(uic, amount, buy_sell, "Market")
+        self._fill(order, price)
+        return {"OrderId": order["OrderId"]}
+
+    def place_limit_order(self, uic, price, amount=100000, buy_sell="Buy"):
+        market = self._market_price(uic, buy_sell)
+        order = self._new_order(uic, amount, buy_sell, "Limit", price)
+        marketable = market is not None and (market <= price if buy_sell == "Buy" else market >= price)
+        if marketable:
+            self._fill(order, market)
+        else:
+            self.working[order["OrderId"]] = order
+        return {"OrderId": order["OrderId"]}
+
+    def convert_to_market_order(self, order_id, uic):
+        order = self.working.get(order_id)
+        if order is None:
+            return self._error("OrderNotFound", f"No working order {order_id}")
+        price = self._market_price(uic, order["BuySell"])
+        if price is None:
+            return self._error("NoMarketData", f"No quote for Uic {uic}")
+        order["OrderType"] = "Market"
+        self._fill(order, price)
+        return {"OrderId": order_id}
+
+    def cancel_order(self, order_id):
+        order = self.working.pop(order_id, None)
+        if order is not None:
+            order["Status"] = "Cancelled"
+        return {"OrderId": order_id} if order else self._error("OrderNotFound", f"No working order {order_id}")
+
+    def order_status(self, order_id):
+        return self.orders.get(order_id)
+
+    def tick_size(self, uic):
+        return self.tick_sizes.get(uic)
+
+    def touch(self, uic):
+        """(bid, ask) for uic"""
+        _, bid, ask = self.quotes[uic]
+        return bid, ask
+
+    def mid(self, uic):
+        _, bid, ask = self.quotes[uic]
+        return (bid + ask) / 2
+
+    def pnl(self, uic):
+        """Cash plus the position marked at the price it could be closed at"""
+        _, bid, ask = self.quotes[uic]
+        amount = self.positions.get(uic, 0)
+        return self.cash.get(uic, 0.0) + amount * (bid if amount > 0 else ask)
+
+
+def replay(broker, ts, uic, bid, ask, on_tick=None):
+    """Feed ticks to the broker one at a time; on_tick(broker, i) runs after each"""
+    for i in range(len(ts)):
+        broker.on_tick(int(ts[i]), int(uic[i]), float(bid[i]), float(ask[i]))
+        if on_tick is not None:
+            on_tick(broker, i)
+    return broker
+
+
+def backtest_positions(bid, ask, target, lag=1):
+    """Vectorized PnL of holding target[i] units, traded `lag` ticks after the signal.
+
+    Buys fill at the ask and sells at the bid, like SimulatedBroker market
+    orders. Returns {'equity', 'pnl', 'trades', 'volume'} with equity marked
+    at the price the position could be closed at.
+    """
+    bid = np.asarray(bid, dtype=np.float64)
+    ask = np.asarray(ask, dtype=np.float64)
+    position = np.asarray(target, dtype=np.float64)
+    if lag:
+        position = np.concatenate((np.zeros(lag), position[:-lag]))
+
+    trades = np.diff(position, prepend=0.0)
+    fill = np.where(trades > 0, ask, bid)
+    cash = -np.cumsum(trades * fill)
+    equity = cash + position * np.where(position > 0, bid, ask)
+    return {
+        "equity": equity,
+        "pnl": float(equity[-1]) if len(equity) else 0.0,
+        "trades": int(np.count_nonzero(trades)),
+        "volume": float(np.abs(trades).sum()),
+    }
+
+
+def rolling_mean(values, window):
+    """Trailing mean; the first window-1 entries are NaN"""
+    out = np.full(len(values), np.nan)
+    if window <= len(values):
+        csum = np.cumsum(np.concatenate(([0.0], values)))
+        out[window - 1:] = (csum[window:] - csum[:-window]) / window
+    return out
+
+
+def ma_crossover_target(mid, fast, slow, size=100000):
+    """Long `size` while the fast mean is above the slow one, short while below"""
+    fast_ma = rolling_mean(mid, fast)
+    slow_ma = rolling_mean(mid, slow)
+    signal = np.sign(np.nan_to_num(fast_ma - slow_ma))
+    return signal * size
+
+
+def sweep_ma_crossover(bid, ask, fast_windows, slow_windows, size=100000, lag=1):
+    """Backtest every fast < slow pair; returns rows of (fast, slow, pnl, trades) sorted by pnl"""
+    bid = np.asarray(bid, dtype=np.float64)
+    ask = np.asarray(ask, dtype=np.float64)
+    mid = (bid + ask) / 2
+    means = {w: rolling_mean(mid, w) for w in set(fast_windows) | set(slow_windows)}
+
+    results = []
+    for fast, slow in itertools.product(fast_windows, slow_windows):
+        if fast >= slow:
+            continue
+        target = np.sign(np.nan_to_num(means[fast] - means[slow])) * size
+        result = backtest_positions(bid, ask, target, lag=lag)
+        results.append((fast, slow, result["pnl"], result["trades"]))
+    results.sort(key=lambda row: row[2], reverse=True)
+    return results
@@ -0,0 +1,144 @@
+"""Basket (multi-leg) market orders dispatched concurrently.
+
+Legs are validated up front, then each is sent on its own worker over the
+shared connection pool. A barrier releases all workers together, so the
+skew between legs is about one round-trip instead of N. Saxo's
+/trade/v2/orders/multileg endpoint only covers option strategies, so FX
+spot baskets go out as concurrent single orders.
+
+With a risk engine on the client, every leg is checked and reserved
+before any is sent. If one leg fails, all reservations are released and
+no leg goes out, so a hedge is never left one-sided by a risk rejection.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .client import POOL_SIZE
+from .execution import place_market_order
+from .risk import RiskError
+from .scheduler import GROUP_LIMITS, SESSION_LIMIT
+
+# Every leg needs its own pooled connection and an order token up front, or the
+# last legs queue behind the first and the basket's skew grows by whole round trips
+MAX_LEGS = min(POOL_SIZE, int(GROUP_LIMITS["orders"][1]), int(SESSION_LIMIT[1]))
+SIDES = {"buy": "Buy", "sell": "Sell"}
+
+_leg_executor = ThreadPoolExecutor(max_workers=MAX_LEGS, thread_name_prefix="basket")
+
+
+def validate_legs(legs):
+    """Normalise (uic, amount, side) legs; raises ValueError listing every problem"""
+    errors = []
+    normalised = []
+    seen = set()
+
+    if not legs:
+        errors.append("basket has no legs")
+    if len(legs) > MAX_LEGS:
+        errors.append(f"basket has {len(legs)} legs, at most {MAX_LEGS} allowed")
+
+    for i, leg in enumerate(legs, 1):
+        try:
+            uic, amount, side = leg
+        except (TypeError, ValueError):
+            errors.append(f"leg {i}: expected (uic, amount, side), got {leg!r}")
+            continue
+
+        buy_sell = SIDES.get(str(side).strip().lower())
+        if buy_sell is None:
+            errors.append(f"leg {i}: side must be Buy or Sell, got {side!r}")
+        try:
+            uic = int(uic)
+            if uic <= 0:
+                raise ValueError
+        except (TypeError, ValueError):
+            errors.append(f"leg {i}: invalid Uic {uic!r}")
+            continue
+        if uic in seen:
+            errors.append(f"leg {i}: Uic {uic} appears more than once")
+        seen.add(uic)
+        if isinstance(amount, bool) or not isinstance(amount, (int, float)) or amount <= 0 or amount != int(amount):
+            errors.append(f"leg {i}: amount must be a positive whole number, got {amount!r}")
+            continue
+        normalised.append((uic, int(amount), buy_sell))
+
+    if errors:
+        raise ValueError("; ".join(errors))
+    return normalised
+
+
+def reserve_legs(risk, legs):
+    """risk.check() every leg; returns (reservations, None), or (None, (index, RiskError)) with all released"""
+    if risk is None:
+        return [None] * len(legs), None
+    reservations = []
+    for i, (uic, amount, buy_sell) in enumerate(legs):
+        try:
+            reservations.append(risk.check(uic, amount, buy_sell))
+        except RiskError as e:
+            for reservation in reservations:
+                risk.release(reservation)
+            return None, (i, e)
+    return reservations, None
+
+
+def place_basket_order(client, account_key, legs, place=place_market_order):
+    """Send every leg as a market order at once and collect the acknowledgements.
+
+    Returns {'ok', 'wall_ms', 'skew_ms', 'legs': [{'uic', 'amount', 'buy_sell',
+    'response', 'ok', 'latency_ms', 'sent_at_ms', 'acked_at_ms'}]} with times
+    relative to the start of the basket; skew_ms is the spread of ack times.
+    """
+    legs = validate_legs(legs)
+    start = time.perf_counter()
+    reservations, rejected = reserve_legs(getattr(client, "risk", None), legs)
+    if rejected is not None:
+        failed, error = rejected
+        results = []
+        for i, (uic, amount, buy_sell) in enumerate(legs):
+            if i == failed:
+                response = {"ErrorInfo": {"ErrorCode": f"Risk.{error.reason}", "Message": str(error)}}
+            else:
+                response = {"ErrorInfo": {"ErrorCode": "Risk.basket",
+                                          "Message": f"not sent: leg {failed + 1} failed pre-trade checks"}}
+            results.append({"uic": uic, "amount": amount, "buy_sell": buy_sell, "response": response, "ok": False,
+                            "latency_ms": 0.0, "sent_at_ms": 0.0, "acked_at_ms": 0.0})
+        return {"ok": False, "wall_ms": (time.perf_counter() - start) * 1000, "skew_ms": 0.0, "legs": results}
+    barrier = threading.Barrier(len(legs))
+
+    def send(leg, reservation):
+        uic, amount, buy_sell = leg
+        # Legs reserved up front go out without a second check
+        extra = {"reservation": reservation} if reservation is not None else {}
+        try:
+            barrier.wait(timeout=1)
+        except threading.BrokenBarrierError:
+            pass  # workers busy elsewhere; send now rather than hold the leg back
+        sent = time.perf_counter()
+        try:
+            response = place(client, account_key, uic=uic, amount=amount, buy_sell=buy_sell, **extra)
+        except RiskError as e:
+            response = {"ErrorInfo": {"ErrorCode": f"Risk.{e.reason}", "Message": str(e)}}
+        except Exception as e:
+            response = {"ErrorInfo": {"ErrorCode": type(e).__name__, "Message": str(e)}}
+        acked = time.perf_counter()
+        return {
+            "uic": uic,
+            "amount": amount,
+            "buy_sell": buy_sell,
+            "response": response,
+            "ok": isinstance(response, dict) and "OrderId" in response and not response.get("ErrorInfo"),
+            "latency_ms": (acked - sent) * 1000,
+            "sent_at_ms": (sent - start) * 1000,
+            "acked_at_ms": (acked - start) * 1000,
+        }
+
+    results = list(_leg_executor.map(send, legs, reservations))
+    acks = [leg["acked_at_ms"] for leg in results]
+    return {
+        "ok": all(leg["ok"] for leg in results),
+        "wall_ms": (time.perf_counter() - start) * 1000,
+        "skew_ms": max(acks) - min(acks),
+        "legs": results,
+    }
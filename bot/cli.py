@@ -0,0 +1,236 @@
+"""Headless commands for cron jobs and scripts: no prompts, JSON on stdout.
+
+    SAXO_TOKEN=... python main.py quote EURUSD 31
+    python main.py --token-file ~/.saxo-token positions
+    python main.py buy EURUSD 100000
+    python main.py sell 21 50000
+    python main.py record 16,21,31 --seconds 3600 --directory ticks
+
+The token comes from --token-file, SAXO_TOKEN_FILE or SAXO_TOKEN, and
+SAXO_BASE_URL points at another gateway as in the menu. SAXO_CLIENT_KEY
+and SAXO_ACCOUNT_KEY skip the account lookup. quote, positions, buy and
+sell import only the REST client, risk engine and instrument cache; rich,
+textual, aiohttp, websockets and NumPy are never loaded for them.
+
+Every command prints one JSON document. Exit status is 0 on success, 1
+when the gateway or the risk engine rejects the request (or a sell is
+larger than the position held, as in the menu), 2 on bad usage.
+"""
+import argparse
+import contextlib
+import json
+import math
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from .account import get_accounts, get_client_info, get_positions
+from .client import BASE_URL, SaxoClient
+from .execution import get_fx_prices, place_market_order
+from .instruments import DEFAULT_CACHE_PATH, InstrumentCache
+from .risk import RiskEngine, RiskError
+
+
+class UsageError(Exception):
+    pass
+
+
+def read_token(path=None):
+    """Bearer token from path, SAXO_TOKEN_FILE or SAXO_TOKEN"""
+    path = path or os.environ.get("SAXO_TOKEN_FILE")
+    if path:
+        try:
+            with open(os.path.expanduser(path)) as f:
+                token = f.read().strip()
+        except OSError as e:
+            raise UsageError(f"cannot read token file {path}: {e.strerror}")
+    else:
+        token = os.environ.get("SAXO_TOKEN", "").strip()
+    if not token:
+        raise UsageError("no token: set SAXO_TOKEN or SAXO_TOKEN_FILE, or pass --token-file")
+    return token
+
+
+def account_keys(client):
+    """(ClientKey, AccountKey) from the environment, else the default account"""
+    client_key = os.environ.get("SAXO_CLIENT_KEY")
+    account_key = os.environ.get("SAXO_ACCOUNT_KEY")
+    if client_key and account_key:
+        return client_key, account_key
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        client_info, accounts = pool.map(lambda fetch: fetch(client), (get_client_info, get_accounts))
+    default_id = client_info["DefaultAccountId"]
+    account = next((a for a in accounts["Data"] if a["AccountId"] == default_id), None)
+    return client_info["ClientKey"], account_key or (account or {}).get("AccountKey")
+
+
+def resolve_uics(instruments, raw):
+    """'EURUSD,31' or ['EURUSD', '31'] -> [21, 31]"""
+    tokens = raw.split(",") if isinstance(raw, str) else [part for item in raw for part in item.split(",")]
+    uics = []
+    for token in (token.strip() for token in tokens):
+        if not token:
+            continue
+        uic = int(token) if token.isdigit() else instruments.uic(token)
+        if uic is None:
+            raise UsageError(f"unknown instrument {token!r}; use a UIC or a cached symbol")
+        uics.append(uic)
+    return uics
+
+
+def quote_row(instruments, uic, quote):
+    return {"Uic": uic, "Symbol": instruments.get(uic, f"UIC {uic}"), "Bid": quote.get("Bid"),
+            "Ask": quote.get("Ask"), "Mid": quote.get("Mid")}
+
+
+def cmd_quote(args, client, instruments):
+    client_key, account_key = account_keys(client)
+    uics = resolve_uics(instruments, args.instruments)
+    prices = get_fx_prices(client, account_key, uics)
+    missing = [uic for uic in uics if uic not in prices]
+    result = {"quotes": [quote_row(instruments, uic, prices[uic]["Quote"]) for uic in uics if uic in prices]}
+    if missing:
+        result["missing"] = missing
+    return result, not missing
+
+
+def cmd_positions(args, client, instruments):
+    client_key, _ = account_keys(client)
+    rows, net = [], {}
+    for position in (get_positions(client, client_key) or {}).get("Data", []):
+        base = position.get("PositionBase", {})
+        view = position.get("PositionView", {})
+        uic = int(base["Uic"])
+        net[uic] = net.get(uic, 0) + base.get("Amount", 0)
+        rows.append({
+            "PositionId": position.get("PositionId"),
+            "Uic": uic,
+            "Symbol": position.get("DisplayAndFormat", {}).get("Symbol") or instruments.get(uic, f"UIC {uic}"),
+            "Amount": base.get("Amount"),
+            "OpenPrice": base.get("OpenPrice"),
+            "CurrentPrice": view.get("CurrentPrice"),
+            "ProfitLoss": view.get("ProfitLossOnTradeInBaseCurrency"),
+        })
+    return {"positions": rows, "net": [{"Uic": uic, "Amount": amount} for uic, amount in sorted(net.items())]}, True
+
+
+def cmd_order(args, client, instruments):
+    buy_sell = "Buy" if args.command == "buy" else "Sell"
+    (uic,) = resolve_uics(instruments, [args.instrument])
+    if not math.isfinite(args.amount) or args.amount != int(args.amount):
+        raise UsageError(f"amount must be a whole number of units, got {args.amount:g}")
+    amount = int(args.amount)
+
+    # The same pre-trade checks as the menu, against current positions and a fresh quote
+    risk = RiskEngine()
+    risk.set_instruments(instruments)
+    client.risk = risk
+    client_key, account_key = account_keys(client)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        positions = pool.submit(get_positions, client, client_key)
+        prices = pool.submit(get_fx_prices, client, account_key, [uic])
+        positions = positions.result() or {}
+        risk.load(positions)
+        quote = prices.result().get(uic, {}).get("Quote")
+    if quote:
+        risk.on_quote(uic, quote)
+    held = sum(p.get("PositionBase", {}).get("Amount", 0) for p in positions.get("Data", [])
+               if int(p.get("PositionBase", {}).get("Uic", 0)) == uic)
+
+    result = {"Uic": uic, "Symbol": instruments.get(uic, f"UIC {uic}"), "BuySell": buy_sell, "Amount": amount,
+              "Quote": quote}
+    if buy_sell == "Sell" and amount > held:
+        # As in the menu: sell only what is held, never open or extend a short
+        resp = {"ErrorInfo": {"ErrorCode": "InsufficientPosition",
+                              "Message": f"cannot sell {amount:,} units of UIC {uic}; {held:,} held"}}
+    else:
+        try:
+            resp = place_market_order(client, account_key, uic, amount, buy_sell=buy_sell)
+        except RiskError as e:
+            resp = {"ErrorInfo": {"ErrorCode": f"Risk.{e.reason}", "Message": str(e)}}
+    result["Response"] = resp
+    return result, isinstance(resp, dict) and "OrderId" in resp and not resp.get("ErrorInfo")
+
+
+def cmd_record(args, client, instruments):
+    from .core import SaxoTradingBot
+
+    uics = resolve_uics(instruments, args.instruments)
+    client.close()
+    ticks = {uic: 0 for uic in uics}
+
+    def count(uic, quote):
+        if uic in ticks:
+            ticks[uic] += 1
+
+    # The bot reports progress with print(); keep stdout for the JSON result
+    with contextlib.redirect_stdout(sys.stderr):
+        bot = SaxoTradingBot(args.token, base_url=args.base_url, instrument_cache=args.instrument_cache)
+        bot.setup()
+        bot.quotes.add_listener(count)
+        bot.record_session(uics, directory=args.directory, poll_interval=args.poll_interval,
+                           duration=args.seconds)
+        bot.client.close()
+    return {"directory": args.directory, "ticks": [{"Uic": uic, "Ticks": n} for uic, n in ticks.items()]}, True
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py", description="Headless FX bot commands with JSON output. "
+                                     "Run without a command for the interactive menu.")
+    parser.add_argument("--token-file", help="file holding the bearer token (default SAXO_TOKEN_FILE, then SAXO_TOKEN)")
+    parser.add_argument("--base-url", default=os.environ.get("SAXO_BASE_URL", BASE_URL))
+    parser.add_argument("--instrument-cache", default=os.environ.get("SAXO_INSTRUMENT_CACHE", DEFAULT_CACHE_PATH))
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    quote = commands.add_parser("quote", help="bid/ask/mid for instruments")
+    quote.add_argument("instruments", nargs="+", help="UICs or symbols, space- or comma-separated")
+    quote.set_defaults(run=cmd_quote)
+
+    positions = commands.add_parser("positions", help="open positions and net size per UIC")
+    positions.set_defaults(run=cmd_positions)
+
+    for side in ("buy", "sell"):
+        order = commands.add_parser(side, help=f"{side} at market, behind the pre-trade risk checks")
+        order.add_argument("instrument", help="UIC or symbol")
+        order.add_argument("amount", type=float, help="units of the base currency")
+        order.set_defaults(run=cmd_order)
+
+    record = commands.add_parser("record", help="record ticks to memory-mapped day files")
+    record.add_argument("instruments", nargs="+", help="UICs or symbols, space- or comma-separated")
+    record.add_argument("--directory", default="ticks")
+    record.add_argument("--seconds", type=float, help="stop after this long (default: until Ctrl+C)")
+    record.add_argument("--poll-interval", type=float, default=1.0,
+                        help="seconds between REST polls while the stream is down")
+    record.set_defaults(run=cmd_record)
+    return parser
+
+
+def emit(out, payload):
+    out.write(json.dumps(payload, separators=(",", ":")) + "\n")
+
+
+def main(argv=None, out=None):
+    """Run one command; returns the exit status"""
+    out = out or sys.stdout
+    args = build_parser().parse_args(argv)
+    try:
+        args.token = read_token(args.token_file)
+        instruments = InstrumentCache(args.instrument_cache, source=args.base_url)
+        instruments.load()
+        client = SaxoClient(args.token, base_url=args.base_url)
+        try:
+            result, ok = args.run(args, client, instruments)
+        finally:
+            client.close()
+    except UsageError as e:
+        emit(out, {"error": str(e)})
+        return 2
+    except (OSError, ValueError, KeyError) as e:  # network or gateway failure: still answer in JSON
+        emit(out, {"error": f"{type(e).__name__}: {e}"})
+        return 1
+    emit(out, result)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+import time
+from functools import lru_cache
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .metrics import TIMED_POOL_CLASSES, Metrics, connection_timings, reset_connection_timings
+from .scheduler import RequestScheduler, group_for
+
+BASE_URL = "https://gateway.saxobank.com/sim/openapi"
+STREAM_URL = "wss://streaming.saxobank.com/sim/openapi/streamingws/connect"
+
+# Saxo's streaming endpoint for each of its REST gateways; any other gateway has none unless configured
+STREAM_URLS = {
+    BASE_URL: STREAM_URL,
+    "https://gateway.saxobank.com/openapi": "wss://streaming.saxobank.com/openapi/streamingws/connect",
+}
+
+# (connect, read) timeouts in seconds, matched on the longest path prefix
+TIMEOUTS = {
+    "/port/": (3.05, 10),
+    "/trade/v1/infoprices": (3.05, 5),
+    "/trade/v2/orders": (3.05, 15),
+}
+DEFAULT_TIMEOUT = (3.05, 10)
+
+def stream_url_for(base_url):
+    """Websocket URL paired with a Saxo REST base URL, or None for another gateway (e.g. bot.simulator)"""
+    return STREAM_URLS.get(base_url.rstrip("/"))
+
+
+# Status codes worth retrying on an idempotent GET; 429 goes through the scheduler instead
+RETRY_STATUSES = (500, 502, 503, 504)
+
+# Keep-alive connections per client; bot.basket sends at most this many legs at once
+POOL_SIZE = 10
+
+
+@lru_cache(maxsize=256)
+def timeout_for(path):
+    matches = [prefix for prefix in TIMEOUTS if path.startswith(prefix)]
+    return TIMEOUTS[max(matches, key=len)] if matches else DEFAULT_TIMEOUT
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections report DNS and connect time to bot.metrics"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = TIMED_POOL_CLASSES
+
+
+class SaxoClient:
+    """Keep-alive HTTP client shared by every account and execution call"""
+
+    def __init__(self, access_token, base_url=BASE_URL, pool_size=POOL_SIZE, max_retries=3, backoff_factor=0.2,
+                 metrics=None, scheduler=None, risk=None):
+        self.base_url = base_url.rstrip("/")
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.scheduler = scheduler if scheduler is not None else RequestScheduler()
+        self.risk = risk  # bot.risk.RiskEngine checked before every order, if set
+        self.max_retries = max_retries
+        self.headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json"
+        }
+
+        # Only GETs are retried: a replayed POST/PATCH could double an order
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = TimedHTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method, path, params=None, json=None):
+        if method == "GET":
+            # Identical GETs already in flight share that response
+            key = (path, tuple(sorted((params or {}).items())))
+            return self.scheduler.coalesce(key, lambda: self._send(method, path, params, json))
+        return self._send(method, path, params, json)
+
+    def _send(self, method, path, params, json):
+        group = group_for(path)
+        for attempt in range(self.max_retries + 1):
+            self.scheduler.acquire(group)
+            reset_connection_timings()
+            start = time.perf_counter()
+            try:
+                resp = self.session.request(method, self.base_url + path, params=params, json=json,
+                                            timeout=timeout_for(path))
+            except requests.RequestException:
+                self.metrics.record(method, path, time.perf_counter() - start,
+                                    dns=connection_timings.dns, connect=connection_timings.connect)
+                raise
+            total = time.perf_counter() - start
+
+            dns, connect = connection_timings.dns, connection_timings.connect
+            self.metrics.record(method, path, total, status=resp.status_code, dns=dns, connect=connect,
+                                ttfb=max(resp.elapsed.total_seconds() - dns - connect, 0.0),
+                                sent=len(resp.request.body or b""), received=len(resp.content))
+            self.scheduler.observe(group, resp.status_code, resp.headers)
+            # observe() paused the group until the window resets; only GETs are resent
+            if resp.status_code != 429 or method != "GET":
+                break
+        # DELETE and some PATCH calls answer 202/204 with no body
+        return resp.json() if resp.content else None
+
+    def get(self, path, params=None):
+        return self.request("GET", path, params=params)
+
+    def post(self, path, json=None):
+        return self.request("POST", path, json=json)
+
+    def patch(self, path, json=None):
+        return self.request("PATCH", path, json=json)
+
+    def delete(self, path, params=None):
+        return self.request("DELETE", path, params=params)
+
+    def close(self):
+        self.session.close()
@@ -1,48 +1,112 @@
+import asyncio
+import os
 import time
 import sys
 from datetime import datetime
+from importlib.util import find_spec
 from .account import get_user_info, get_client_info, get_accounts, get_balance, get_positions, print_balance_summary, print_positions_summary
 from .execution import get_fx_prices, place_limit_order, place_market_order, convert_to_market_order
+from .client import BASE_URL, SaxoClient, stream_url_for
+from .basket import place_basket_order
+from . import algos
+from .quotes import QuoteBook
+from .positions import PositionBook
+from .risk import RiskEngine, RiskError
+from .instruments import DEFAULT_CACHE_PATH, SEED, InstrumentCache
+from .pnl import PnLEngine
+from .analytics import TickAnalytics
+from .sharedquotes import SharedQuoteReader
 from .utils import format_datetime
 
-# Rich imports for professional terminal interface
-try:
-    from rich.console import Console
-    from rich.live import Live
-    from rich.table import Table
-    from rich.layout import Layout
-    from rich.panel import Panel
-    from rich.text import Text
-    from rich import box
-    RICH_AVAILABLE = True
-except ImportError:
-    RICH_AVAILABLE = False
+# rich (ticker, dashboard, latency panel), aiohttp (concurrent startup and snapshots), websockets
+# (streaming quotes) and textual (trading terminal) are optional and imported where they are used,
+# so scripts and bot.cli commands that only need REST do not pay for them at startup
+RICH_AVAILABLE = find_spec("rich") is not None
+AIO_AVAILABLE = find_spec("aiohttp") is not None
+STREAMING_AVAILABLE = find_spec("websockets") is not None
+TEXTUAL_AVAILABLE = find_spec("textual") is not None
 
 
 class SaxoTradingBot:
-    def __init__(self, access_token):
-        self.headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json"
-        }
+    def __init__(self, access_token, base_url=None, stream_url=None, instrument_cache=None, quote_feed=None,
+                 quote_feed_max_age=None):
+        # SAXO_BASE_URL / SAXO_STREAM_URL point the bot at another gateway, e.g. bot.simulator.
+        # Saxo's own gateways imply their stream; any other gateway without one polls instead.
+        base_url = base_url or os.environ.get("SAXO_BASE_URL", BASE_URL)
+        self.stream_url = stream_url or os.environ.get("SAXO_STREAM_URL") or stream_url_for(base_url)
+
+        # SAXO_QUOTE_FEED names a bot.sharedquotes segment to read quotes from instead of the gateway
+        feed_name = quote_feed if quote_feed is not None else os.environ.get("SAXO_QUOTE_FEED")
+        self.quote_feed = None
+        # The feed is passed over once its heartbeat is older than this (seconds): the daemon has stopped
+        self.quote_feed_max_age = (quote_feed_max_age if quote_feed_max_age is not None
+                                   else float(os.environ.get("SAXO_QUOTE_FEED_MAX_AGE", 5.0)))
+        if feed_name:
+            try:
+                self.quote_feed = SharedQuoteReader(feed_name)
+            except (FileNotFoundError, ValueError) as e:
+                print(f"⚠️  Quote feed {feed_name!r} unavailable ({e}); using the gateway")
+
+        # Instrument reference data (symbols, decimals, minimum amounts) from the on-disk cache
+        cache_path = instrument_cache or os.environ.get("SAXO_INSTRUMENT_CACHE", DEFAULT_CACHE_PATH)
+        self.instruments = InstrumentCache(cache_path, source=base_url)
+        self.watchlist = list(SEED)
+
+        # Pre-trade limits checked in front of every order the client sends
+        self.risk = RiskEngine()
+        self.risk.set_instruments(self.instruments)
+        self.instruments.add_listener(self.risk.set_instruments)
+        self.instruments.load()
+
+        # One pooled client so orders and ticks reuse warm connections
+        self.client = SaxoClient(access_token, base_url=base_url, risk=self.risk)
         self.client_key = None
         self.account_key = None
-        
-        # UIC shortlist for display
-        self.uic_shortlist = {
-            16: "EUR/DKK",
-            21: "EUR/USD", 
-            31: "USD/JPY",
-            22: "GBP/USD",
-            17: "EUR/GBP",
-        }
+
+        # Latest streamed quotes, shared by the ticker and order paths
+        self.quotes = QuoteBook()
+        self.price_stream = None
+        self.recorder = None
+
+        # Open positions indexed by Uic; refreshed in the background, updated on orders
+        self.positions = PositionBook()
+
+        # Live PnL of the whole book, revalued from quotes and booked from fills
+        self.pnl = PnLEngine(self.instruments)
+        self.instruments.add_listener(self.pnl.set_instruments)
+
+        # Rolling spread / volatility / tick-rate / high-low per instrument for the ticker
+        self.analytics = TickAnalytics(self.instruments)
+
+        # Risk exposure, PnL and analytics follow the latest quotes and every full position load
+        for listener in (self.risk.on_quote, self.pnl.on_quote, self.analytics.on_quote):
+            self.quotes.add_listener(listener)
+        for listener in (self.risk.load, self.pnl.load):
+            self.positions.add_listener(listener)
 
     def setup(self):
         """Fetch and set ClientKey and AccountKey"""
-        user = get_user_info(self.headers)
-        client = get_client_info(self.headers)
-        accounts = get_accounts(self.headers)
-
+        if AIO_AVAILABLE:
+            return asyncio.run(self.setup_async())
+
+        user = get_user_info(self.client)
+        client = get_client_info(self.client)
+        accounts = get_accounts(self.client)
+        self._apply_setup(client, accounts)
+
+    async def setup_async(self):
+        """Fetch user, client and accounts concurrently and set ClientKey and AccountKey"""
+        from . import aio
+
+        async with aio.AsyncSaxoClient.from_client(self.client) as client:
+            user, client_info, accounts = await asyncio.gather(
+                aio.get_user_info(client),
+                aio.get_client_info(client),
+                aio.get_accounts(client),
+            )
+        self._apply_setup(client_info, accounts)
+
+    def _apply_setup(self, client, accounts):
         self.client_key = client['ClientKey']
         default_account_id = client['DefaultAccountId']
 
@@ -54,25 +118,186 @@ class SaxoTradingBot:
         print(f"ClientKey: {self.client_key}")
         print(f"AccountKey: {self.account_key}")
 
+    def place_basket(self, legs):
+        """Send (uic, amount, side) legs concurrently; see bot.basket for the result shape"""
+        result = place_basket_order(self.client, self.account_key, legs)
+        for leg in result["legs"]:
+            self.record_order(leg["uic"], leg["amount"], leg["buy_sell"], leg["response"])
+        return result
+
+    def refresh_snapshot(self, uics):
+        """Fetch balance, positions and prices. Returns {'balance', 'positions', 'prices'}."""
+        if AIO_AVAILABLE:
+            return asyncio.run(self.refresh_snapshot_async(uics))
+
+        return {
+            "balance": get_balance(self.client, self.client_key, self.account_key),
+            "positions": get_positions(self.client, self.client_key),
+            "prices": get_fx_prices(self.client, self.account_key, uics),
+        }
+
+    async def refresh_snapshot_async(self, uics):
+        """Concurrent refresh_snapshot: wall-clock is the slowest of the three calls"""
+        from . import aio
+
+        async with aio.AsyncSaxoClient.from_client(self.client) as client:
+            balance, positions, prices = await asyncio.gather(
+                aio.get_balance(client, self.client_key, self.account_key),
+                aio.get_positions(client, self.client_key),
+                aio.get_fx_prices(client, self.account_key, uics),
+            )
+        return {"balance": balance, "positions": positions, "prices": prices}
+
+    def start_price_stream(self, uics):
+        """Stream quotes for uics (plus any already streamed) into self.quotes"""
+        if not STREAMING_AVAILABLE or self.stream_url is None or self.feed_prices(uics) is not None:
+            return None
+        from .streaming import PriceStream
+
+        wanted = set(uics)
+        if self.price_stream is not None:
+            if wanted <= set(self.price_stream.uics):
+                return self.price_stream
+            wanted |= set(self.price_stream.uics)
+            self.stop_price_stream()
+
+        self.price_stream = PriceStream(self.client, self.account_key, sorted(wanted), book=self.quotes,
+                                        stream_url=self.stream_url).start()
+        return self.price_stream
+
+    def stop_price_stream(self):
+        if self.price_stream is not None:
+            self.price_stream.stop()
+            self.price_stream = None
+
+    def feed_prices(self, uics):
+        """Quotes for uics from the shared feed, or None unless it has a fresh quote for every one"""
+        if self.quote_feed is None:
+            return None
+        prices = self.quote_feed.snapshot(uics, max_age=self.quote_feed_max_age)
+        if len(prices) != len(set(uics)):
+            return None
+        self.quotes.apply(prices.values())
+        return prices
+
+    def cached_prices(self, uics):
+        """Quotes for uics without a gateway call: a fresh shared feed, else the streamed book; None if neither covers them"""
+        prices = self.feed_prices(uics)
+        if prices is None and self.price_stream is not None and self.price_stream.connected and self.quotes.has(uics):
+            prices = self.quotes.snapshot(uics)
+        return prices
+
+    def get_prices(self, uics):
+        """Quotes for uics from the shared feed or streaming book when they cover them, else one REST call"""
+        prices = self.cached_prices(uics)
+        if prices is not None:
+            return prices
+        prices = get_fx_prices(self.client, self.account_key, uics)
+        # Polled quotes go through the book too, so its listeners see every update
+        self.quotes.apply(prices.values())
+        return prices
+
+    def start_recording(self, directory="ticks"):
+        """Record every quote change into memory-mapped day files under directory"""
+        from .recorder import TickRecorder
+
+        if self.recorder is None:
+            self.recorder = TickRecorder(directory)
+            self.quotes.add_listener(self.recorder.on_quote)
+        return self.recorder
+
+    def stop_recording(self):
+        if self.recorder is not None:
+            self.quotes.remove_listener(self.recorder.on_quote)
+            self.recorder.close()
+            self.recorder = None
+
+    def record_session(self, uics, directory="ticks", poll_interval=1, duration=None):
+        """Headless recording until Ctrl+C or for duration seconds: streams when possible, otherwise polls"""
+        self.start_recording(directory)
+        stream = self.start_price_stream(uics)
+        print(f"Recording {len(uics)} instruments to {directory}/ (Ctrl+C to stop)")
+        deadline = time.monotonic() + duration if duration is not None else None
+        try:
+            while deadline is None or time.monotonic() < deadline:
+                if stream is None or not stream.connected:
+                    self.get_prices(uics)
+                wait = poll_interval if deadline is None else min(poll_interval, deadline - time.monotonic())
+                time.sleep(max(0.0, wait))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop_price_stream()
+            self.stop_recording()
+            print("\n⏹️  Stopped recording.")
+
     def get_position_size(self, uic):
-        """Get current position size for a given UIC. Returns (amount, symbol) or (0, None) if no position."""
-        positions = get_positions(self.headers, self.client_key)
-        
-        for pos in positions.get("Data", []):
-            base = pos.get("PositionBase", {})
-            if str(base.get("Uic")) == str(uic):
-                amount = int(base["Amount"])
-                symbol = pos["DisplayAndFormat"]["Symbol"]
-                return amount, symbol
-        
-        return 0, None
+        """Get current net position size for a given UIC. Returns (amount, symbol) or (0, None) if no position."""
+        self._sync_positions(uic)
+        return self.positions.size(uic, symbols=self.instruments)
+
+    def _sync_positions(self, uic):
+        """Reload positions unless the book already has a confirmed row for uic"""
+        if (self.positions.loaded_at is None or self.positions.position(uic) is None
+                or self.positions.has_pending(uic)):
+            self.positions.refresh(self.client, self.client_key)
+
+    def place_market_order(self, uic, amount, buy_sell):
+        """Place a market order and count it in the position book; risk rejections come back as ErrorInfo"""
+        try:
+            resp = place_market_order(self.client, self.account_key, uic=uic, amount=amount, buy_sell=buy_sell)
+        except RiskError as e:
+            return {"ErrorInfo": {"ErrorCode": f"Risk.{e.reason}", "Message": str(e)}}
+        self.record_order(uic, amount, buy_sell, resp)
+        return resp
+
+    def record_order(self, uic, amount, buy_sell, resp):
+        """Count an order response in the position book and PnL; False if the order was not accepted"""
+        if not self.positions.apply_order(uic, amount, buy_sell, resp):
+            return False
+        self.pnl.apply_order(uic, amount, buy_sell, resp, quote=self.quotes.get(uic))
+        return True
+
+    def algo_broker(self):
+        """Gateway broker for execution algos; each child fill counts toward positions and PnL"""
+        return algos.GatewayBroker(self.client, self.account_key, self.client_key,
+                                   lambda uic: self.get_prices([uic])[uic]["Quote"], on_fill=self.record_order,
+                                   instruments=self.instruments)
+
+    def run_algo(self, algo, interval=0.5):
+        """Work an algo to completion, printing each fill; returns its report"""
+        reported = set()
+
+        def on_step(algo):
+            for child in algo.children:
+                if child["Status"] == "Filled" and child["OrderId"] not in reported:
+                    reported.add(child["OrderId"])
+                    how = "converted to market" if child["Converted"] else child["OrderType"].lower()
+                    print(f" ✅ {child['Amount']:,} @ {self.instruments.format_price(algo.uic, child['FillPrice'])} "
+                          f"({how}) | {algo.filled:,}/{algo.amount:,}")
+
+        return algos.run(algo, interval=interval, on_step=on_step)
+
+    def portfolio_pnl(self):
+        """Live {'unrealized', 'realized', 'total'} in the account currency, from quotes only"""
+        missing = [uic for uic in self.pnl.quote_uics() if self.quotes.get(uic) is None]
+        if missing:
+            self.get_prices(missing)  # first call only; later ticks arrive through the quote book
+        return self.pnl.totals()
 
     def live_price_ticker(self, uics, update_interval=1):
         """Professional live price ticker using rich library"""
         if not RICH_AVAILABLE:
             print("❌ Rich library not available. Install with: pip install rich")
             return self._fallback_ticker(uics, update_interval)
-        
+        from rich import box
+        from rich.console import Console
+        from rich.live import Live
+        from rich.table import Table
+        from rich.text import Text
+
+        # Stream the held and currency-conversion pairs too, so the P&L caption stays live
+        self.start_price_stream(sorted(set(uics) | set(self.pnl.quote_uics())))
         console = Console()
         prev_prices = {}
         start_time = time.time()
@@ -84,65 +309,25 @@ class SaxoTradingBot:
             table.add_column("Bid", justify="right", style="dim")
             table.add_column("Ask", justify="right", style="dim")
             table.add_column("Change", justify="center")
+            table.add_column("Spread", justify="right")
+            table.add_column("Vol bp", justify="right")
+            table.add_column("Ticks/s", justify="right", style="dim")
+            table.add_column(f"{self.analytics.window_minutes}m Low–High", justify="right", style="dim")
+            table.add_column("Trend", style="cyan", no_wrap=True)
             table.add_column("Time", style="dim", no_wrap=True)
             
             try:
-                prices = get_fx_prices(self.headers, self.account_key, uics)
-                current_time = datetime.now().strftime("%H:%M:%S")
-                
-                for i, uic in enumerate(uics):
-                    try:
-                        quote = prices['Data'][i]['Quote']
-                        current_price = quote['Mid']
-                        bid = quote.get('Bid', 0)
-                        ask = quote.get('Ask', 0)
-                        
-                        symbol = self.uic_shortlist.get(uic, f"UIC {uic}")
-                        
-                        # Calculate change and direction
-                        if uic in prev_prices:
-                            prev_price = prev_prices[uic]
-                            change = current_price - prev_price
-                            change_pct = (change / prev_price) * 100 if prev_price != 0 else 0
-                            
-                            if change > 0:
-                                change_text = Text(f"+{change:.5f} (+{change_pct:.2f}%)", style="green")
-                                price_style = "green"
-                            elif change < 0:
-                                change_text = Text(f"{change:.5f} ({change_pct:.2f}%)", style="red")
-                                price_style = "red"
-                            else:
-                                change_text = Text("0.00000 (0.00%)", style="yellow")
-                                price_style = "yellow"
-                        else:
-                            change_text = Text("NEW", style="blue")
-                            price_style = "blue"
-                        
-                        # Format price with proper styling
-                        price_text = Text(f"{current_price:.5f}", style=price_style)
-                        
-                        table.add_row(
-                            symbol,
-                            price_text,
-                            f"{bid:.5f}" if bid else "N/A",
-                            f"{ask:.5f}" if ask else "N/A", 
-                            change_text,
-                            current_time
-                        )
-                        
-                        prev_prices[uic] = current_price
-                        
-                    except (KeyError, IndexError, TypeError):
-                        table.add_row(
-                            f"UIC {uic}",
-                            Text("ERROR", style="red"),
-                            "N/A", "N/A",
-                            Text("ERROR", style="red"),
-                            current_time
-                        )
-                
+                prices = self.get_prices(uics)
+                for row in self._ticker_rows(uics, prices, prev_prices, datetime.now().strftime("%H:%M:%S")):
+                    table.add_row(*row)
             except Exception as e:
-                table.add_row("API", "ERROR", "N/A", "N/A", Text("ERROR", style="red"), "ERROR")
+                table.add_row("API", "ERROR", "N/A", "N/A", Text("ERROR", style="red"), "", "", "", "", "", "ERROR")
+
+            if self.pnl.size:
+                pnl = self.pnl.totals()
+                style = "green" if pnl["total"] >= 0 else "red"
+                table.caption = (f"[{style}]Portfolio P&L €{pnl['total']:,.2f}[/{style}] "
+                                 f"(unrealized €{pnl['unrealized']:,.2f}, realized €{pnl['realized']:,.2f})")
             
             return table
         
@@ -156,8 +341,148 @@ class SaxoTradingBot:
             console.print("\n[bold blue]⏹️  Stopped live ticker. Returning to main menu...[/bold blue]")
             time.sleep(1)
 
+    def _ticker_rows(self, uics, prices, prev_prices, current_time):
+        """Cells for each live ticker row; prev_prices keeps the last mid shown per Uic"""
+        from rich.text import Text
+
+        rows = []
+        for uic in uics:
+            try:
+                quote = prices[uic]['Quote']
+                current_price = quote['Mid']
+                bid = quote.get('Bid', 0)
+                ask = quote.get('Ask', 0)
+
+                symbol = self.instruments.get(uic, f"UIC {uic}")
+
+                # Calculate change and direction
+                if uic in prev_prices:
+                    prev_price = prev_prices[uic]
+                    change = current_price - prev_price
+                    change_pct = (change / prev_price) * 100 if prev_price != 0 else 0
+
+                    if change > 0:
+                        change_text = Text(f"+{change:.5f} (+{change_pct:.2f}%)", style="green")
+                        price_style = "green"
+                    elif change < 0:
+                        change_text = Text(f"{change:.5f} ({change_pct:.2f}%)", style="red")
+                        price_style = "red"
+                    else:
+                        change_text = Text("0.00000 (0.00%)", style="yellow")
+                        price_style = "yellow"
+                else:
+                    change_text = Text("NEW", style="blue")
+                    price_style = "blue"
+
+                # Format price with proper styling
+                price_text = Text(self.instruments.format_price(uic, current_price), style=price_style)
+
+                rows.append((
+                    symbol,
+                    price_text,
+                    self.instruments.format_price(uic, bid) if bid else "N/A",
+                    self.instruments.format_price(uic, ask) if ask else "N/A",
+                    change_text,
+                    *self._analytics_cells(uic),
+                    current_time
+                ))
+
+                prev_prices[uic] = current_price
+
+            except (KeyError, IndexError, TypeError):
+                rows.append((
+                    f"UIC {uic}",
+                    Text("ERROR", style="red"),
+                    "N/A", "N/A",
+                    Text("ERROR", style="red"),
+                    "", "", "", "", "",
+                    current_time
+                ))
+        return rows
+
+    def _analytics_cells(self, uic):
+        """Spread, volatility, tick rate, window low-high and sparkline cells for the ticker"""
+        stats = self.analytics.stats(uic)
+        if stats is None:
+            return "…", "…", "…", "…", ""
+        fmt = self.instruments.format_price
+        low_high = f"{fmt(uic, stats['low'])}–{fmt(uic, stats['high'])}" if stats["high"] is not None else "…"
+        return (f"{stats['spread_pips']:.1f}", f"{stats['vol_bp']:.2f}", f"{stats['tick_rate']:.2f}",
+                low_high, self.analytics.sparkline(uic))
+
+    def dashboard(self, uics, refresh_interval=1, fps=10):
+        """Live dashboard: background quote refresh, fixed-rate incremental rendering"""
+        if not RICH_AVAILABLE:
+            print("❌ Rich library not available. Install with: pip install rich")
+            return self._fallback_ticker(uics, refresh_interval)
+        from .dashboard import Dashboard
+
+        self.start_price_stream(uics)
+        Dashboard(self.get_prices, uics, symbols=self.instruments, decimals=self.instruments.decimals,
+                  refresh_interval=refresh_interval, fps=fps).run()
+        print("\n⏹️  Stopped dashboard. Returning to main menu...")
+
+    def run_app(self, uics, quote_interval=1, position_interval=5):
+        """Trading terminal where quotes, positions and order entry run concurrently"""
+        if not (TEXTUAL_AVAILABLE and AIO_AVAILABLE):
+            print("❌ Trading terminal needs textual and aiohttp. Install with: pip install textual aiohttp")
+            return
+        from .app import TradingApp
+
+        self.start_price_stream(sorted(set(uics) | set(self.pnl.quote_uics())))
+        TradingApp(self, uics, quote_interval=quote_interval, position_interval=position_interval).run()
+        print("\n⏹️  Closed trading terminal. Returning to main menu...")
+
+    def latency_panel(self, refresh_interval=1):
+        """Live per-endpoint latency table from the client's metrics until Ctrl+C"""
+        columns = ("Endpoint", "Req", "Err", "DNS p50", "Conn p50", "TTFB p50", "p50", "p99", "Max", "KB in")
+
+        def fmt(value):
+            return f"{value:.1f}" if value is not None else "-"
+
+        def rows():
+            for name, stats in self.client.metrics.snapshot()["endpoints"].items():
+                yield (name, str(stats["requests"]), str(stats["errors"]),
+                       fmt(stats["dns"]["p50_ms"]), fmt(stats["connect"]["p50_ms"]), fmt(stats["ttfb"]["p50_ms"]),
+                       fmt(stats["total"]["p50_ms"]), fmt(stats["total"]["p99_ms"]), fmt(stats["total"]["max_ms"]),
+                       f"{stats['bytes_received'] / 1024:.1f}")
+
+        if not RICH_AVAILABLE:
+            print("\nAPI latency (ms):")
+            print(" | ".join(columns))
+            for row in rows():
+                print(" | ".join(row))
+            return
+        from rich import box
+        from rich.console import Console
+        from rich.live import Live
+        from rich.table import Table
+
+        def make_table():
+            table = Table(title="📈 API Latency (ms)", box=box.ROUNDED)
+            for i, column in enumerate(columns):
+                table.add_column(column, justify="left" if i == 0 else "right", no_wrap=True,
+                                 style="cyan" if i == 0 else None)
+            for row in rows():
+                table.add_row(*row)
+            return table
+
+        console = Console()
+        try:
+            with Live(make_table(), console=console, refresh_per_second=1/refresh_interval) as live:
+                while True:
+                    time.sleep(refresh_interval)
+                    live.update(make_table())
+        except KeyboardInterrupt:
+            pass
+
+    def export_latency(self, path):
+        """Write the current latency snapshot as JSON"""
+        return self.client.metrics.export(path)
+
     def _fallback_ticker(self, uics, update_interval):
         """Fallback ticker without rich library"""
+        self.start_price_stream(uics)
         print("\n🔄 Live Price Ticker (Press Ctrl+C to stop)")
         print("=" * 60)
         
@@ -165,7 +490,7 @@ class SaxoTradingBot:
         
         try:
             while True:
-                prices = get_fx_prices(self.headers, self.account_key, uics)
+                prices = self.get_prices(uics)
                 current_time = time.strftime("%H:%M:%S")
                 
                 sys.stdout.write('\033[2J\033[H')
@@ -174,9 +499,9 @@ class SaxoTradingBot:
                 print(f"🔄 Live FX Prices - {current_time}")
                 print("=" * 60)
                 
-                for i, uic in enumerate(uics):
+                for uic in uics:
                     try:
-                        quote = prices['Data'][i]['Quote']
+                        quote = prices[uic]['Quote']
                         current_price = quote['Mid']
                         bid = quote.get('Bid', 'N/A')
                         ask = quote.get('Ask', 'N/A')
@@ -196,8 +521,8 @@ class SaxoTradingBot:
                             indicator = "🆕"
                             color = "\033[94m"
                         
-                        symbol = self.uic_shortlist.get(uic, f"UIC {uic}")
-                        price_str = f"{current_price:.5f}"
+                        symbol = self.instruments.get(uic, f"UIC {uic}")
+                        price_str = self.instruments.format_price(uic, current_price)
                         colored_price = f"{color}{price_str}\033[0m"
                         
                         print(f"{indicator} {symbol:12} | Price: {colored_price:>10} | Bid: {bid:>8} | Ask: {ask:>8}")
@@ -217,14 +542,8 @@ class SaxoTradingBot:
             time.sleep(1)
 
     def manage_position(self, uic):
-        positions = get_positions(self.headers, self.client_key)
-
-        pos_data = None
-        for pos in positions.get("Data", []):
-            base = pos.get("PositionBase", {})
-            if str(base.get("Uic")) == str(uic):
-                pos_data = pos
-                break
+        self._sync_positions(uic)
+        pos_data = self.positions.position(uic)
 
         if not pos_data:
             print("No open position found for this instrument.")
@@ -243,40 +562,46 @@ class SaxoTradingBot:
         decision = input("Do you want to sell this position now? (y/n): ").strip().lower()
         if decision == 'y':
             print("Placing market sell order...")
-            sell_resp = place_market_order(self.headers, self.account_key, uic=uic, amount=amount, buy_sell="Sell")
+            self.get_prices([uic])  # fresh touch price in case the response carries no fill price
+            realized_before = self.pnl.by_uic().get(uic, {}).get("realized", 0.0)
+            sell_resp = self.place_market_order(uic, amount, "Sell")
             print("Order response:", sell_resp)
+            if not isinstance(sell_resp, dict) or "OrderId" not in sell_resp:
+                return
 
-            prices = get_fx_prices(self.headers, self.account_key, [uic])
-            sell_price = prices['Data'][0]['Quote']['Mid']
-            print(f"Sell Price (current market mid): {sell_price:.5f}")
-
-            realized_pnl = (sell_price - open_price) * amount
-            print(f"Realized P&L from this trade: €{realized_pnl:.2f}")
+            realized_pnl = self.pnl.by_uic()[uic]["realized"] - realized_before
+            print(f"Realized P&L from this trade: {realized_pnl:.2f} in quote currency "
+                  f"(€{self.pnl.to_account(uic, realized_pnl):.2f})")
         else:
             print("Holding position.")
 
     def run(self):
         print("Getting user, client, and account info...")
         self.setup()
+        self.positions.refresh(self.client, self.client_key)
+        self.positions.start_polling(self.client, self.client_key)
+        self.instruments.start_refresh(self.client)
 
-        def show_uic_shortlist():
-            print("\nAvailable instruments (UIC: Symbol):")
-            for uic, symbol in sorted(self.uic_shortlist.items()):
-                print(f" {uic}: {symbol}")
+        def show_watchlist():
+            print(f"\nWatchlist (UIC: Symbol) — {len(self.instruments)} instruments known, enter a UIC or symbol:")
+            for uic in self.watchlist:
+                print(f" {uic}: {self.instruments.get(uic, f'UIC {uic}')}")
 
         def prompt_uic(default_uic=None):
             while True:
-                show_uic_shortlist()
+                show_watchlist()
                 raw = input(f"Enter instrument UIC{f' (default {default_uic})' if default_uic else ''}: ").strip()
                 if not raw and default_uic is not None:
                     return int(default_uic)
                 if raw.isdigit():
                     return int(raw)
-                print("Please enter a valid numeric UIC.")
+                if raw and self.instruments.uic(raw) is not None:
+                    return self.instruments.uic(raw)
+                print("Please enter a valid numeric UIC or a known symbol.")
 
         def prompt_multiple_uics():
             """Prompt for multiple UICs for live ticker"""
-            show_uic_shortlist()
+            show_watchlist()
             print("\nEnter UICs separated by commas (e.g., 16,21,31) or press Enter for default (16,21):")
             raw = input("UICs: ").strip()
             
@@ -284,7 +609,9 @@ class SaxoTradingBot:
                 return [16, 21]  # Default to EUR/DKK and EUR/USD
             
             try:
-                uics = [int(x.strip()) for x in raw.split(',')]
+                uics = [int(x) if x.isdigit() else self.instruments.uic(x) for x in (x.strip() for x in raw.split(','))]
+                if None in uics:
+                    raise ValueError
                 return uics
             except ValueError:
                 print("Invalid format. Using default UICs (16,21)")
@@ -312,6 +639,13 @@ class SaxoTradingBot:
             print("5) Sell FX (market)")
             print("6) Manage existing position by UIC (prompted)")
             print("7) 🔄 Live Price Ticker (real-time updates)")
+            print("8) Account snapshot (balance, positions, prices)")
+            print("9) 📊 Live dashboard (large watchlists)")
+            print("10) ⏺️  Toggle tick recording")
+            print("11) 📈 API latency panel")
+            print("12) 🧺 Basket order (several market legs at once)")
+            print("13) 🖥️  Trading terminal (live quotes + order entry)")
+            print("14) ⏱️  Execution algo (TWAP / iceberg / limit-then-market)")
             print("0) Exit")
 
         while True:
@@ -320,15 +654,15 @@ class SaxoTradingBot:
 
             if choice == '1':
                 print("\nGetting account balance...")
-                balance = get_balance(self.headers, self.client_key, self.account_key)
+                balance = get_balance(self.client, self.client_key, self.account_key)
                 print_balance_summary(balance)
 
             elif choice == '2':
                 uic = prompt_uic(default_uic=16)
                 print("\nFetching live FX price...")
-                prices = get_fx_prices(self.headers, self.account_key, [uic])
+                prices = self.get_prices([uic])
                 try:
-                    quote = prices['Data'][0]['Quote']
+                    quote = prices[uic]['Quote']
                     mid = quote['Mid']
                     bid = quote.get('Bid')
                     ask = quote.get('Ask')
@@ -339,14 +673,15 @@ class SaxoTradingBot:
 
             elif choice == '3':
                 print("\nFetching open positions...")
-                positions = get_positions(self.headers, self.client_key)
+                positions = get_positions(self.client, self.client_key)
+                self.positions.load(positions)
                 print_positions_summary(positions)
 
             elif choice == '4':
                 uic = prompt_uic(default_uic=16)
                 amount = prompt_amount()
                 print("\nPlacing market BUY order...")
-                resp = place_market_order(self.headers, self.account_key, uic=uic, amount=amount, buy_sell="Buy")
+                resp = self.place_market_order(uic, amount, "Buy")
                 print("Order response:", resp)
 
             elif choice == '5':
@@ -367,7 +702,7 @@ class SaxoTradingBot:
                     continue
                 
                 print(f"\nPlacing market SELL order for {amount:,} units...")
-                resp = place_market_order(self.headers, self.account_key, uic=uic, amount=amount, buy_sell="Sell")
+                resp = self.place_market_order(uic, amount, "Sell")
                 print("Order response:", resp)
 
             elif choice == '6':
@@ -378,8 +713,105 @@ class SaxoTradingBot:
                 uics = prompt_multiple_uics()
                 self.live_price_ticker(uics)
 
+            elif choice == '8':
+                uics = prompt_multiple_uics()
+                print("\nRefreshing account snapshot...")
+                snapshot = self.refresh_snapshot(uics)
+                self.positions.load(snapshot["positions"])
+                print_balance_summary(snapshot["balance"])
+                print_positions_summary(snapshot["positions"])
+                print("\nPrices:")
+                for uic in uics:
+                    try:
+                        quote = snapshot["prices"][uic]['Quote']
+                        symbol = self.instruments.get(uic, f"UIC {uic}")
+                        print(f" {symbol} | Mid: {quote['Mid']} | Bid: {quote.get('Bid')} | Ask: {quote.get('Ask')}")
+                    except (KeyError, IndexError, TypeError):
+                        print(f" UIC {uic} | Could not retrieve price data")
+
+            elif choice == '9':
+                uics = prompt_multiple_uics()
+                self.dashboard(uics)
+
+            elif choice == '10':
+                if self.recorder is None:
+                    directory = input("Directory for tick files (default ticks): ").strip() or "ticks"
+                    self.start_recording(directory)
+                    print(f"Recording quotes to {directory}/ while the ticker or dashboard runs.")
+                else:
+                    self.stop_recording()
+                    print("Stopped recording.")
+
+            elif choice == '11':
+                self.latency_panel()
+                path = input("\nExport latency snapshot to file (blank to skip): ").strip()
+                if path:
+                    print(f"Saved latency snapshot to {self.export_latency(path)}")
+
+            elif choice == '12':
+                show_watchlist()
+                print("\nEnter legs as uic,amount,side separated by ';' (e.g. 21,100000,Buy; 17,50000,Sell):")
+                raw = input("Legs: ").strip()
+                try:
+                    legs = [tuple(part.strip() for part in leg.split(",")) for leg in raw.split(";") if leg.strip()]
+                    legs = [(uic, float(amount.replace("_", "")), side) for uic, amount, side in legs]
+                    result = self.place_basket(legs)
+                except ValueError as e:
+                    print(f"\n❌ Invalid basket: {e}")
+                    continue
+
+                print(f"\nBasket {'accepted' if result['ok'] else 'had rejected legs'} in {result['wall_ms']:.1f} ms "
+                      f"(leg skew {result['skew_ms']:.1f} ms)")
+                for leg in result["legs"]:
+                    status = "✅" if leg["ok"] else "❌"
+                    print(f" {status} {leg['buy_sell']} {leg['amount']:,} UIC {leg['uic']} | "
+                          f"{leg['latency_ms']:.1f} ms | {leg['response']}")
+
+            elif choice == '13':
+                uics = prompt_multiple_uics()
+                self.run_app(uics)
+
+            elif choice == '14':
+                uic = prompt_uic(default_uic=21)
+                amount = prompt_amount()
+                buy_sell = "Sell" if input("Side (buy/sell, default buy): ").strip().lower().startswith("s") else "Buy"
+                kind = input("Algo: 1) TWAP  2) Iceberg  3) Limit then market (default 1): ").strip() or "1"
+                try:
+                    if kind == "2":
+                        display = int(float(input("Visible clip size (default 100000): ").strip() or 100000))
+                        timeout = float(input("Seconds before a clip crosses the spread (blank: never): ").strip() or 0)
+                        algo = algos.Iceberg(self.algo_broker(), uic, amount, buy_sell, display, timeout=timeout or None)
+                    elif kind == "3":
+                        timeout = float(input("Seconds to rest before converting (default 30): ").strip() or 30)
+                        algo = algos.LimitThenMarket(self.algo_broker(), uic, amount, buy_sell, timeout)
+                    else:
+                        duration = float(input("Duration in seconds (default 60): ").strip() or 60)
+                        slices = int(input("Slices (default 6): ").strip() or 6)
+                        algo = algos.TWAP(self.algo_broker(), uic, amount, buy_sell, duration, slices)
+                except ValueError as e:
+                    print(f"\n❌ Invalid algo parameters: {e}")
+                    continue
+
+                print(f"\nWorking {buy_sell} {amount:,} {self.instruments.get(uic, f'UIC {uic}')} "
+                      f"(Ctrl+C cancels the working child)...")
+                report = self.run_algo(algo)
+                if report["error"]:
+                    print(f" ❌ Stopped: {report['error']}")
+                print(f"Filled {report['filled']:,}/{report['amount']:,} in {report['children']} children "
+                      f"({report['converted']} converted to market) over {report['elapsed']:.1f}s")
+                if report["filled"]:
+                    print(f"Average {self.instruments.format_price(uic, report['average_price'])} vs arrival mid "
+                          f"{self.instruments.format_price(uic, report['arrival_mid'])}: shortfall "
+                          f"{report['shortfall_bps']:.2f} bp, {report['total_cost']:,.2f} in quote currency")
+
             elif choice == '0':
                 print("\nExiting trading bot.")
+                self.stop_price_stream()
+                self.stop_recording()
+                self.positions.stop_polling()
+                self.instruments.stop_refresh()
+                if self.quote_feed is not None:
+                    self.quote_feed.close()
                 break
 
             else:
@@ -0,0 +1,155 @@
+"""Render-decoupled live dashboard.
+
+A background thread refreshes quotes and marks changed Uics dirty; the
+renderer runs at a fixed frame rate, restyles only the dirty rows and
+reuses the cached line of every other row. Network latency therefore
+never stalls a frame.
+
+Rows are fixed-width Text lines rather than a rich Table: Table re-measures
+every cell on every frame, which costs ~300 ms for 500 rows.
+"""
+import threading
+import time
+from datetime import datetime
+
+from rich.console import Console, Group
+from rich.live import Live
+from rich.rule import Rule
+from rich.text import Text
+
+# (header, width, justify) per column
+COLUMNS = (("Symbol", 12, "<"), ("Price", 11, ">"), ("Bid", 11, ">"), ("Ask", 11, ">"),
+           ("Change", 22, "^"), ("Time", 9, ">"))
+
+
+def _cell(value, column):
+    _, width, justify = COLUMNS[column]
+    return f"{value:{justify}{width}} "
+
+
+def _line(cells):
+    """cells: one (value, style) pair per column"""
+    line = Text(no_wrap=True, overflow="crop")
+    for column, (value, style) in enumerate(cells):
+        line.append(_cell(value, column), style=style)
+    return line
+
+
+class Dashboard:
+    def __init__(self, fetch, uics, symbols=None, refresh_interval=1.0, fps=10, console=None, decimals=None):
+        self.fetch = fetch
+        self.uics = list(uics)
+        self.symbols = symbols or {}
+        self.decimals = decimals or (lambda uic: 5)  # uic -> price decimals
+        self.refresh_interval = refresh_interval
+        self.fps = fps
+        self.console = console or Console()
+
+        self._latest = {}    # uic -> quote from the last fetch
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        self._header = _line((name, "bold") for name, _, _ in COLUMNS)
+        self._rows = {uic: self._placeholder(uic) for uic in self.uics}
+        self._prev_mid = {}
+        self.fetch_ms = None
+        self.fetch_error = None
+        self.frame_ms = 0.0
+        self.frames = 0
+
+    def _symbol(self, uic):
+        return self.symbols.get(uic, f"UIC {uic}")
+
+    def _placeholder(self, uic):
+        return _line(((self._symbol(uic), "cyan"), ("…", "dim"), ("N/A", "dim"), ("N/A", "dim"),
+                      ("WAITING", "dim"), ("", "dim")))
+
+    def _refresh_loop(self):
+        while not self._stop.is_set():
+            start = time.perf_counter()
+            try:
+                prices = self.fetch(self.uics)
+                self.fetch_error = None
+            except Exception as e:
+                prices = {}
+                self.fetch_error = type(e).__name__
+            self.fetch_ms = (time.perf_counter() - start) * 1000
+
+            with self._lock:
+                for uic, item in prices.items():
+                    quote = item.get("Quote")
+                    if quote and quote != self._latest.get(uic):
+                        self._latest[uic] = quote
+                        self._dirty.add(uic)
+            self._stop.wait(self.refresh_interval)
+
+    def _restyle(self, uic, quote, stamp):
+        """Rebuild the line of one row from its new quote"""
+        mid = quote.get("Mid")
+        if mid is None:
+            return
+        bid = quote.get("Bid")
+        ask = quote.get("Ask")
+
+        prev = self._prev_mid.get(uic)
+        if prev is None:
+            change_text, style = "NEW", "blue"
+        else:
+            change = mid - prev
+            change_pct = (change / prev) * 100 if prev != 0 else 0
+            if change > 0:
+                change_text, style = f"+{change:.5f} (+{change_pct:.2f}%)", "green"
+            elif change < 0:
+                change_text, style = f"{change:.5f} ({change_pct:.2f}%)", "red"
+            else:
+                change_text, style = "0.00000 (0.00%)", "yellow"
+        self._prev_mid[uic] = mid
+
+        places = self.decimals(uic)
+        self._rows[uic] = _line((
+            (self._symbol(uic), "cyan"),
+            (f"{mid:.{places}f}", f"bold {style}"),
+            (f"{bid:.{places}f}" if bid else "N/A", "dim"),
+            (f"{ask:.{places}f}" if ask else "N/A", "dim"),
+            (change_text, style),
+            (stamp, "dim"),
+        ))
+
+    def _status(self):
+        fetch = f"{self.fetch_ms:.0f} ms" if self.fetch_ms is not None else "…"
+        error = f" | fetch error: {self.fetch_error}" if self.fetch_error else ""
+        return Text(f"frame {self.frame_ms:.2f} ms | target {self.fps} FPS | fetch {fetch} | "
+                    f"{len(self.uics)} instruments | Ctrl+C to stop{error}", style="dim")
+
+    def render(self):
+        """Apply pending quote changes and build one frame"""
+        with self._lock:
+            dirty = {uic: self._latest[uic] for uic in self._dirty}
+            self._dirty.clear()
+        if dirty:
+            stamp = datetime.now().strftime("%H:%M:%S")
+            for uic, quote in dirty.items():
+                self._restyle(uic, quote, stamp)
+
+        body = Text("\n", no_wrap=True).join(self._rows[uic] for uic in self.uics)
+        return Group(Rule("🚀 Live FX Market Data"), self._header, body, Rule(), self._status())
+
+    def run(self):
+        """Refresh in the background and render at a fixed rate until Ctrl+C"""
+        refresher = threading.Thread(target=self._refresh_loop, name="dashboard-refresh", daemon=True)
+        refresher.start()
+        frame_interval = 1 / self.fps
+        try:
+            with Live(console=self.console, auto_refresh=False) as live:
+                while True:
+                    start = time.perf_counter()
+                    live.update(self.render(), refresh=True)
+                    self.frame_ms = (time.perf_counter() - start) * 1000
+                    self.frames += 1
+                    time.sleep(max(0.0, frame_interval - self.frame_ms / 1000))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._stop.set()
+            refresher.join(self.refresh_interval + 1)
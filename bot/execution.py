@@ -1,19 +1,80 @@
-import requests
+import inspect
+from concurrent.futures import ThreadPoolExecutor
 
-BASE_URL = "https://gateway.saxobank.com/sim/openapi"
+ORDERS_PATH = "/trade/v2/orders"
+INFOPRICES_PATH = "/trade/v1/infoprices/list"
 
+# Uics per infoprices request, and how many chunk requests may be in flight at once
+PRICE_CHUNK_SIZE = 50
+MAX_PARALLEL_CHUNKS = 8
 
-def get_fx_prices(headers, account_key, uics):
-    uic_str = ",".join(str(uic) for uic in uics)
-    url = (f"{BASE_URL}/trade/v1/infoprices/list?AccountKey={account_key}"
-           f"&Uics={uic_str}&AssetType=FxSpot&Amount=100000&FieldGroups=DisplayAndFormat,Quote")
-    return requests.get(url, headers=headers).json()
+_chunk_executor = ThreadPoolExecutor(max_workers=MAX_PARALLEL_CHUNKS, thread_name_prefix="prices")
 
-def place_limit_order(headers, account_key, uic, price, amount=100000):
-    url = f"{BASE_URL}/trade/v2/orders"
+
+def chunked(uics, size):
+    uics = list(uics)
+    return [uics[i:i + size] for i in range(0, len(uics), size)]
+
+def price_params(account_key, uics):
+    return {
+        "AccountKey": account_key,
+        "Uics": ",".join(str(uic) for uic in uics),
+        "AssetType": "FxSpot",
+        "Amount": 100000,
+        "FieldGroups": "DisplayAndFormat,Quote",
+    }
+
+def quotes_by_uic(responses):
+    """Merge infoprices responses into {uic: item}; the API does not keep request order"""
+    merged = {}
+    for resp in responses:
+        for item in (resp or {}).get("Data", []):
+            merged[item["Uic"]] = item
+    return merged
+
+def get_fx_prices(client, account_key, uics, chunk_size=PRICE_CHUNK_SIZE):
+    """Fetch quotes as {uic: item}; large lists are split into chunks fetched concurrently"""
+    def fetch(chunk):
+        return client.get(INFOPRICES_PATH, params=price_params(account_key, chunk))
+
+    chunks = chunked(uics, chunk_size)
+    if len(chunks) <= 1:
+        return quotes_by_uic(fetch(chunk) for chunk in chunks)
+    return quotes_by_uic(_chunk_executor.map(fetch, chunks))
+
+def _submit_order(client, data, price=None, reservation=None):
+    """POST an order behind the client's risk engine (if any); rejected orders release their reservation.
+
+    reservation is a risk.check() result taken beforehand, e.g. for every leg of a basket at once.
+    """
+    risk = getattr(client, "risk", None)
+    if risk is None:
+        return client.post(ORDERS_PATH, json=data)
+
+    if reservation is None:
+        reservation = risk.check(data["Uic"], data["Amount"], data["BuySell"], price)
+    try:
+        resp = client.post(ORDERS_PATH, json=data)
+    except BaseException:
+        risk.release(reservation)
+        raise
+    if not inspect.isawaitable(resp):
+        return risk.settle(reservation, resp)
+
+    async def settled():
+        try:
+            result = await resp
+        except BaseException:
+            risk.release(reservation)
+            raise
+        return risk.settle(reservation, result)
+    return settled()
+
+def place_limit_order(client, account_key, uic, price, amount=100000, buy_sell="Buy",
+                      duration="GoodTillCancel"):
     data = {
         "Uic": uic,
-        "BuySell": "Buy",
+        "BuySell": buy_sell,
         "AssetType": "FxSpot",
         "Amount": amount,
         "OrderPrice": price,
@@ -21,14 +82,13 @@ def place_limit_order(headers, account_key, uic, price, amount=100000):
         "OrderRelation": "StandAlone",
         "ManualOrder": True,
         "OrderDuration": {
-            "DurationType": "GoodTillCancel"
+            "DurationType": duration
         },
         "AccountKey": account_key
     }
-    return requests.post(url, json=data, headers=headers).json()
+    return _submit_order(client, data, price=price)
 
-def place_market_order(headers, account_key, uic, amount, buy_sell="Sell"):
-    url = f"{BASE_URL}/trade/v2/orders"
+def place_market_order(client, account_key, uic, amount, buy_sell="Sell", reservation=None):
     data = {
         "Uic": uic,
         "BuySell": buy_sell,
@@ -42,10 +102,9 @@ def place_market_order(headers, account_key, uic, amount, buy_sell="Sell"):
         },
         "AccountKey": account_key
     }
-    return requests.post(url, json=data, headers=headers).json()
+    return _submit_order(client, data, reservation=reservation)
 
-def convert_to_market_order(headers, account_key, order_id, uic):
-    url = f"{BASE_URL}/trade/v2/orders"
+def convert_to_market_order(client, account_key, order_id, uic):
     data = {
         "OrderType": "Market",
         "OrderDuration": {
@@ -55,4 +114,7 @@ def convert_to_market_order(headers, account_key, order_id, uic):
         "OrderId": order_id,
         "AssetType": "FxSpot"
     }
-    return requests.patch(url, json=data, headers=headers).json()
+    return client.patch(ORDERS_PATH, json=data)
+
+def cancel_order(client, account_key, order_id):
+    return client.delete(f"{ORDERS_PATH}/{order_id}", params={"AccountKey": account_key})
@@ -0,0 +1,194 @@
+"""Instrument reference data, cached on disk and indexed in memory.
+
+Details come from /ref/v1/instruments/details once and are written to a
+versioned JSON file. Startup reads that file, so symbol, decimals, tick size
+and minimum amount lookups are local dict hits; a background thread fetches
+fresh details whenever the file is older than its TTL.
+
+InstrumentCache reads as a mapping of Uic -> symbol, so it drops in
+wherever a {uic: symbol} dict was used for display.
+"""
+import json
+import os
+import threading
+import time
+from collections.abc import Mapping
+
+DETAILS_PATH = "/ref/v1/instruments/details"
+CACHE_VERSION = 1
+DEFAULT_TTL = 24 * 3600
+PAGE_SIZE = 1000
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "fx-execution-bot", "instruments.json")
+
+# Shown before the first fetch has finished, and the default menu watchlist
+SEED = {
+    16: "EURDKK",
+    21: "EURUSD",
+    31: "USDJPY",
+    22: "GBPUSD",
+    17: "EURGBP",
+}
+
+
+def normalise_symbol(symbol):
+    """'eur/usd' -> 'EURUSD'; Saxo FX symbols may carry a venue suffix like 'EURUSD:xcme'"""
+    return str(symbol).split(":")[0].replace("/", "").replace(" ", "").upper()
+
+
+def instrument_record(detail):
+    """Keep the reference fields the bot uses from one instruments/details item"""
+    fmt = detail.get("Format", {})
+    return {
+        "Uic": int(detail["Uic"]),
+        "Symbol": detail.get("Symbol", f"UIC {detail['Uic']}"),
+        "Description": detail.get("Description", ""),
+        "AssetType": detail.get("AssetType", "FxSpot"),
+        "CurrencyCode": detail.get("CurrencyCode"),
+        "Decimals": fmt.get("Decimals", 5),
+        "OrderDecimals": fmt.get("OrderDecimals", fmt.get("Decimals", 5)),
+        "TickSize": detail.get("TickSize"),
+        "MinimumTradeSize": detail.get("MinimumTradeSize", 0),
+        "AmountDecimals": detail.get("AmountDecimals", 0),
+    }
+
+
+def fetch_instrument_details(client, asset_type="FxSpot", uics=None, page_size=PAGE_SIZE):
+    """All instrument details for asset_type (or just uics), following $skip pages"""
+    params = {"AssetTypes": asset_type, "$top": page_size}
+    if uics:
+        params["Uics"] = ",".join(str(uic) for uic in uics)
+
+    records = []
+    skip = 0
+    while True:
+        resp = client.get(DETAILS_PATH, params=dict(params, **{"$skip": skip})) or {}
+        data = resp.get("Data", [])
+        records.extend(instrument_record(item) for item in data if "Uic" in item)
+        if not data or "__next" not in resp:
+            return records
+        skip += len(data)
+
+
+class InstrumentCache(Mapping):
+    """Reference data by Uic and by symbol, persisted to path with a TTL"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL, source=None):
+        self.path = path
+        self.ttl = ttl
+        self.source = source   # gateway base URL the data belongs to; a cache for another is ignored
+        self.fetched_at = None
+        self._by_uic = {}
+        self._by_symbol = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._refresher = None
+        self._stop_refresh = threading.Event()
+        self._index({uic: {"Uic": uic, "Symbol": symbol} for uic, symbol in SEED.items()})
+
+    def _index(self, by_uic):
+        by_symbol = {normalise_symbol(record["Symbol"]): uic for uic, record in by_uic.items()}
+        with self._lock:
+            self._by_uic, self._by_symbol = by_uic, by_symbol
+        for callback in self._listeners:
+            callback(self)
+
+    def add_listener(self, callback):
+        """callback(cache) runs after every load or refresh"""
+        self._listeners.append(callback)
+
+    # Mapping of Uic -> symbol
+    def __getitem__(self, uic):
+        return self._by_uic[uic]["Symbol"]
+
+    def __iter__(self):
+        return iter(sorted(self._by_uic))
+
+    def __len__(self):
+        return len(self._by_uic)
+
+    def details(self, uic):
+        return self._by_uic.get(uic)
+
+    def uic(self, symbol):
+        """Uic for a symbol such as 'EURUSD' or 'eur/usd', or None"""
+        return self._by_symbol.get(normalise_symbol(symbol))
+
+    def decimals(self, uic, default=5):
+        record = self._by_uic.get(uic)
+        if not record:
+            return default
+        if "Decimals" not in record:  # seed entry: JPY pairs quote to 3 places, the rest to 5
+            return 3 if normalise_symbol(record["Symbol"]).endswith("JPY") else default
+        return record["Decimals"]
+
+    def tick_size(self, uic):
+        """Smallest price increment for uic, or None before reference data is loaded"""
+        record = self._by_uic.get(uic)
+        return record.get("TickSize") if record else None
+
+    def format_price(self, uic, price):
+        return f"{price:.{self.decimals(uic)}f}"
+
+    @property
+    def stale(self):
+        return self.fetched_at is None or time.time() - self.fetched_at > self.ttl
+
+    def load(self):
+        """Read the on-disk cache; False if it is missing, unreadable, another version or another gateway"""
+        try:
+            with open(self.path) as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if payload.get("version") != CACHE_VERSION or payload.get("source") != self.source:
+            return False
+        self.fetched_at = payload.get("fetched_at")
+        self._index({record["Uic"]: record for record in payload.get("instruments", [])})
+        return True
+
+    def save(self):
+        payload = {
+            "version": CACHE_VERSION,
+            "source": self.source,
+            "fetched_at": self.fetched_at,
+            "instruments": [self._by_uic[uic] for uic in sorted(self._by_uic)],
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(payload, f)
+        os.replace(tmp, self.path)  # readers never see a half-written file
+
+    def refresh(self, client, asset_type="FxSpot"):
+        """Fetch details from the gateway, re-index and persist"""
+        records = fetch_instrument_details(client, asset_type)
+        if not records:
+            return False  # keep what we have rather than wiping it on an empty reply
+        self.fetched_at = time.time()
+        self._index({record["Uic"]: record for record in records})
+        self.save()
+        return True
+
+    def start_refresh(self, client, interval=None):
+        """Refresh now if stale, then every interval (default ttl) seconds, on a background thread"""
+        interval = interval or self.ttl
+
+        def run():
+            wait = 0 if self.stale else max(0.0, self.fetched_at + interval - time.time())
+            while not self._stop_refresh.wait(wait):
+                try:
+                    self.refresh(client)
+                except (OSError, ValueError, KeyError):
+                    pass  # keep the cached data; next round retries
+                wait = interval
+
+        self._stop_refresh.clear()
+        self._refresher = threading.Thread(target=run, name="instrument-refresh", daemon=True)
+        self._refresher.start()
+
+    def stop_refresh(self):
+        self._stop_refresh.set()
+        if self._refresher is not None:
+            self._refresher.join(1)
+            self._refresher = None
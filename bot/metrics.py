@@ -0,0 +1,247 @@
+"""Per-endpoint latency instrumentation for the API clients.
+
+Every request through SaxoClient/AsyncSaxoClient records DNS, connect
+(TCP + TLS), time-to-first-byte and total time into HDR-style histograms,
+plus status codes and payload sizes, keyed by method and path template.
+"""
+import json
+import re
+import socket
+import threading
+import time
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+# Log-linear buckets: 64 sub-buckets per power of two (~1.6% precision) over microseconds
+SUB_BUCKETS = 64
+MAX_SHIFT = 30
+
+PHASES = ("dns", "connect", "ttfb", "total")
+
+
+class LatencyHistogram:
+    """Fixed-memory latency histogram with bounded relative error, recorded in seconds"""
+
+    def __init__(self):
+        self.counts = [0] * (SUB_BUCKETS * (MAX_SHIFT + 2))
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    @staticmethod
+    def _index(micros):
+        if micros < SUB_BUCKETS:
+            return micros
+        shift = min(micros.bit_length() - 7, MAX_SHIFT)
+        return SUB_BUCKETS * (shift + 1) + min((micros >> shift) - SUB_BUCKETS, SUB_BUCKETS - 1)
+
+    @staticmethod
+    def _value(index):
+        """Upper edge of a bucket, in microseconds"""
+        if index < SUB_BUCKETS:
+            return index
+        shift = index // SUB_BUCKETS - 1
+        return ((index % SUB_BUCKETS + SUB_BUCKETS + 1) << shift) - 1
+
+    def record(self, seconds):
+        micros = max(0, int(seconds * 1e6))
+        self.counts[self._index(micros)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def percentile(self, pct):
+        """Seconds at or below which pct% of recorded values fall"""
+        if not self.count:
+            return None
+        target = max(1, int(round(pct / 100 * self.count)))
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= target:
+                return min(self._value(index) / 1e6, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000 if self.count else None,
+            "min_ms": self.min * 1000 if self.min is not None else None,
+            "p50_ms": _ms(self.percentile(50)),
+            "p90_ms": _ms(self.percentile(90)),
+            "p99_ms": _ms(self.percentile(99)),
+            "max_ms": self.max * 1000 if self.max is not None else None,
+        }
+
+
+def _ms(seconds):
+    return seconds * 1000 if seconds is not None else None
+
+
+_ID_SEGMENT = re.compile(r"^(?!v\d+$).*\d")
+
+
+def endpoint_name(method, path):
+    """'DELETE /trade/v1/infoprices/subscriptions/ab12/prices-9f' -> '.../subscriptions/{id}/{id}'"""
+    segments = ["{id}" if _ID_SEGMENT.match(segment) else segment for segment in path.split("?")[0].split("/")]
+    return f"{method} {'/'.join(segments)}"
+
+
+class EndpointStats:
+    def __init__(self):
+        self.phases = {phase: LatencyHistogram() for phase in PHASES}
+        self.statuses = {}
+        self.errors = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def summary(self):
+        return {
+            "requests": self.phases["total"].count,
+            "errors": self.errors,
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            **{phase: histogram.summary() for phase, histogram in self.phases.items()},
+        }
+
+
+class Metrics:
+    """Thread-safe registry of EndpointStats"""
+
+    def __init__(self):
+        self.endpoints = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def record(self, method, path, total, status=None, dns=0.0, connect=0.0, ttfb=None, sent=0, received=0):
+        name = endpoint_name(method, path)
+        with self._lock:
+            stats = self.endpoints.setdefault(name, EndpointStats())
+            stats.phases["total"].record(total)
+            stats.phases["dns"].record(dns)
+            stats.phases["connect"].record(connect)
+            if ttfb is not None:
+                stats.phases["ttfb"].record(ttfb)
+            if status is None:
+                stats.errors += 1
+            else:
+                stats.statuses[status] = stats.statuses.get(status, 0) + 1
+                if status >= 400:
+                    stats.errors += 1
+            stats.bytes_sent += sent
+            stats.bytes_received += received
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "started": self.started,
+                "taken": time.time(),
+                "endpoints": {name: stats.summary() for name, stats in sorted(self.endpoints.items())},
+            }
+
+    def export(self, path):
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        return path
+
+    def reset(self):
+        with self._lock:
+            self.endpoints.clear()
+            self.started = time.time()
+
+
+# DNS and connect timings for the request running on this thread
+connection_timings = threading.local()
+
+
+def reset_connection_timings():
+    connection_timings.dns = 0.0
+    connection_timings.connect = 0.0
+
+
+class _TimedConnectionMixin:
+    """Splits new-connection time into DNS and connect (TCP, plus TLS for HTTPS)"""
+
+    def _new_conn(self):
+        dns_host = self._dns_host
+        start = time.perf_counter()
+        try:
+            infos = socket.getaddrinfo(dns_host.strip("[]"), self.port, allowed_gai_family(), socket.SOCK_STREAM)
+        except OSError:
+            infos = []  # urllib3 resolves again below and raises its usual error
+        connection_timings.dns = getattr(connection_timings, "dns", 0.0) + time.perf_counter() - start
+        addresses = list(dict.fromkeys(info[4][0] for info in infos)) or [dns_host]
+
+        # Try every A/AAAA record in order, as urllib3 would, so one dead address does not fail the request
+        try:
+            for i, address in enumerate(addresses):
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except NewConnectionError:
+                    if i == len(addresses) - 1:
+                        raise
+        finally:
+            self._dns_host = dns_host
+
+    def connect(self):
+        dns_before = getattr(connection_timings, "dns", 0.0)
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            dns = getattr(connection_timings, "dns", 0.0) - dns_before
+            connection_timings.connect = (getattr(connection_timings, "connect", 0.0)
+                                          + time.perf_counter() - start - dns)
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+TIMED_POOL_CLASSES = {"http": TimedHTTPConnectionPool, "https": TimedHTTPSConnectionPool}
+
+
+def aiohttp_trace_config():
+    """aiohttp TraceConfig filling the dict passed as trace_request_ctx with phase timings"""
+    import aiohttp
+
+    def mark(name):
+        async def handler(session, ctx, params):
+            ctx.trace_request_ctx[name] = time.perf_counter()
+        return handler
+
+    config = aiohttp.TraceConfig()
+    config.on_request_start.append(mark("request_start"))
+    config.on_dns_resolvehost_start.append(mark("dns_start"))
+    config.on_dns_resolvehost_end.append(mark("dns_end"))
+    config.on_connection_create_start.append(mark("connect_start"))
+    config.on_connection_create_end.append(mark("connect_end"))
+    config.on_request_end.append(mark("headers"))
+    return config
+
+
+def aiohttp_phases(marks):
+    """(dns, connect, ttfb) in seconds from the marks set by aiohttp_trace_config"""
+    dns = marks["dns_end"] - marks["dns_start"] if "dns_end" in marks else 0.0
+    connect = marks["connect_end"] - marks["connect_start"] - dns if "connect_end" in marks else 0.0
+    ttfb = marks["headers"] - marks["request_start"] - dns - connect if "headers" in marks else None
+    return dns, max(connect, 0.0), ttfb
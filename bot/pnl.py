@@ -0,0 +1,244 @@
+"""Mark-to-market PnL for the whole book, revalued from streamed quotes.
+
+Net positions live in NumPy columns (one row per Uic: amount, average open
+price, quote currency, latest bid/ask, realized PnL). A quote update writes
+one row; reading the PnL revalues every row in one vectorized pass, so the
+portfolio total is current on every tick without asking the positions API.
+
+PnL is computed in each instrument's quote currency and converted to the
+account currency with the latest quote of the matching FX pair (e.g. USD
+PnL on a EUR account uses EURUSD). Longs are marked at the bid and shorts
+at the ask, which is what closing them would get.
+"""
+import threading
+import time
+
+import numpy as np
+
+from .risk import currencies
+
+
+def fill_price(response, buy_sell, quote=None):
+    """Fill price from an order response, else the touch price it would have crossed"""
+    if isinstance(response, dict):
+        for key in ("ExecutionPrice", "FilledPrice", "Price"):
+            if response.get(key):
+                return float(response[key])
+    if quote:
+        price = quote.get("Ask" if buy_sell == "Buy" else "Bid") or quote.get("Mid")
+        return float(price) if price else None
+    return None
+
+
+class PnLEngine:
+    """Net positions per Uic as arrays; unrealized PnL in one pass over the book"""
+
+    def __init__(self, instruments=None, account_currency="EUR", capacity=64, pending_ttl=10.0):
+        self.instruments = instruments if instruments is not None else {}
+        self.account_currency = account_currency
+        self.pending_ttl = pending_ttl                # seconds a booked fill survives loads that do not show it
+        self._pending = {}                            # OrderId -> (Uic, signed, price, filled at) until a position shows it
+        self._rows = {}                               # Uic -> row
+        self.uics = np.zeros(capacity, dtype=np.int64)
+        self.amount = np.zeros(capacity)
+        self.open_price = np.zeros(capacity)
+        self.bid = np.full(capacity, np.nan)
+        self.ask = np.full(capacity, np.nan)
+        self.realized = np.zeros(capacity)            # in quote currency
+        self.ccy = np.zeros(capacity, dtype=np.int64)  # index into self.rates
+        self._currencies = {account_currency: 0}
+        self.rates = np.ones(1)                       # quote currency -> account currency
+        self._converters = {}                         # Uic -> (currency index, invert)
+        self._touch = {}                              # Uic -> latest (bid, ask), for rows added later
+        self._lock = threading.Lock()
+
+    @property
+    def size(self):
+        return len(self._rows)
+
+    def _currency_index(self, currency):
+        index = self._currencies.get(currency)
+        if index is None:
+            index = self._currencies[currency] = len(self._currencies)
+            self.rates = np.append(self.rates, np.nan)
+            self._register_converter(currency, index)
+        return index
+
+    def _register_converter(self, currency, index):
+        """Find the pair that converts currency into the account currency"""
+        lookup = getattr(self.instruments, "uic", None)
+        if lookup is None:
+            return
+        account = self.account_currency
+        for symbol, invert in ((account + currency, True), (currency + account, False)):
+            uic = lookup(symbol)
+            if uic is not None:
+                self._converters[uic] = (index, invert)
+                touch = self._touch.get(uic)
+                if touch is not None:
+                    mid = sum(touch) / 2
+                    self.rates[index] = 1 / mid if invert else mid
+                return
+
+    def set_instruments(self, instruments):
+        """Re-resolve currencies and conversion pairs, e.g. after the instrument cache refreshed"""
+        with self._lock:
+            self.instruments = instruments
+            for currency, index in self._currencies.items():
+                if index and not any(i == index for i, _ in self._converters.values()):
+                    self._register_converter(currency, index)
+            for uic, row in self._rows.items():
+                pair = currencies(instruments.get(uic, ""))
+                if pair is not None:
+                    self.ccy[row] = self._currency_index(pair[1])
+
+    def quote_uics(self):
+        """Uics whose quotes the book needs: open positions plus currency conversion pairs"""
+        with self._lock:
+            held = [int(self.uics[row]) for row in self._rows.values() if self.amount[row]]
+            return sorted(set(held) | set(self._converters))
+
+    def _row(self, uic):
+        row = self._rows.get(uic)
+        if row is not None:
+            return row
+        row = len(self._rows)
+        if row == len(self.uics):
+            grow = len(self.uics)
+            self.uics = np.concatenate([self.uics, np.zeros(grow, dtype=np.int64)])
+            self.amount = np.concatenate([self.amount, np.zeros(grow)])
+            self.open_price = np.concatenate([self.open_price, np.zeros(grow)])
+            self.bid = np.concatenate([self.bid, np.full(grow, np.nan)])
+            self.ask = np.concatenate([self.ask, np.full(grow, np.nan)])
+            self.realized = np.concatenate([self.realized, np.zeros(grow)])
+            self.ccy = np.concatenate([self.ccy, np.zeros(grow, dtype=np.int64)])
+        pair = currencies(self.instruments.get(uic, ""))
+        self.uics[row] = uic
+        self.bid[row], self.ask[row] = self._touch.get(uic, (np.nan, np.nan))
+        self.ccy[row] = self._currency_index(pair[1] if pair else self.account_currency)
+        self._rows[uic] = row
+        return row
+
+    def on_quote(self, uic, quote):
+        """QuoteBook listener: O(1) write of the new touch prices"""
+        mid = quote.get("Mid")
+        bid, ask = quote.get("Bid") or mid, quote.get("Ask") or mid
+        if not (bid and ask):
+            return
+        with self._lock:
+            self._touch[uic] = (bid, ask)
+            row = self._rows.get(uic)
+            if row is not None:
+                self.bid[row] = bid
+                self.ask[row] = ask
+            converter = self._converters.get(uic)
+            if converter is not None:
+                index, invert = converter
+                mid = mid or (bid + ask) / 2
+                self.rates[index] = 1 / mid if invert else mid
+
+    def load(self, positions):
+        """Replace open amounts and prices from a /port/v1/positions payload; realized PnL is kept.
+
+        A fill booked by apply_order is re-applied on top of the payload until a
+        position with its SourceOrderId shows up, or for pending_ttl seconds if
+        the gateway has not booked it yet. Its realized PnL is not counted twice.
+        """
+        net = {}
+        booked = set()
+        for position in positions.get("Data", []):
+            base = position.get("PositionBase", {})
+            if "Uic" not in base:
+                continue
+            uic = int(base["Uic"])
+            amount, cost = net.get(uic, (0.0, 0.0))
+            net[uic] = (amount + base.get("Amount", 0), cost + base.get("Amount", 0) * base.get("OpenPrice", 0))
+            booked.add(base.get("SourceOrderId"))
+        now = time.monotonic()
+        with self._lock:
+            self.amount[:] = 0
+            self.open_price[:] = 0
+            for uic, (amount, cost) in net.items():
+                row = self._row(uic)
+                self.amount[row] = amount
+                self.open_price[row] = cost / amount if amount else 0.0
+            for order_id, (uic, signed, price, filled_at) in list(self._pending.items()):
+                if order_id in booked or now - filled_at > self.pending_ttl:
+                    del self._pending[order_id]
+                else:
+                    self._book(self._row(uic), signed, price)
+
+    def _book(self, row, signed, price):
+        """Move a row's amount and open price by a fill; returns the PnL it realizes (caller holds the lock)"""
+        amount, open_price = self.amount[row], self.open_price[row]
+        if amount == 0 or (amount > 0) == (signed > 0):
+            total = amount + signed
+            self.open_price[row] = (amount * open_price + signed * price) / total
+            self.amount[row] = total
+            return 0.0
+
+        closed = min(abs(signed), abs(amount)) * np.sign(amount)
+        remaining = amount + signed
+        self.amount[row] = remaining
+        if remaining == 0:
+            self.open_price[row] = 0.0
+        elif (remaining > 0) != (amount > 0):
+            self.open_price[row] = price  # flipped: the rest opened at this fill
+        return (price - open_price) * closed
+
+    def on_fill(self, uic, signed, price, order_id=None):
+        """Book a fill: extend the position at a blended price, or close part of it and realize PnL.
+
+        With an order_id the fill is kept pending until positions show it (see load).
+        """
+        with self._lock:
+            row = self._row(int(uic))
+            if order_id is not None:
+                self._pending[order_id] = (int(uic), signed, price, time.monotonic())
+            realized = self._book(row, signed, price)
+            self.realized[row] += realized
+            return realized
+
+    def apply_order(self, uic, amount, buy_sell, response, quote=None):
+        """Book an accepted order at its fill price; returns the realized PnL in quote currency, or None"""
+        if not isinstance(response, dict) or "OrderId" not in response or response.get("ErrorInfo"):
+            return None
+        price = fill_price(response, buy_sell, quote)
+        if price is None:
+            return None
+        return self.on_fill(uic, amount if buy_sell == "Buy" else -amount, price, order_id=response["OrderId"])
+
+    def unrealized(self):
+        """Per-row unrealized PnL in quote currency (NaN where the Uic has no quote yet)"""
+        with self._lock:
+            n = len(self._rows)
+            amount = self.amount[:n]
+            mark = np.where(amount > 0, self.bid[:n], self.ask[:n])
+            return np.where(amount != 0, (mark - self.open_price[:n]) * amount, 0.0)
+
+    def totals(self):
+        """{'unrealized', 'realized', 'total'} in the account currency; rows without quotes or rates count as zero"""
+        unrealized = self.unrealized()
+        with self._lock:
+            n = len(self._rows)
+            rates = self.rates[self.ccy[:n]]
+            realized = self.realized[:n]
+        total_unrealized = float(np.nansum(unrealized * rates))
+        total_realized = float(np.nansum(realized * rates))
+        return {"unrealized": total_unrealized, "realized": total_realized,
+                "total": total_unrealized + total_realized}
+
+    def by_uic(self):
+        """{uic: {'amount', 'open_price', 'unrealized', 'realized'}} in quote currency"""
+        unrealized = self.unrealized()
+        with self._lock:
+            return {int(self.uics[row]): {"amount": float(self.amount[row]),
+                                          "open_price": float(self.open_price[row]),
+                                          "unrealized": float(unrealized[row]),
+                                          "realized": float(self.realized[row])}
+                    for row in self._rows.values()}
+
+    def to_account(self, uic, value):
+        """Convert a quote-currency amount for uic into the account currency (NaN without a rate)"""
+        row = self._rows.get(uic)
+        return value * self.rates[self.ccy[row]] if row is not None else float("nan")
@@ -0,0 +1,166 @@
+import threading
+import time
+
+from .account import get_positions
+
+
+def _merge(target, update):
+    """Recursively merge a position delta into the stored position"""
+    for key, value in update.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = value
+
+
+class PositionBook:
+    """Open positions indexed by PositionId and Uic, kept current without re-downloading"""
+
+    def __init__(self, pending_ttl=10.0):
+        self._by_id = {}      # PositionId -> position
+        self._by_uic = {}     # Uic -> {PositionId: position}
+        self._net = {}        # Uic -> net amount across positions and pending orders
+        self._pending = {}    # OrderId -> (Uic, signed amount, placed at) not yet seen in a position
+        self.pending_ttl = pending_ttl  # seconds a pending order survives full loads that do not show it
+        self._lock = threading.RLock()
+        self._listeners = []
+        self._poller = None
+        self._stop_polling = threading.Event()
+        self.loaded_at = None
+
+    def _add(self, position):
+        base = position["PositionBase"]
+        uic = int(base["Uic"])
+        self._by_id[position["PositionId"]] = position
+        self._by_uic.setdefault(uic, {})[position["PositionId"]] = position
+        self._net[uic] = self._net.get(uic, 0) + int(base.get("Amount", 0))
+
+    def _remove(self, position_id):
+        position = self._by_id.pop(position_id, None)
+        if position is None:
+            return None
+        base = position["PositionBase"]
+        uic = int(base["Uic"])
+        siblings = self._by_uic.get(uic, {})
+        siblings.pop(position_id, None)
+        if not siblings:
+            self._by_uic.pop(uic, None)
+        self._net[uic] = self._net.get(uic, 0) - int(base.get("Amount", 0))
+        return position
+
+    def add_listener(self, callback):
+        """callback(positions) runs with the payload after every full load, outside the lock"""
+        self._listeners.append(callback)
+
+    def load(self, positions):
+        """Replace the book with a full /port/v1/positions payload.
+
+        A pending order stays counted until a position with its SourceOrderId
+        shows up, or for pending_ttl seconds if the gateway has not booked it yet.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._by_id.clear()
+            self._by_uic.clear()
+            self._net.clear()
+            booked = set()
+            for position in positions.get("Data", []):
+                if "PositionId" in position and "Uic" in position.get("PositionBase", {}):
+                    self._add(position)
+                    booked.add(position["PositionBase"].get("SourceOrderId"))
+            for order_id, (uic, signed, placed_at) in list(self._pending.items()):
+                if order_id in booked or now - placed_at > self.pending_ttl:
+                    del self._pending[order_id]
+                else:
+                    self._net[uic] = self._net.get(uic, 0) + signed
+            self.loaded_at = now
+        for callback in self._listeners:
+            callback(positions)
+
+    def refresh(self, client, client_key):
+        self.load(get_positions(client, client_key))
+
+    def apply_delta(self, items):
+        """Apply streamed or polled position deltas; ``__meta_deleted`` removes a position"""
+        with self._lock:
+            for item in items:
+                position_id = item.get("PositionId")
+                if position_id is None:
+                    continue
+                if item.get("__meta_deleted"):
+                    self._remove(position_id)
+                    continue
+
+                position = self._remove(position_id) or {}
+                _merge(position, item)
+                if "Uic" not in position.get("PositionBase", {}):
+                    continue  # partial delta for a position we never loaded; next refresh picks it up
+                self._add(position)
+
+                order_id = position.get("PositionBase", {}).get("SourceOrderId")
+                pending = self._pending.pop(order_id, None)
+                if pending is not None:
+                    self._net[pending[0]] -= pending[1]
+
+    def apply_order(self, uic, amount, buy_sell, response):
+        """Count an accepted order toward the Uic's net size until a position update confirms it"""
+        if not isinstance(response, dict) or "OrderId" not in response or response.get("ErrorInfo"):
+            return False
+        uic = int(uic)
+        signed = amount if buy_sell == "Buy" else -amount
+        with self._lock:
+            self._pending[response["OrderId"]] = (uic, signed, time.monotonic())
+            self._net[uic] = self._net.get(uic, 0) + signed
+        return True
+
+    def position(self, uic):
+        """First open position for uic, or None"""
+        with self._lock:
+            positions = self._by_uic.get(int(uic))
+            return next(iter(positions.values())) if positions else None
+
+    def has_pending(self, uic):
+        """True while an order on uic is counted but not yet seen in a position"""
+        with self._lock:
+            return any(pending[0] == int(uic) for pending in self._pending.values())
+
+    def get(self, position_id):
+        return self._by_id.get(position_id)
+
+    def size(self, uic, symbols=None):
+        """Net size for uic as (amount, symbol), or (0, None) with no position.
+
+        The symbol comes from the position row, else from symbols (a Uic -> symbol
+        mapping such as InstrumentCache) while only pending orders make up the size.
+        """
+        with self._lock:
+            amount = self._net.get(int(uic), 0)
+            if amount == 0:
+                return 0, None
+            position = self.position(uic)
+            symbol = position.get("DisplayAndFormat", {}).get("Symbol") if position else None
+            if symbol is None and symbols is not None:
+                symbol = symbols.get(int(uic))
+            return amount, symbol
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def start_polling(self, client, client_key, interval=30):
+        """Reload the book every interval seconds on a background thread"""
+        def poll():
+            while not self._stop_polling.wait(interval):
+                try:
+                    self.refresh(client, client_key)
+                except (OSError, ValueError):
+                    pass  # keep the last good book; next poll retries
+
+        self._stop_polling.clear()
+        self._poller = threading.Thread(target=poll, name="position-poller", daemon=True)
+        self._poller.start()
+
+    def stop_polling(self):
+        self._stop_polling.set()
+        if self._poller is not None:
+            self._poller.join(1)
+            self._poller = None
@@ -0,0 +1,30 @@
+"""cProfile a bot session from the command line.
+
+    python main.py --profile session.prof               # interactive menu
+    python main.py --profile quote.prof quote EURUSD    # one headless command
+
+Writes pstats data to the path (open with `python -m pstats`, snakeviz
+or similar) and the top functions by cumulative time to path.txt.
+cProfile follows the main thread: the menu, ticker and dashboard rendering,
+headless commands and the order path. Background threads (price stream,
+position polling) are not included.
+"""
+import cProfile
+import contextlib
+import pstats
+import sys
+
+
+@contextlib.contextmanager
+def profiled(path, top=30):
+    """Profile the block; the stats are written even if it ends with Ctrl+C or an error"""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        with open(f"{path}.txt", "w") as f:
+            pstats.Stats(profiler, stream=f).sort_stats("cumulative").print_stats(top)
+        print(f"Profile written to {path} (top {top} by cumulative time in {path}.txt)", file=sys.stderr)
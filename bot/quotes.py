@@ -0,0 +1,62 @@
+import threading
+import time
+
+
+class QuoteBook:
+    """Thread-safe latest quote per Uic, merged from snapshots and deltas"""
+
+    def __init__(self):
+        self._quotes = {}
+        self._updated = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, callback):
+        """callback(uic, quote) runs after every quote that changed, outside the lock"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def apply(self, items):
+        """Merge a list of infoprice items (snapshot Data or a delta payload)"""
+        now = time.monotonic()
+        changed = []
+        with self._lock:
+            for item in items:
+                uic = item.get("Uic")
+                if uic is None or "Quote" not in item:
+                    continue
+                quote = self._quotes.setdefault(uic, {})
+                before = dict(quote) if self._listeners else None
+                quote.update(item["Quote"])
+                if "Mid" not in item["Quote"] and quote.get("Bid") and quote.get("Ask"):
+                    quote["Mid"] = (quote["Bid"] + quote["Ask"]) / 2
+                self._updated[uic] = now
+                if before is not None and quote != before:
+                    changed.append((uic, dict(quote)))
+
+        for uic, quote in changed:
+            for callback in self._listeners:
+                callback(uic, quote)
+
+    def get(self, uic):
+        with self._lock:
+            quote = self._quotes.get(uic)
+            return dict(quote) if quote is not None else None
+
+    def has(self, uics):
+        with self._lock:
+            return all(uic in self._quotes for uic in uics)
+
+    def age(self, uic):
+        """Seconds since the last update for uic, or None if never quoted"""
+        updated = self._updated.get(uic)
+        return time.monotonic() - updated if updated is not None else None
+
+    def snapshot(self, uics):
+        """Quotes for uics in the same shape as get_fx_prices: {uic: {'Uic', 'Quote'}}"""
+        with self._lock:
+            return {uic: {"Uic": uic, "Quote": dict(self._quotes[uic])}
+                    for uic in uics if uic in self._quotes}
@@ -0,0 +1,170 @@
+"""Append-only tick recorder on per-day, memory-mapped columns.
+
+Each UTC day is a directory holding one fixed-width binary file per column
+(ts, uic, bid, ask, mid), a sparse index with the timestamp of every
+INDEX_STRIDE-th row, and meta.json with the committed row count. Files grow
+in blocks, so memory stays bounded however long a session runs, and readers
+get zero-copy NumPy views of any time range.
+
+Ticks must be appended in timestamp order; range seeks rely on it.
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+COLUMNS = {
+    "ts": np.dtype("<i8"),    # epoch nanoseconds, UTC
+    "uic": np.dtype("<i4"),
+    "bid": np.dtype("<f8"),
+    "ask": np.dtype("<f8"),
+    "mid": np.dtype("<f8"),
+}
+BLOCK_ROWS = 1 << 16
+INDEX_STRIDE = 1024
+
+
+def day_of(ts_ns):
+    return datetime.fromtimestamp(ts_ns / 1e9, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def _read_meta(path):
+    try:
+        with open(os.path.join(path, "meta.json")) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"count": 0, "capacity": 0}
+
+
+class _DayWriter:
+    def __init__(self, path, block_rows=BLOCK_ROWS):
+        self.path = path
+        self.block_rows = block_rows
+        os.makedirs(path, exist_ok=True)
+
+        meta = _read_meta(path)
+        self.count = meta["count"]
+        self.capacity = 0
+        self.columns = {}
+        self._grow(max(meta["capacity"], block_rows))
+        self.index = [int(ts) for ts in self.columns["ts"][:self.count:INDEX_STRIDE]]
+
+    def _grow(self, capacity):
+        for name, dtype in COLUMNS.items():
+            filename = os.path.join(self.path, f"{name}.bin")
+            with open(filename, "ab") as f:
+                f.truncate(capacity * dtype.itemsize)
+            self.columns[name] = np.memmap(filename, dtype=dtype, mode="r+", shape=(capacity,))
+        self.capacity = capacity
+
+    def append(self, ts, uic, bid, ask, mid):
+        if self.count == self.capacity:
+            self.flush()
+            self._grow(self.capacity + self.block_rows)
+        i = self.count
+        columns = self.columns
+        columns["ts"][i] = ts
+        columns["uic"][i] = uic
+        columns["bid"][i] = bid
+        columns["ask"][i] = ask
+        columns["mid"][i] = mid
+        if i % INDEX_STRIDE == 0:
+            self.index.append(ts)
+        self.count = i + 1
+
+    def flush(self):
+        for column in self.columns.values():
+            column.flush()
+        np.asarray(self.index, dtype="<i8").tofile(os.path.join(self.path, "index.bin"))
+        tmp = os.path.join(self.path, "meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"count": self.count, "capacity": self.capacity, "index_stride": INDEX_STRIDE}, f)
+        os.replace(tmp, os.path.join(self.path, "meta.json"))
+
+    def close(self):
+        self.flush()
+        self.columns.clear()
+
+
+class TickRecorder:
+    """Appends (timestamp, uic, bid, ask, mid) ticks under directory/YYYY-MM-DD/"""
+
+    def __init__(self, directory, block_rows=BLOCK_ROWS, flush_interval=1.0):
+        self.directory = directory
+        self.block_rows = block_rows
+        self.flush_interval = flush_interval
+        self._day = None
+        self._writer = None
+        self._last_flush = time.monotonic()
+        self._last_ts = 0
+        self._lock = threading.Lock()
+
+    def append(self, uic, bid, ask, mid=None, ts=None):
+        if mid is None:
+            mid = (bid + ask) / 2
+        with self._lock:
+            if ts is None:
+                # Stamped under the lock, and never behind the last row even if the clock steps back:
+                # the stream and poll threads both append, and _seek needs rows in time order
+                ts = max(time.time_ns(), self._last_ts)
+            self._last_ts = max(self._last_ts, ts)
+            day = day_of(ts)
+            if day != self._day:
+                if self._writer is not None:
+                    self._writer.close()
+                self._writer = _DayWriter(os.path.join(self.directory, day), self.block_rows)
+                self._day = day
+            self._writer.append(ts, uic, bid, ask, mid)
+
+            now = time.monotonic()
+            if now - self._last_flush >= self.flush_interval:
+                self._writer.flush()
+                self._last_flush = now
+
+    def on_quote(self, uic, quote):
+        """QuoteBook listener: record every quote change"""
+        bid, ask = quote.get("Bid"), quote.get("Ask")
+        if bid is not None and ask is not None:
+            self.append(uic, bid, ask, quote.get("Mid"))
+
+    def close(self):
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+                self._day = None
+
+
+def _seek(ts, index, value, count):
+    """First row with ts >= value, narrowed to one index block before searching"""
+    k = int(np.searchsorted(index, value, side="left"))
+    lo = max(k - 1, 0) * INDEX_STRIDE
+    hi = min(k * INDEX_STRIDE, count) if k < len(index) else count
+    return lo + int(np.searchsorted(ts[lo:hi], value, side="left"))
+
+
+def load_ticks(directory, day, start=None, end=None):
+    """Zero-copy column views for ticks of a day with start <= ts < end (epoch ns)"""
+    path = os.path.join(directory, day)
+    meta = _read_meta(path)
+    count, capacity = meta["count"], meta["capacity"]
+    if count == 0:
+        return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+
+    columns = {name: np.memmap(os.path.join(path, f"{name}.bin"), dtype=dtype, mode="r", shape=(capacity,))[:count]
+               for name, dtype in COLUMNS.items()}
+    index = np.fromfile(os.path.join(path, "index.bin"), dtype="<i8")
+
+    ts = columns["ts"]
+    lo = _seek(ts, index, start, count) if start is not None else 0
+    hi = _seek(ts, index, end, count) if end is not None else count
+    return {name: column[lo:hi] for name, column in columns.items()}
+
+
+def select_uic(ticks, uic):
+    """Ticks for a single instrument (a copy, unlike load_ticks)"""
+    mask = ticks["uic"] == uic
+    return {name: column[mask] for name, column in ticks.items()}
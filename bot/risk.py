@@ -0,0 +1,194 @@
+"""Pre-trade risk checks on the order path.
+
+Net exposure per Uic and per currency is kept precomputed and updated
+incrementally: an order reserves its exposure when it passes the check,
+rejected orders release it, and full position loads rebuild it. A load
+keeps the reservations of orders still in flight, and of accepted orders
+until a position with their SourceOrderId shows up (or pending_ttl
+passes), the way bot.positions.PositionBook keeps pending orders. A check is
+a handful of dict lookups under one lock, with no network call, so it can
+sit synchronously in front of every order.
+
+Amounts are in the instrument's base currency (Saxo FX amounts). A
+currency's exposure is in that currency's own units; the quote-currency
+leg is valued at the order price or the latest mid.
+"""
+import threading
+import time
+
+
+class RiskError(ValueError):
+    """Order rejected before it was sent; ``reason`` is a short machine-readable code"""
+
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+
+
+def currencies(symbol):
+    """'EUR/USD' or 'EURUSD' -> ('EUR', 'USD'); None if the symbol is not a currency pair"""
+    pair = str(symbol or "").replace("/", "").upper()
+    if len(pair) != 6 or not pair.isalpha():
+        return None
+    return pair[:3], pair[3:]
+
+
+class RiskEngine:
+    """Order-size, exposure and fat-finger limits checked in O(1) per order"""
+
+    def __init__(self, max_order_size=5_000_000, max_uic_exposure=10_000_000, max_currency_exposure=20_000_000,
+                 currency_limits=None, price_band=0.02, max_quote_age=None, instruments=None, pending_ttl=10.0):
+        self.max_order_size = max_order_size
+        self.max_uic_exposure = max_uic_exposure
+        self.max_currency_exposure = max_currency_exposure
+        self.currency_limits = dict(currency_limits or {})  # per-currency overrides, e.g. {"JPY": 3e9}
+        self.price_band = price_band          # max |price / mid - 1| for limit orders
+        self.max_quote_age = max_quote_age    # seconds; older quotes block orders when set
+        self.pending_ttl = pending_ttl        # seconds an accepted order counts before positions must show it
+        self._pairs = {}      # Uic -> (base, quote) currency
+        self._min_amount = {} # Uic -> MinimumTradeSize
+        self._tick = {}       # Uic -> TickSize for limit prices
+        self._mid = {}        # Uic -> latest mid
+        self._quoted_at = {}  # Uic -> monotonic time of that mid
+        self._net = {}        # Uic -> net amount incl. reservations
+        self._ccy = {}        # currency -> net exposure in that currency
+        self._unsettled = []  # reservations whose order has not been answered yet
+        self._pending = {}    # OrderId -> (reservation, accepted_at) until a position books it
+        self._lock = threading.Lock()
+        self.rejected = 0
+        for uic, symbol in (instruments or {}).items():
+            self.set_instrument(uic, symbol)
+
+    def set_instrument(self, uic, symbol, minimum=None, tick_size=None):
+        uic = int(uic)
+        pair = currencies(symbol)
+        if pair is not None:
+            self._pairs[uic] = pair
+        if minimum:
+            self._min_amount[uic] = minimum
+        if tick_size:
+            self._tick[uic] = tick_size
+
+    def set_instruments(self, instruments):
+        """Take pairs, minimum amounts and tick sizes from a bot.instruments.InstrumentCache"""
+        for uic in instruments:
+            record = instruments.details(uic)
+            self.set_instrument(uic, record["Symbol"], record.get("MinimumTradeSize"), record.get("TickSize"))
+
+    def on_quote(self, uic, quote):
+        """QuoteBook listener: keep the reference mid for notional and price-band checks"""
+        mid = quote.get("Mid")
+        if mid:
+            self._mid[uic] = mid
+            self._quoted_at[uic] = time.monotonic()
+
+    def load(self, positions):
+        """Rebuild exposure from a full /port/v1/positions payload, plus reservations not booked in it yet"""
+        net, ccy = {}, {}
+        booked = set()
+        for position in positions.get("Data", []):
+            base = position.get("PositionBase", {})
+            if "Uic" not in base:
+                continue
+            booked.add(base.get("SourceOrderId"))
+            uic = int(base["Uic"])
+            amount = base.get("Amount", 0)
+            net[uic] = net.get(uic, 0) + amount
+            pair = self._pairs.get(uic)
+            if pair is not None:
+                price = base.get("OpenPrice") or self._mid.get(uic, 0)
+                ccy[pair[0]] = ccy.get(pair[0], 0) + amount
+                ccy[pair[1]] = ccy.get(pair[1], 0) - amount * price
+        now = time.monotonic()
+        with self._lock:
+            self._net = net
+            self._ccy = ccy
+            self._pending = {order_id: (reservation, accepted_at)
+                             for order_id, (reservation, accepted_at) in self._pending.items()
+                             if order_id not in booked and now - accepted_at < self.pending_ttl}
+            for uic, signed, price in self._unsettled + [entry[0] for entry in self._pending.values()]:
+                self._apply(uic, signed, price, self._pairs.get(uic))
+
+    def exposure(self, uic):
+        return self._net.get(int(uic), 0)
+
+    def currency_exposure(self, currency):
+        return self._ccy.get(currency, 0)
+
+    def _reject(self, reason, message):
+        self.rejected += 1
+        raise RiskError(reason, message)
+
+    def check(self, uic, amount, buy_sell, price=None):
+        """Check an order and reserve its exposure. Returns a reservation for release(); raises RiskError"""
+        uic = int(uic)
+        if buy_sell not in ("Buy", "Sell"):
+            self._reject("side", f"BuySell must be Buy or Sell, got {buy_sell!r}")
+        if amount <= 0 or amount > self.max_order_size:
+            self._reject("order_size", f"order size {amount:,} outside 1..{self.max_order_size:,}")
+        if amount < self._min_amount.get(uic, 0):
+            self._reject("min_amount", f"order size {amount:,} below minimum {self._min_amount[uic]:,} for UIC {uic}")
+        tick = self._tick.get(uic)
+        if price is not None and tick and abs(price / tick - round(price / tick)) > 1e-6:
+            self._reject("tick_size", f"price {price} is not a multiple of tick size {tick} for UIC {uic}")
+
+        mid = self._mid.get(uic)
+        if self.max_quote_age is not None:
+            quoted_at = self._quoted_at.get(uic)
+            if quoted_at is None or time.monotonic() - quoted_at > self.max_quote_age:
+                self._reject("stale_quote", f"no quote for UIC {uic} within {self.max_quote_age}s")
+        if price is not None and mid and abs(price / mid - 1) > self.price_band:
+            self._reject("price_band", f"price {price} is more than {self.price_band:.1%} from mid {mid}")
+
+        signed = amount if buy_sell == "Buy" else -amount
+        reference = price or mid or 0
+        pair = self._pairs.get(uic)
+        with self._lock:
+            net = self._net.get(uic, 0) + signed
+            if abs(net) > self.max_uic_exposure:
+                self._reject("uic_exposure",
+                             f"UIC {uic} net {net:,} would exceed {self.max_uic_exposure:,}")
+            if pair is not None:
+                for currency, delta in ((pair[0], signed), (pair[1], -signed * reference)):
+                    after = self._ccy.get(currency, 0) + delta
+                    limit = self.currency_limits.get(currency, self.max_currency_exposure)
+                    if abs(after) > limit:
+                        self._reject("currency_exposure",
+                                     f"{currency} exposure {after:,.0f} would exceed {limit:,.0f}")
+            self._apply(uic, signed, reference, pair)
+            self._unsettled.append((uic, signed, reference))
+        return uic, signed, reference
+
+    def _apply(self, uic, signed, price, pair):
+        self._net[uic] = self._net.get(uic, 0) + signed
+        if pair is not None:
+            self._ccy[pair[0]] = self._ccy.get(pair[0], 0) + signed
+            self._ccy[pair[1]] = self._ccy.get(pair[1], 0) - signed * price
+
+    def release(self, reservation):
+        """Undo a reservation whose order was not accepted, or was cancelled before it filled"""
+        uic, signed, price = reservation
+        with self._lock:
+            self._apply(uic, -signed, price, self._pairs.get(uic))
+            if reservation in self._unsettled:
+                self._unsettled.remove(reservation)
+            else:
+                order_id = next((key for key, entry in self._pending.items() if entry[0] == reservation), None)
+                self._pending.pop(order_id, None)
+
+    def on_fill(self, uic, signed, price):
+        """Book a fill that did not go through check(), e.g. from another session"""
+        uic = int(uic)
+        with self._lock:
+            self._apply(uic, signed, price, self._pairs.get(uic))
+
+    def settle(self, reservation, response):
+        """Keep the reservation if the order was accepted, else release it; returns response"""
+        if not isinstance(response, dict) or "OrderId" not in response or response.get("ErrorInfo"):
+            self.release(reservation)
+            return response
+        with self._lock:
+            if reservation in self._unsettled:
+                self._unsettled.remove(reservation)
+            self._pending[response["OrderId"]] = (reservation, time.monotonic())
+        return response
@@ -0,0 +1,191 @@
+"""Central request scheduler for the OpenAPI clients.
+
+Every request takes a token from its endpoint group's bucket and from the
+shared session bucket before it is sent. Waiting requests are granted in
+strict priority order (orders, then portfolio, reference data, market
+data), so heavy polling can never hold an order back. Saxo's
+X-RateLimit-*-Remaining/-Reset headers and 429 responses pause the group
+until its window resets. Identical in-flight GETs share one response.
+"""
+import itertools
+import threading
+import time
+
+# group -> priority (lower runs first)
+PRIORITIES = {"orders": 0, "portfolio": 1, "reference": 2, "marketdata": 3, "other": 2}
+
+# Path prefix -> group, matched on the longest prefix
+GROUPS = {
+    "/trade/v2/orders": "orders",
+    "/port/": "portfolio",
+    "/ref/": "reference",
+    "/trade/v1/infoprices": "marketdata",
+}
+
+# (tokens per second, burst) per group; Saxo allows 120 requests/minute per service group
+GROUP_LIMITS = {
+    "orders": (2.0, 10),
+    "portfolio": (2.0, 20),
+    "reference": (2.0, 10),
+    "marketdata": (2.0, 20),
+    "other": (2.0, 10),
+}
+SESSION_LIMIT = (10.0, 30)
+
+
+def group_for(path):
+    matches = [prefix for prefix in GROUPS if path.startswith(prefix)]
+    return GROUPS[max(matches, key=len)] if matches else "other"
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def ready(self, now):
+        return now >= self.blocked_until and self.tokens >= 1
+
+    def wait_time(self, now):
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+
+class RequestScheduler:
+    def __init__(self, group_limits=None, session_limit=SESSION_LIMIT):
+        limits = dict(GROUP_LIMITS, **(group_limits or {}))
+        self.buckets = {group: TokenBucket(*limit) for group, limit in limits.items()}
+        self.session = TokenBucket(*session_limit)
+        self.throttled = 0   # 429 responses seen
+        self._waiting = []   # (priority, seq, group) tickets
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._inflight = {}  # coalescing key -> _Flight
+
+    @classmethod
+    def unlimited(cls):
+        """No client-side throttling; for local simulators and benchmarks"""
+        limit = (1e9, 1e9)
+        return cls(group_limits={group: limit for group in GROUP_LIMITS}, session_limit=limit)
+
+    def _grantable(self, ticket, now):
+        """Ticket may go if its group is ready and no higher-priority waiter is"""
+        priority, _, group = ticket
+        if not (self.buckets[group].ready(now) and self.session.ready(now)):
+            return False
+        return not any(other < ticket and self.buckets[other[2]].ready(now) for other in self._waiting)
+
+    def _take(self, group):
+        self.buckets[group].tokens -= 1
+        self.session.tokens -= 1
+
+    def acquire(self, group, timeout=None):
+        """Block until a request for group may be sent; returns seconds waited"""
+        start = time.monotonic()
+        ticket = (PRIORITIES.get(group, PRIORITIES["other"]), next(self._seq), group)
+        with self._cond:
+            self._waiting.append(ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self.buckets[group].refill(now)
+                    self.session.refill(now)
+                    if self._grantable(ticket, now):
+                        self._take(group)
+                        return now - start
+                    if timeout is not None and now - start >= timeout:
+                        raise TimeoutError(f"rate limit: no {group} request slot within {timeout}s")
+                    wait = max(self.buckets[group].wait_time(now), self.session.wait_time(now), 0.001)
+                    self._cond.wait(min(wait, 0.05))
+            finally:
+                self._waiting.remove(ticket)
+                self._cond.notify_all()
+
+    def try_acquire(self, group):
+        """Non-blocking acquire for callers that cannot sleep (e.g. the event loop)"""
+        with self._cond:
+            now = time.monotonic()
+            self.buckets[group].refill(now)
+            self.session.refill(now)
+            ticket = (PRIORITIES.get(group, PRIORITIES["other"]), next(self._seq), group)
+            if self._grantable(ticket, now):
+                self._take(group)
+                return True
+            return False
+
+    def observe(self, group, status, headers):
+        """Feed back rate-limit headers and 429s from a response to the group's bucket"""
+        now = time.monotonic()
+        reset = None
+        remaining = None
+        for name, value in headers.items():
+            lower = name.lower()
+            if not lower.startswith("x-ratelimit-"):
+                continue
+            try:
+                number = float(value)
+            except (TypeError, ValueError):
+                continue
+            if lower.endswith("-remaining"):
+                remaining = number if remaining is None else min(remaining, number)
+            elif lower.endswith("-reset"):
+                reset = number if reset is None else max(reset, number)
+
+        if status == 429:
+            self.throttled += 1
+            try:
+                retry_after = float(headers.get("Retry-After", reset or 1))
+            except (TypeError, ValueError):
+                retry_after = reset or 1
+            reset, remaining = max(retry_after, reset or 0), 0
+
+        if remaining is None:
+            return
+        with self._cond:
+            bucket = self.buckets[group]
+            bucket.tokens = min(bucket.tokens, remaining)
+            if remaining < 1:
+                bucket.blocked_until = max(bucket.blocked_until, now + (reset if reset is not None else 1))
+            self._cond.notify_all()
+
+    def coalesce(self, key, fn):
+        """Run fn once for concurrent callers with the same key; all get its result"""
+        with self._cond:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+        if not leader:
+            return flight.wait()
+
+        try:
+            flight.result = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._cond:
+                del self._inflight[key]
+            flight.done.set()
+        return flight.result
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
@@ -0,0 +1,238 @@
+"""Quote book published over shared memory, so one feed serves many bots.
+
+A feed daemon owns the gateway connection (stream, or polling fallback) and
+writes every quote into a named shared-memory segment. Bot processes on the
+same host attach read-only and read quotes without any network call:
+
+    SAXO_TOKEN=... python -m bot.sharedquotes --uics 16,21,31
+    SAXO_QUOTE_FEED=fxbot-quotes python main.py
+
+Layout: a 64-byte header (magic, version, capacity, slot count, heartbeat)
+followed by one 64-byte slot per Uic: seq, uic, bid, ask, mid, ts. Each slot
+is a seqlock. The writer makes seq odd, writes the fields, then makes it
+even again. A reader copies the slot and accepts it only if seq was even and
+unchanged across the copy. The single writer never blocks, and readers
+never see a torn quote.
+
+A slot's ts only moves when its quote changes, so a quiet pair says nothing
+about whether the feed is alive. The writer stamps the header heartbeat on
+every publish and on each daemon loop; readers judge freshness from that.
+"""
+import argparse
+import os
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+DEFAULT_NAME = "fxbot-quotes"
+MAGIC = b"FXQUOTES"
+VERSION = 2
+CAPACITY = 1024
+
+HEADER = struct.Struct("<8sIIQ")    # magic, version, capacity, count
+HEADER_SIZE = 64
+SLOT = struct.Struct("<Qqdddd")     # seq, uic, bid, ask, mid, ts
+SEQ = struct.Struct("<Q")
+SLOT_SIZE = 64
+COUNT_OFFSET = 16
+HEARTBEAT = struct.Struct("<d")     # time.time() of the writer's last sign of life
+HEARTBEAT_OFFSET = 24
+
+
+# Segments created by a writer in this process; they share our resource tracker registration
+_owned = set()
+
+
+def _slot_offset(index):
+    return HEADER_SIZE + index * SLOT_SIZE
+
+
+class SharedQuoteWriter:
+    """Single writer that owns the segment; use publish() as a QuoteBook listener.
+
+    An existing segment of the same name is an error: it may belong to a
+    live feed. replace_stale=True unlinks it first, for a feed that died
+    without cleaning up.
+    """
+
+    def __init__(self, name=DEFAULT_NAME, capacity=CAPACITY, replace_stale=False):
+        self.capacity = capacity
+        size = HEADER_SIZE + capacity * SLOT_SIZE
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            if not replace_stale:
+                raise FileExistsError(f"shared memory {name!r} already exists; another feed may be publishing to it. "
+                                      "Stop that feed, or take over a dead one's segment with --takeover") from None
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self.name = self.shm.name
+        _owned.add(self.shm._name)
+        self._buf = self.shm.buf
+        self._slots = {}    # Uic -> slot index
+        self._seq = {}      # slot index -> current seq
+        HEADER.pack_into(self._buf, 0, MAGIC, VERSION, capacity, 0)
+        self.heartbeat()
+
+    def _slot(self, uic):
+        index = self._slots.get(uic)
+        if index is None:
+            index = len(self._slots)
+            if index >= self.capacity:
+                raise ValueError(f"shared quote book is full ({self.capacity} instruments)")
+            SLOT.pack_into(self._buf, _slot_offset(index), 0, uic, 0.0, 0.0, 0.0, 0.0)
+            self._slots[uic] = index
+            self._seq[index] = 0
+            # Publish the slot count only after the slot's Uic is in place
+            SEQ.pack_into(self._buf, COUNT_OFFSET, index + 1)
+        return index
+
+    def publish(self, uic, quote):
+        mid = quote.get("Mid")
+        bid = quote.get("Bid") or mid
+        ask = quote.get("Ask") or mid
+        if not (bid and ask):
+            return
+        index = self._slot(uic)
+        offset = _slot_offset(index)
+        seq = self._seq[index]
+        SEQ.pack_into(self._buf, offset, seq + 1)                         # odd: write in progress
+        now = time.time()
+        SLOT.pack_into(self._buf, offset, seq + 1, uic, bid, ask, mid or (bid + ask) / 2, now)
+        SEQ.pack_into(self._buf, offset, seq + 2)                         # even: consistent
+        self._seq[index] = seq + 2
+        HEARTBEAT.pack_into(self._buf, HEARTBEAT_OFFSET, now)
+
+    def heartbeat(self):
+        """Mark the feed alive; unchanged quotes stay fresh for readers as long as this keeps moving"""
+        HEARTBEAT.pack_into(self._buf, HEARTBEAT_OFFSET, time.time())
+
+    def close(self):
+        self._buf = None
+        self.shm.close()
+        self.shm.unlink()
+        _owned.discard(self.shm._name)
+
+
+class SharedQuoteReader:
+    """Read-only view of a feed's segment with the QuoteBook read API"""
+
+    def __init__(self, name=DEFAULT_NAME, retries=100):
+        self.shm = shared_memory.SharedMemory(name=name)
+        # Attaching registers the segment with this process's resource tracker, which would
+        # unlink it when we exit; only the writer may do that
+        if self.shm._name not in _owned:
+            resource_tracker.unregister(self.shm._name, "shared_memory")
+        self.name = name
+        self.retries = retries
+        self._buf = self.shm.buf.toreadonly()
+        self._words = None
+        magic, version, capacity, _ = HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"shared memory {name!r} is not a version {VERSION} quote book")
+        # The seq re-check in read() indexes this 8-byte view instead of unpacking a struct
+        self._words = self._buf.cast("Q")
+        self.capacity = capacity
+        self._slots = {}     # Uic -> slot byte offset
+        self._known = 0
+
+    def _offset(self, uic):
+        offset = self._slots.get(uic)
+        if offset is None:
+            count = SEQ.unpack_from(self._buf, COUNT_OFFSET)[0]
+            for i in range(self._known, count):
+                self._slots[SLOT.unpack_from(self._buf, _slot_offset(i))[1]] = _slot_offset(i)
+            self._known = count
+            offset = self._slots.get(uic)
+        return offset
+
+    def read(self, uic):
+        """(bid, ask, mid, ts) for uic, or None if the feed has not quoted it"""
+        offset = self._slots.get(uic) or self._offset(uic)
+        if offset is None:
+            return None
+        buf, words, word = self._buf, self._words, offset >> 3
+        for _ in range(self.retries):
+            seq, _, bid, ask, mid, ts = SLOT.unpack_from(buf, offset)
+            if not seq & 1 and words[word] == seq:
+                return (bid, ask, mid, ts) if seq else None
+        raise RuntimeError(f"quote for UIC {uic} kept changing during {self.retries} reads")
+
+    def get(self, uic):
+        quote = self.read(uic)
+        return {"Bid": quote[0], "Ask": quote[1], "Mid": quote[2]} if quote else None
+
+    def has(self, uics):
+        return all(self.read(uic) is not None for uic in uics)
+
+    def age(self, uic):
+        quote = self.read(uic)
+        return time.time() - quote[3] if quote else None
+
+    def feed_age(self):
+        """Seconds since the writer last published or heartbeat"""
+        return time.time() - HEARTBEAT.unpack_from(self._buf, HEARTBEAT_OFFSET)[0]
+
+    def snapshot(self, uics, max_age=None):
+        """Quotes in the get_fx_prices shape: {uic: {'Uic', 'Quote'}}; empty if the feed is silent past max_age"""
+        if max_age is not None and self.feed_age() > max_age:
+            return {}
+        quotes = {}
+        for uic in uics:
+            quote = self.get(uic)
+            if quote is not None:
+                quotes[uic] = {"Uic": uic, "Quote": quote}
+        return quotes
+
+    def uics(self):
+        self._offset(None)
+        return sorted(self._slots)
+
+    def close(self):
+        if self._words is not None:
+            self._words.release()
+        self._buf.release()
+        self.shm.close()
+
+
+def main():
+    from .core import SaxoTradingBot
+
+    parser = argparse.ArgumentParser(description="Publish streamed quotes to shared memory for other bot processes")
+    parser.add_argument("--uics", default="16,21,31,22,17", help="comma-separated Uics to publish")
+    parser.add_argument("--name", default=os.environ.get("SAXO_QUOTE_FEED") or DEFAULT_NAME)
+    parser.add_argument("--poll-interval", type=float, default=1.0,
+                        help="seconds between REST polls while the stream is down")
+    parser.add_argument("--takeover", action="store_true",
+                        help="replace a segment left behind by a feed that died; never use while it runs")
+    args = parser.parse_args()
+    uics = [int(uic) for uic in args.uics.split(",") if uic.strip()]
+
+    token = os.environ.get("SAXO_TOKEN") or input("Paste your Saxo Bearer Token: ").strip()
+    bot = SaxoTradingBot(token, quote_feed="")  # the daemon is the feed; never attach to one
+    bot.setup()
+    try:
+        writer = SharedQuoteWriter(args.name, replace_stale=args.takeover)
+    except FileExistsError as e:
+        bot.client.close()
+        raise SystemExit(f"❌ {e}")
+    bot.quotes.add_listener(writer.publish)
+    bot.start_price_stream(uics)
+    print(f"Publishing {len(uics)} instruments to shared memory {writer.name!r} (Ctrl+C to stop)")
+    try:
+        while True:
+            bot.get_prices(uics)  # reads the streamed book; polls REST only while the stream is down
+            writer.heartbeat()    # quiet pairs publish nothing; tell readers the feed is still alive
+            time.sleep(args.poll_interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        bot.stop_price_stream()
+        writer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+"""Local stand-in for the Saxo OpenAPI endpoints the bot uses.
+
+Serves users/clients/accounts, balances, positions, open orders, order activities, infoprices/list,
+ref/v1/instruments/details and trade/v2/orders from in-memory state, with configurable injected latency,
+jitter and error rate. With netting, a fill first closes opposite positions (oldest first) and only
+the rest opens a new one, as on an account with real-time netting. Point the bot at it with SAXO_BASE_URL:
+
+    python -m bot.simulator --port 8765 --latency 0.02 --jitter 0.005
+    SAXO_BASE_URL=http://127.0.0.1:8765 python main.py
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+CLIENT_KEY = "sim-client"
+ACCOUNT_KEY = "sim-account"
+ACCOUNT_ID = "SIM-1"
+
+INSTRUMENTS = {
+    16: ("EURDKK", 7.4601),
+    21: ("EURUSD", 1.0842),
+    31: ("USDJPY", 149.82),
+    22: ("GBPUSD", 1.2705),
+    17: ("EURGBP", 0.8534),
+}
+
+
+class SimulatedGateway:
+    """Market and account state behind the simulator's endpoints"""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, seed=None, netting=False):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.mids = {uic: mid for uic, (_, mid) in INSTRUMENTS.items()}
+        self.netting = netting
+        self.positions = {}
+        self.orders = {}
+        self.activities = []   # /cs/v1/audit/orderactivities rows, oldest first
+        self.requests = 0
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def delay(self):
+        return max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+
+    def should_fail(self):
+        return self.random.random() < self.error_rate
+
+    def _symbol(self, uic):
+        return INSTRUMENTS.get(uic, (f"SIM{uic}", 1.0))[0]
+
+    def _decimals(self, uic):
+        return 3 if self._symbol(uic).endswith("JPY") else 5
+
+    def quote(self, uic):
+        """Random-walk the mid and quote a spread around it"""
+        with self._lock:
+            mid = self.mids.setdefault(uic, 1.0 + (uic % 100) / 100)
+            mid *= 1 + self.random.gauss(0, 2e-5)
+            self.mids[uic] = mid
+        # Bid and ask sit on the TickSize instrument_details advertises, at least one tick apart
+        decimals = self._decimals(uic)
+        scale = 10 ** decimals
+        half_spread = mid * 5e-6
+        bid = math.floor((mid - half_spread) * scale) / scale
+        ask = max(math.ceil((mid + half_spread) * scale), round(bid * scale) + 1) / scale
+        return {"Bid": bid, "Ask": ask, "Mid": round((bid + ask) / 2, decimals + 1)}
+
+    def infoprices(self, uics):
+        return {"Data": [{"Uic": uic, "AssetType": "FxSpot",
+                          "DisplayAndFormat": {"Symbol": self._symbol(uic), "Decimals": 5},
+                          "Quote": self.quote(uic)} for uic in uics]}
+
+    def instrument_details(self, uics=None, top=1000, skip=0):
+        """Paged /ref/v1/instruments/details for the simulated FX pairs"""
+        selected = sorted(uics) if uics else sorted(INSTRUMENTS)
+        page = selected[skip:skip + top]
+        data = []
+        for uic in page:
+            symbol = self._symbol(uic)
+            decimals = self._decimals(uic)
+            data.append({
+                "Uic": uic,
+                "Symbol": symbol,
+                "Description": f"{symbol[:3]}/{symbol[3:]}",
+                "AssetType": "FxSpot",
+                "CurrencyCode": symbol[3:],
+                "Format": {"Decimals": decimals, "OrderDecimals": decimals, "Format": "AllowDecimalPips"},
+                "TickSize": 10 ** -decimals,
+                "MinimumTradeSize": 1000,
+                "AmountDecimals": 0,
+            })
+        resp = {"Data": data}
+        if skip + top < len(selected):
+            resp["__next"] = f"/ref/v1/instruments/details?$top={top}&$skip={skip + top}"
+        return resp
+
+    def _new_id(self):
+        with self._lock:
+            value = str(self._next_id)
+            self._next_id += 1
+            return value
+
+    def place_order(self, body):
+        uic = body.get("Uic")
+        amount = body.get("Amount")
+        if uic is None or not amount or body.get("BuySell") not in ("Buy", "Sell"):
+            return 400, {"ErrorInfo": {"ErrorCode": "InvalidRequest", "Message": "Uic, Amount and BuySell required"}}
+
+        order_id = self._new_id()
+        order = dict(body, OrderId=order_id, Status="Working")
+        self.orders[order_id] = order
+        self._activity(order, "Placed")
+        if body.get("OrderType") == "Market":
+            self._fill(order)
+            return 200, {"OrderId": order_id, "ExecutionPrice": order["ExecutionPrice"]}
+        return 200, {"OrderId": order_id}
+
+    def modify_order(self, body):
+        order = self.orders.get(body.get("OrderId"))
+        if order is None:
+            return 404, {"ErrorInfo": {"ErrorCode": "OrderNotFound", "Message": "Unknown OrderId"}}
+        order.update(OrderType=body.get("OrderType", order["OrderType"]))
+        if order["OrderType"] == "Market" and order["Status"] == "Working":
+            self._fill(order)
+        return 200, {"OrderId": order["OrderId"]}
+
+    def cancel_order(self, order_id):
+        order = self.orders.get(order_id)
+        if order is None or order["Status"] != "Working":
+            return 404, {"ErrorInfo": {"ErrorCode": "OrderNotFound", "Message": "No working order with that OrderId"}}
+        order["Status"] = "Cancelled"
+        self._activity(order, "Cancelled")
+        return 200, {"Orders": [{"OrderId": order_id}]}
+
+    def _activity(self, order, status, **fields):
+        self.activities.append(dict(fields, OrderId=order["OrderId"], Uic=order["Uic"], BuySell=order["BuySell"],
+                                    Amount=order["Amount"], Status=status,
+                                    ActivityTime=datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")))
+
+    def order_activities(self, order_id=None):
+        data = [row for row in self.activities if order_id is None or row["OrderId"] == order_id]
+        return {"__count": len(data), "Data": data}
+
+    def open_orders(self):
+        """Working orders; a resting limit the market has reached fills at its limit price first"""
+        data = []
+        for order in list(self.orders.values()):
+            if order["Status"] != "Working":
+                continue
+            if order.get("OrderType") == "Limit":
+                quote = self.quote(order["Uic"])
+                if (quote["Ask"] <= order["OrderPrice"] if order["BuySell"] == "Buy"
+                        else quote["Bid"] >= order["OrderPrice"]):
+                    self._fill(order, order["OrderPrice"])
+                    continue
+            data.append({"OrderId": order["OrderId"], "Uic": order["Uic"], "BuySell": order["BuySell"],
+                         "Amount": order["Amount"], "OpenOrderType": order.get("OrderType"),
+                         "Price": order.get("OrderPrice"), "Status": "Working", "AssetType": "FxSpot"})
+        return {"__count": len(data), "Data": data}
+
+    def _fill(self, order, price=None):
+        if price is None:
+            quote = self.quote(order["Uic"])
+            price = quote["Ask"] if order["BuySell"] == "Buy" else quote["Bid"]
+        signed = order["Amount"] if order["BuySell"] == "Buy" else -order["Amount"]
+        order.update(Status="Filled", ExecutionPrice=price)
+        self._activity(order, "FinalFill", FilledAmount=order["Amount"], ExecutionPrice=price)
+        if self.netting:
+            signed = self._net_off(order["Uic"], signed)
+            if not signed:
+                return
+        position_id = self._new_id()
+        self.positions[position_id] = {
+            "PositionId": position_id,
+            "DisplayAndFormat": {"Symbol": self._symbol(order["Uic"]), "Decimals": 5},
+            "PositionBase": {
+                "Uic": order["Uic"],
+                "Amount": signed,
+                "OpenPrice": price,
+                "AssetType": "FxSpot",
+                "SourceOrderId": order["OrderId"],
+                "ExecutionTimeOpen": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+            },
+        }
+
+    def _net_off(self, uic, signed):
+        """Close opposite positions in uic oldest first; returns the amount left to open"""
+        for position_id, position in list(self.positions.items()):
+            base = position["PositionBase"]
+            if not signed:
+                break
+            if base["Uic"] != uic or (base["Amount"] > 0) == (signed > 0):
+                continue
+            closed = min(abs(signed), abs(base["Amount"]))
+            base["Amount"] += closed if base["Amount"] < 0 else -closed
+            signed += closed if signed < 0 else -closed
+            if not base["Amount"]:
+                del self.positions[position_id]
+        return signed
+
+    def position_list(self):
+        data = []
+        for position in list(self.positions.values()):
+            base = position["PositionBase"]
+            current = self.quote(base["Uic"])["Mid"]
+            pnl = (current - base["OpenPrice"]) * base["Amount"]
+            data.append(dict(position, PositionView={
+                "CurrentPrice": current,
+                "ProfitLossOnTradeInBaseCurrency": round(pnl, 2),
+                "MarketValueInBaseCurrency": round(pnl, 2),
+            }))
+        return {"__count": len(data), "Data": data}
+
+    def balance(self):
+        positions = self.position_list()["Data"]
+        unrealized = sum(p["PositionView"]["ProfitLossOnTradeInBaseCurrency"] for p in positions)
+        return {
+            "Currency": "EUR",
+            "CashBalance": 100000.0,
+            "CashAvailableForTrading": 100000.0 + unrealized,
+            "CollateralAvailable": 100000.0 + unrealized,
+            "UnrealizedMarginProfitLoss": unrealized,
+            "TotalValue": 100000.0 + unrealized,
+            "OpenPositionsCount": len(positions),
+            "MarginUsedByCurrentPositions": 0.0,
+            "MarginUtilizationPct": 0,
+        }
+
+
+def _make_handler(gateway):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real gateway
+        disable_nagle_algorithm = True   # headers and body go out as separate writes
+
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode() if payload is not None else b""
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _body(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            return json.loads(self.rfile.read(length)) if length else {}
+
+        def _handle(self, method):
+            gateway.requests += 1
+            url = urlparse(self.path)
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            body = self._body() if method in ("POST", "PATCH") else None
+
+            time.sleep(gateway.delay())
+            if gateway.should_fail():
+                return self._send(503, {"ErrorCode": "ServiceUnavailable", "Message": "Injected error"})
+
+            route = (method, url.path)
+            if route == ("GET", "/port/v1/users/me"):
+                return self._send(200, {"UserKey": "sim-user", "Name": "Simulator", "ClientKey": CLIENT_KEY})
+            if route == ("GET", "/port/v1/clients/me"):
+                return self._send(200, {"ClientKey": CLIENT_KEY, "DefaultAccountId": ACCOUNT_ID})
+            if route == ("GET", "/port/v1/accounts/me"):
+                return self._send(200, {"Data": [{"AccountId": ACCOUNT_ID, "AccountKey": ACCOUNT_KEY}]})
+            if route == ("GET", "/port/v1/balances"):
+                return self._send(200, gateway.balance())
+            if route == ("GET", "/port/v1/positions"):
+                return self._send(200, gateway.position_list())
+            if route == ("GET", "/port/v1/orders"):
+                return self._send(200, gateway.open_orders())
+            if route == ("GET", "/cs/v1/audit/orderactivities"):
+                return self._send(200, gateway.order_activities(query.get("OrderId")))
+            if route == ("GET", "/trade/v1/infoprices/list"):
+                uics = [int(uic) for uic in query.get("Uics", "").split(",") if uic]
+                return self._send(200, gateway.infoprices(uics))
+            if route == ("GET", "/ref/v1/instruments/details"):
+                uics = [int(uic) for uic in query.get("Uics", "").split(",") if uic]
+                return self._send(200, gateway.instrument_details(uics, int(query.get("$top", 1000)),
+                                                                  int(query.get("$skip", 0))))
+            if route == ("POST", "/trade/v2/orders"):
+                return self._send(*gateway.place_order(body))
+            if route == ("PATCH", "/trade/v2/orders"):
+                return self._send(*gateway.modify_order(body))
+            if method == "DELETE" and url.path.startswith("/trade/v2/orders/"):
+                return self._send(*gateway.cancel_order(url.path.rsplit("/", 1)[-1]))
+            return self._send(404, {"ErrorCode": "NotFound", "Message": f"{method} {url.path}"})
+
+        def do_GET(self):
+            self._handle("GET")
+
+        def do_POST(self):
+            self._handle("POST")
+
+        def do_PATCH(self):
+            self._handle("PATCH")
+
+        def do_DELETE(self):
+            self._handle("DELETE")
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+class SimulatorServer:
+    """Runs a SimulatedGateway over HTTP on a background thread"""
+
+    def __init__(self, host="127.0.0.1", port=0, **gateway_options):
+        self.gateway = SimulatedGateway(**gateway_options)
+        self.httpd = ThreadingHTTPServer((host, port), _make_handler(self.gateway))
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="saxo-simulator", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Saxo OpenAPI simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="± seconds of uniform jitter")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--netting", action="store_true", help="fills close opposite positions before opening new ones")
+    args = parser.parse_args()
+
+    server = SimulatorServer(args.host, args.port, latency=args.latency, jitter=args.jitter,
+                             error_rate=args.error_rate, seed=args.seed, netting=args.netting)
+    print(f"Saxo OpenAPI simulator on {server.base_url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
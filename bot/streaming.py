@@ -0,0 +1,183 @@
+"""Streaming price subscriptions over Saxo's websocket feed.
+
+A PriceStream opens the streaming connection, creates an infoprices
+subscription over REST, then applies the snapshot and every delta message
+to a QuoteBook. The ticker and order paths read quotes from the book
+instead of polling /trade/v1/infoprices/list.
+"""
+import asyncio
+import json
+import struct
+import threading
+import uuid
+
+from websockets.asyncio.client import connect
+from websockets.exceptions import ConnectionClosed
+
+from .client import STREAM_URL
+from .quotes import QuoteBook
+
+SUBSCRIPTIONS_PATH = "/trade/v1/infoprices/subscriptions"
+
+# Saxo frames: <u64 message id><u16 reserved><u8 ref id size><ref id><u8 format><i32 payload size><payload>
+_HEADER = struct.Struct("<QHB")
+_PAYLOAD_HEADER = struct.Struct("<Bi")
+PAYLOAD_JSON = 0
+
+
+def decode_messages(frame):
+    """Yield (message_id, reference_id, payload) for every message in a websocket frame"""
+    offset = 0
+    while offset < len(frame):
+        message_id, _, ref_size = _HEADER.unpack_from(frame, offset)
+        offset += _HEADER.size
+        reference_id = frame[offset:offset + ref_size].decode("ascii")
+        offset += ref_size
+        payload_format, payload_size = _PAYLOAD_HEADER.unpack_from(frame, offset)
+        offset += _PAYLOAD_HEADER.size
+        payload = frame[offset:offset + payload_size]
+        offset += payload_size
+        if payload_format == PAYLOAD_JSON:
+            payload = json.loads(payload)
+        yield message_id, reference_id, payload
+
+
+def encode_message(message_id, reference_id, payload):
+    """Inverse of decode_messages for a single JSON message"""
+    ref = reference_id.encode("ascii")
+    body = json.dumps(payload).encode("utf-8")
+    return (_HEADER.pack(message_id, 0, len(ref)) + ref
+            + _PAYLOAD_HEADER.pack(PAYLOAD_JSON, len(body)) + body)
+
+
+class PriceStream:
+    """Keeps a QuoteBook current from an infoprices streaming subscription"""
+
+    def __init__(self, client, account_key, uics, book=None, stream_url=STREAM_URL,
+                 heartbeat_timeout=30, reconnect_delay=0.5, max_reconnect_delay=30):
+        self.client = client
+        self.account_key = account_key
+        self.uics = list(uics)
+        self.book = book if book is not None else QuoteBook()
+        self.stream_url = stream_url
+        self.heartbeat_timeout = heartbeat_timeout
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self.context_id = uuid.uuid4().hex[:16]
+        self.reference_id = None
+        self.last_message_id = None
+        self.connected = False
+        self.reconnects = 0
+
+        self._stopping = False
+        self._thread = None
+        self._loop = None
+        self._ws = None
+
+    def _subscribe(self):
+        """Create the subscription and seed the book from its snapshot"""
+        self.reference_id = f"prices-{uuid.uuid4().hex[:8]}"
+        body = {
+            "Arguments": {
+                "AccountKey": self.account_key,
+                "Uics": ",".join(str(uic) for uic in self.uics),
+                "AssetType": "FxSpot",
+                "FieldGroups": ["DisplayAndFormat", "Quote"],
+            },
+            "ContextId": self.context_id,
+            "ReferenceId": self.reference_id,
+            "RefreshRate": 0,
+        }
+        resp = self.client.post(SUBSCRIPTIONS_PATH, json=body)
+        if not isinstance(resp, dict) or "ErrorInfo" in resp:
+            # Nothing was created, so there is nothing to delete; run() backs off and retries
+            self.reference_id = None
+            raise ValueError(f"infoprices subscription failed: {resp!r}")
+        self.book.apply((resp.get("Snapshot") or {}).get("Data", []))
+
+    def _unsubscribe(self):
+        if self.reference_id is not None:
+            self.client.delete(f"{SUBSCRIPTIONS_PATH}/{self.context_id}/{self.reference_id}")
+            self.reference_id = None
+
+    def _handle(self, message_id, reference_id, payload):
+        """Returns False when the server asked us to disconnect"""
+        self.last_message_id = message_id
+        if reference_id == self.reference_id:
+            self.book.apply(payload)
+        elif reference_id == "_resetsubscriptions":
+            targets = payload.get("TargetReferenceIds") or [self.reference_id]
+            if self.reference_id in targets:
+                self._unsubscribe()
+                self._subscribe()
+        elif reference_id == "_disconnect":
+            return False
+        # _heartbeat only proves the connection is alive; the recv timeout covers the rest
+        return True
+
+    async def _session(self):
+        url = f"{self.stream_url}?contextId={self.context_id}"
+        async with connect(url, additional_headers={"Authorization": self.client.headers["Authorization"]}) as ws:
+            self._ws = ws
+            # Subscribe only once the socket is open so no delta is missed
+            await asyncio.to_thread(self._subscribe)
+            self.connected = True
+            while not self._stopping:
+                frame = await asyncio.wait_for(ws.recv(), timeout=self.heartbeat_timeout)
+                if isinstance(frame, str):
+                    frame = frame.encode("latin-1")
+                for message_id, reference_id, payload in decode_messages(frame):
+                    if not self._handle(message_id, reference_id, payload):
+                        return
+
+    async def run(self):
+        """Connect, subscribe and consume until stop(); reconnects and resubscribes on failure"""
+        delay = self.reconnect_delay
+        while not self._stopping:
+            try:
+                await self._session()
+                delay = self.reconnect_delay
+            except (ConnectionClosed, OSError, ValueError, asyncio.TimeoutError):
+                pass
+            finally:
+                self.connected = False
+                self._ws = None
+
+            if self._stopping:
+                break
+            # Old subscription is tied to the dropped connection
+            await self._drop_subscription()
+            self.reconnects += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+        await self._drop_subscription()
+
+    async def _drop_subscription(self):
+        try:
+            await asyncio.to_thread(self._unsubscribe)
+        except (OSError, ValueError):
+            self.reference_id = None
+
+    def start(self):
+        """Run the stream on a background thread"""
+        def target():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(self.run())
+            finally:
+                self._loop.close()
+
+        self._thread = threading.Thread(target=target, name="price-stream", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=5):
+        self._stopping = True
+        ws = self._ws
+        if self._loop is not None and ws is not None:
+            asyncio.run_coroutine_threadsafe(ws.close(), self._loop)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -1,11 +1,34 @@
-from bot.core import SaxoTradingBot
+import argparse
+import os
+import sys
+
+
+def run(argv):
+    if argv:
+        # Headless command (quote, positions, buy, sell, record): JSON out, no menu imports
+        from bot.cli import main as cli_main
+        return cli_main(argv)
+
+    from bot.core import SaxoTradingBot
 
-def main():
     print("FX Trading Bot")
-    token = input("Paste your Saxo Bearer Token: ").strip()
+    token = os.environ.get("SAXO_TOKEN") or input("Paste your Saxo Bearer Token: ").strip()
 
     bot = SaxoTradingBot(token)
     bot.run()
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--profile", metavar="PATH", help="write a cProfile of this session to PATH")
+    options, argv = parser.parse_known_args()
+    if not options.profile:
+        sys.exit(run(argv))
+
+    from bot.profiling import profiled
+    with profiled(options.profile):
+        status = run(argv)
+    sys.exit(status)
 
 if __name__ == "__main__":
     main()
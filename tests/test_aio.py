@@ -0,0 +1,49 @@
+import asyncio
+import time
+import unittest
+
+from aiohttp import web
+
+from bot.core import SaxoTradingBot
+
+DELAY = 0.2
+
+
+def _slow(payload):
+    async def handler(request):
+        await asyncio.sleep(DELAY)
+        return web.json_response(payload)
+    return handler
+
+
+class TestConcurrentSetup(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        app = web.Application()
+        app.router.add_get("/port/v1/users/me", _slow({"UserKey": "u1"}))
+        app.router.add_get("/port/v1/clients/me", _slow({"ClientKey": "c1", "DefaultAccountId": "A1"}))
+        app.router.add_get("/port/v1/accounts/me", _slow({"Data": [{"AccountId": "A1", "AccountKey": "k1"}]}))
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = self.runner.addresses[0][1]
+
+        self.bot = SaxoTradingBot("token")
+        self.bot.client.base_url = f"http://127.0.0.1:{port}"
+
+    async def asyncTearDown(self):
+        await self.runner.cleanup()
+        self.bot.client.close()
+
+    async def test_setup_runs_calls_concurrently(self):
+        start = time.perf_counter()
+        await self.bot.setup_async()
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(self.bot.client_key, "c1")
+        self.assertEqual(self.bot.account_key, "k1")
+        self.assertLess(elapsed, DELAY * 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,219 @@
+import unittest
+
+from bot.algos import TWAP, ExecutionAlgo, Iceberg, LimitThenMarket, round_to_tick, split
+from bot.backtest import SimulatedBroker, replay
+from bot.core import SaxoTradingBot
+from bot.simulator import SimulatorServer
+
+
+class RejectingBroker(SimulatedBroker):
+    def place_market_order(self, uic, amount, buy_sell="Sell"):
+        return self._error("Risk.order_size", "Order size above limit")
+
+
+def drive(broker, algo, ticks):
+    """Replay (ts, bid, ask) ticks for UIC 21, stepping algo after each"""
+    ts, bid, ask = zip(*ticks)
+    replay(broker, ts, [21] * len(ts), bid, ask, on_tick=lambda broker, i: algo.step(ts[i]))
+
+
+class TestAlgosOnSimulatedBroker(unittest.TestCase):
+    def setUp(self):
+        self.broker = SimulatedBroker()
+
+    def test_split(self):
+        self.assertEqual(split(100000, 4), [25000, 25000, 25000, 25000])
+        self.assertEqual(split(10500, 4), [3000, 3000, 2000, 2500])
+        self.assertEqual(split(500, 4), [500])
+
+    def test_round_to_tick_is_passive(self):
+        self.assertEqual(round_to_tick(1.084187, 1e-05, "Buy"), 1.08418)
+        self.assertEqual(round_to_tick(1.084181, 1e-05, "Sell"), 1.08419)
+        self.assertEqual(round_to_tick(1.08418, 1e-05, "Sell"), 1.08418)
+        self.assertEqual(round_to_tick(149.8236, 0.001, "Buy"), 149.823)
+        self.assertEqual(round_to_tick(1.084187, None, "Buy"), 1.084187)
+
+    def test_limit_children_sit_on_the_tick(self):
+        broker = SimulatedBroker(tick_sizes={21: 1e-05})
+        algo = LimitThenMarket(broker, 21, 10000, "Sell", timeout=60)
+        drive(broker, algo, [(0, 1.100004, 1.100016)])
+        self.assertEqual(algo.children[0]["Price"], 1.10002)
+        self.assertEqual(len(broker.working), 1)
+
+    def test_twap_market_slices_on_schedule(self):
+        algo = TWAP(self.broker, 21, 40000, "Buy", duration=4, slices=4, order_type="Market")
+        drive(self.broker, algo, [(t, 1.1000 + t / 10000, 1.1002 + t / 10000) for t in range(6)])
+
+        self.assertTrue(algo.done)
+        self.assertEqual([fill[0] for fill in self.broker.fills], [0, 1, 2, 3])
+        report = algo.report()
+        self.assertEqual(report["filled"], 40000)
+        self.assertAlmostEqual(report["average_price"], 1.10035)
+        self.assertAlmostEqual(report["arrival_mid"], 1.1001)
+        self.assertAlmostEqual(report["shortfall_bps"], 0.00025 / 1.1001 * 1e4)
+        self.assertAlmostEqual(report["execution_cost"], 0.00025 * 40000)
+
+    def test_twap_limit_children_convert_when_the_next_slice_is_due(self):
+        algo = TWAP(self.broker, 21, 20000, "Sell", duration=10, slices=2)
+        drive(self.broker, algo, [(0, 1.1000, 1.1002), (3, 1.1003, 1.1004),   # touches the first ask
+                                  (5, 1.0999, 1.1001), (10, 1.0998, 1.1000)])
+
+        self.assertEqual([(child["Converted"], child["FillPrice"]) for child in algo.children],
+                         [(False, 1.1002), (True, 1.0998)])
+        self.assertTrue(algo.done)
+        self.assertEqual(algo.report()["converted"], 1)
+
+    def test_iceberg_shows_one_clip_at_a_time(self):
+        algo = Iceberg(self.broker, 21, 30000, "Buy", display=10000, price=1.0995)
+        ticks = [(0, 1.1000, 1.1002)]
+        for t in range(1, 4):
+            ticks += [(2 * t - 1, 1.0993, 1.0995), (2 * t, 1.1000, 1.1002)]
+        ts, bid, ask = zip(*ticks)
+        peak = []
+
+        def on_tick(broker, i):
+            algo.step(ts[i])
+            peak.append(sum(order["Amount"] for order in broker.working.values()))
+        replay(self.broker, ts, [21] * len(ts), bid, ask, on_tick=on_tick)
+
+        self.assertTrue(algo.done)
+        self.assertEqual(max(peak), 10000)
+        self.assertEqual(algo.report()["average_price"], 1.0995)
+        self.assertEqual(len(algo.children), 3)
+
+    def test_limit_then_market_converts_after_timeout(self):
+        algo = LimitThenMarket(self.broker, 21, 100000, "Buy", timeout=5)
+        drive(self.broker, algo, [(0, 1.1000, 1.1002), (2, 1.1001, 1.1003), (6, 1.1004, 1.1006)])
+
+        report = algo.report()
+        self.assertEqual((report["filled"], report["converted"], report["elapsed"]), (100000, 1, 6))
+        self.assertEqual(report["average_price"], 1.1006)
+        self.assertGreater(report["shortfall_bps"], 0)
+
+    def test_cancel_counts_unfilled_as_opportunity_cost(self):
+        algo = LimitThenMarket(self.broker, 21, 100000, "Buy", timeout=60, price=1.0990)
+        drive(self.broker, algo, [(0, 1.1000, 1.1002), (1, 1.1010, 1.1012)])
+        algo.cancel(1)
+
+        report = algo.report()
+        self.assertEqual(self.broker.working, {})
+        self.assertEqual(report["filled"], 0)
+        self.assertIsNone(report["shortfall_bps"])
+        self.assertAlmostEqual(report["opportunity_cost"], (1.1011 - 1.1001) * 100000)
+
+    def test_rejected_child_stops_the_algo(self):
+        broker = RejectingBroker()
+        algo = TWAP(broker, 21, 20000, "Buy", duration=2, slices=2, order_type="Market")
+        drive(broker, algo, [(0, 1.1000, 1.1002), (1, 1.1000, 1.1002)])
+        self.assertEqual(algo.finished, 0)
+        self.assertEqual(algo.children, [])
+        self.assertEqual(algo.report()["error"]["ErrorInfo"]["ErrorCode"], "Risk.order_size")
+
+    def test_algo_without_a_schedule_cannot_be_built(self):
+        class Unscheduled(ExecutionAlgo):
+            pass
+
+        with self.assertRaises(TypeError):
+            Unscheduled(self.broker, 21, 20000, "Buy")
+
+
+class TestAlgosAgainstSimulator(unittest.TestCase):
+    def setUp(self):
+        self.server = SimulatorServer(seed=3).start()
+        self.bot = SaxoTradingBot("token", base_url=self.server.base_url,
+                                  instrument_cache="/nonexistent/instruments.json")
+        self.bot.setup()
+
+    def tearDown(self):
+        self.bot.client.close()
+        self.server.stop()
+
+    def test_limit_then_market_through_the_gateway(self):
+        broker = self.bot.algo_broker()
+        broker.status_ttl = 0
+        algo = LimitThenMarket(broker, 21, 50000, "Buy", timeout=5, price=1.075)  # below the market
+        algo.step(0)
+        self.assertEqual(len(algo.working), 1)
+        self.assertEqual(self.bot.get_position_size(21)[0], 0)
+
+        algo.step(5)
+        self.assertTrue(algo.done)
+        self.assertEqual(algo.report()["converted"], 1)
+        self.assertEqual(self.bot.get_position_size(21)[0], 50000)
+        self.assertIn(21, self.bot.pnl.by_uic())
+
+    def test_resting_limit_fills_and_cancel_is_sent(self):
+        broker = self.bot.algo_broker()
+        broker.status_ttl = 0
+        algo = Iceberg(broker, 21, 20000, "Sell", display=10000, price=1.075)  # marketable: fills on the next poll
+        for now in range(4):
+            algo.step(now)
+        self.assertTrue(algo.done)
+        self.assertEqual(algo.report()["average_price"], 1.075)
+        self.assertEqual(self.bot.get_position_size(21)[0], -20000)
+
+        exposure = self.bot.risk.exposure(21)
+        resting = LimitThenMarket(broker, 21, 10000, "Buy", timeout=60, price=1.075)
+        resting.step(0)
+        self.assertEqual(self.bot.risk.exposure(21), exposure + 10000)
+        resting.cancel(1)
+        order_id = resting.children[0]["OrderId"]
+        self.assertEqual(self.server.gateway.orders[order_id]["Status"], "Cancelled")
+        self.assertEqual(self.bot.risk.exposure(21), exposure)   # the cancelled child's reservation is released
+
+    def test_order_dropped_by_the_gateway_is_not_a_fill(self):
+        broker = self.bot.algo_broker()
+        broker.status_ttl = 0
+        algo = LimitThenMarket(broker, 21, 10000, "Buy", timeout=60, price=1.075)
+        resp = broker.place_limit_order(21, 1.075, amount=10000, buy_sell="Buy")
+        del self.server.gateway.orders[resp["OrderId"]]   # rejected before it was ever listed
+        self.assertEqual(broker.order_status(resp["OrderId"])["Status"], "Working")
+        self.assertEqual(broker.order_status(resp["OrderId"])["Status"], "Rejected")
+        self.assertEqual(self.bot.risk.exposure(21), 0)
+
+        algo.step(0)
+        self.server.gateway.cancel_order(algo.children[0]["OrderId"])   # pulled outside the algo
+        algo.step(1)
+        self.assertEqual([child["Status"] for child in algo.children], ["Cancelled", "Working"])  # resent
+
+        self.server.gateway.orders.pop(algo.children[1]["OrderId"])    # gone with nothing on record
+        algo.step(2)
+        algo.step(3)
+        self.assertTrue(algo.done)
+        self.assertEqual(algo.children[1]["Status"], "Rejected")
+        self.assertEqual(algo.report()["error"]["ErrorInfo"]["ErrorCode"], "OrderRejected")
+        self.assertEqual(len(algo.children), 2)
+        self.assertEqual(algo.report()["filled"], 0)
+        self.assertEqual(self.bot.get_position_size(21)[0], 0)
+        self.assertNotIn(21, self.bot.pnl.by_uic())
+
+    def test_child_that_reduces_a_netted_position_counts_as_filled(self):
+        self.server.gateway.netting = True
+        broker = self.bot.algo_broker()
+        broker.status_ttl = 0
+        broker.place_market_order(21, 20000, buy_sell="Buy")
+
+        algo = LimitThenMarket(broker, 21, 10000, "Sell", timeout=60, price=1.075)  # marketable
+        for now in range(4):
+            algo.step(now)
+        self.assertTrue(algo.done)
+        self.assertEqual((algo.report()["filled"], len(algo.children)), (10000, 1))
+        rows = [p["PositionBase"] for p in self.server.gateway.positions.values()]
+        self.assertEqual([row["Amount"] for row in rows], [10000])   # the sell opened no row of its own
+
+    def test_touch_priced_children_pass_the_tick_check_with_reference_data(self):
+        self.bot.instruments.refresh(self.bot.client)
+        self.assertEqual(self.bot.instruments.tick_size(21), 1e-05)
+        broker = self.bot.algo_broker()
+        broker.status_ttl = 0
+        algo = TWAP(broker, 21, 20000, "Buy", duration=2, slices=2)
+        for now in range(4):
+            algo.step(now)
+        self.assertIsNone(algo.report()["error"])
+        self.assertEqual(len(algo.children), 2)
+        for child in algo.children:
+            self.assertAlmostEqual(child["Price"] / 1e-05, round(child["Price"] / 1e-05), places=6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import math
+import unittest
+
+import numpy as np
+
+from bot.analytics import SPARK, TickAnalytics, pip_size
+from bot.instruments import InstrumentCache
+
+
+class TestTickAnalytics(unittest.TestCase):
+    def setUp(self):
+        self.analytics = TickAnalytics(InstrumentCache(path="/nonexistent/instruments.json"), capacity=4,
+                                       window_minutes=5, rows=2)
+
+    def test_pip_size(self):
+        self.assertEqual(pip_size(5), 1e-4)
+        self.assertEqual(pip_size(3), 1e-2)
+        self.assertEqual(pip_size(4), 1e-4)
+
+    def test_ring_keeps_latest_quotes_in_order(self):
+        for i in range(10):
+            self.analytics.on_quote(21, {"Bid": 1.0 + i / 100, "Ask": 1.0002 + i / 100}, now=1000.0 + i)
+        np.testing.assert_allclose(self.analytics.history(21), [1.0601, 1.0701, 1.0801, 1.0901])
+        np.testing.assert_allclose(self.analytics.history(21, 2), [1.0801, 1.0901])
+        self.assertEqual(self.analytics.stats(21, now=1009.0)["ticks"], 4)
+
+    def test_spread_volatility_and_tick_rate(self):
+        self.analytics.on_quote(31, {"Bid": 150.00, "Ask": 150.02}, now=0.0)
+        self.analytics.on_quote(31, {"Bid": 150.10, "Ask": 150.12}, now=1.0)
+        stats = self.analytics.stats(31, now=1.0)
+        self.assertAlmostEqual(stats["spread_pips"], 2.0)
+        expected_var = 0.06 * math.log(150.11 / 150.01) ** 2
+        self.assertAlmostEqual(stats["vol_bp"], math.sqrt(expected_var) * 1e4)
+        self.assertAlmostEqual(stats["tick_rate"], (math.exp(-1 / 60) + 1) / 60)
+
+    def test_high_low_covers_only_the_window(self):
+        self.analytics.on_quote(21, {"Mid": 1.20}, now=0.0)       # minute 0
+        self.analytics.on_quote(21, {"Mid": 1.05}, now=120.0)     # minute 2
+        self.analytics.on_quote(21, {"Mid": 1.10}, now=330.0)     # minute 5: minute 0 has aged out
+        stats = self.analytics.stats(21, now=330.0)
+        self.assertEqual((stats["low"], stats["high"]), (1.05, 1.10))
+
+    def test_memory_is_fixed_after_rows_exist(self):
+        for uic in (16, 21, 31):
+            self.analytics.on_quote(uic, {"Mid": 1.0}, now=0.0)
+        sizes = {name: getattr(self.analytics, name).nbytes for name in ("mids", "stamps", "high", "low")}
+        for i in range(5000):
+            self.analytics.on_quote(21, {"Mid": 1.0 + (i % 7) / 1000}, now=float(i))
+        self.assertEqual(sizes, {name: getattr(self.analytics, name).nbytes for name in sizes})
+        self.assertEqual(self.analytics.mids.shape, (4, 4))
+
+    def test_sparkline(self):
+        for i, mid in enumerate((1.0, 1.1, 1.2, 1.3)):
+            self.analytics.on_quote(21, {"Mid": mid}, now=float(i))
+        self.assertEqual(self.analytics.sparkline(21), SPARK[0] + SPARK[2] + SPARK[5] + SPARK[7])
+        self.assertEqual(self.analytics.sparkline(99), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
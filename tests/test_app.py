@@ -0,0 +1,79 @@
+import threading
+import time
+import unittest
+
+try:
+    from bot.app import TradingApp
+    TEXTUAL_AVAILABLE = True
+except ImportError:
+    TEXTUAL_AVAILABLE = False
+
+from bot.core import SaxoTradingBot
+from bot.simulator import SimulatorServer
+
+
+@unittest.skipUnless(TEXTUAL_AVAILABLE, "textual not installed")
+class TestTradingApp(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = SimulatorServer(seed=1).start()
+        self.bot = SaxoTradingBot("token", base_url=self.server.base_url)
+
+    async def asyncTearDown(self):
+        self.bot.client.close()
+        self.server.stop()
+
+    async def test_quotes_update_while_order_is_placed(self):
+        app = TradingApp(self.bot, [21, 31], quote_interval=0.05, position_interval=0.05)
+        async with app.run_test() as pilot:
+            for _ in range(100):
+                await pilot.pause(0.02)
+                if app._prev_mid:
+                    break
+            self.assertEqual(set(app._prev_mid), {21, 31})
+
+            # Slow the gateway down so the order is still in flight while quotes refresh
+            await pilot.click("#prompt")
+            await pilot.press(*"buy 21 100000")
+            self.server.gateway.latency = 0.5
+            await pilot.press("enter")
+
+            # The handler returned at once: the prompt is free and the order is a running worker
+            self.assertEqual(app.query_one("#prompt").value, "")
+            self.assertEqual(self.bot.positions.size(21)[0], 0)
+            orders = [worker for worker in app.workers if worker.group == "orders"]
+            self.assertEqual(len(orders), 1)
+            self.assertFalse(orders[0].is_finished)
+
+            for _ in range(100):
+                await pilot.pause(0.02)
+                if self.bot.positions.size(21)[0]:
+                    break
+            self.assertEqual(self.bot.positions.size(21)[0], 100000)
+            self.assertEqual(self.bot.account_key, "sim-account")
+
+    async def test_watch_restarts_the_stream_off_the_event_loop(self):
+        calls = []
+
+        def start_price_stream(uics):
+            time.sleep(0.3)   # subscribing is a blocking REST round trip
+            calls.append((uics, threading.current_thread() is threading.main_thread()))
+
+        self.bot.start_price_stream = start_price_stream
+        app = TradingApp(self.bot, [21], quote_interval=0.05, position_interval=0.05)
+        async with app.run_test() as pilot:
+            await pilot.click("#prompt")
+            await pilot.press(*"watch 16,31")
+            started = time.monotonic()
+            await pilot.press("enter")
+            self.assertLess(time.monotonic() - started, 0.3)
+            self.assertEqual(app.uics, [16, 31])
+
+            for _ in range(100):
+                await pilot.pause(0.02)
+                if calls:
+                    break
+            self.assertEqual(calls, [([16, 31], False)])
+
+
+if __name__ == "__main__":
+    unittest.main()
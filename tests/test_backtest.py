@@ -0,0 +1,58 @@
+import unittest
+
+import numpy as np
+
+from bot.backtest import SimulatedBroker, backtest_positions, replay, sweep_ma_crossover
+
+
+class TestSimulatedBroker(unittest.TestCase):
+    def setUp(self):
+        self.broker = SimulatedBroker()
+        self.broker.on_tick(1, 21, 1.1000, 1.1002)
+
+    def test_market_orders_fill_at_bid_and_ask(self):
+        self.broker.place_market_order(21, 1000, "Buy")
+        self.broker.place_market_order(21, 400, "Sell")
+        self.assertEqual([fill[4] for fill in self.broker.fills], [1.1002, 1.1000])
+        self.assertEqual(self.broker.positions[21], 600)
+
+    def test_limit_order_fills_on_touch(self):
+        order_id = self.broker.place_limit_order(21, 1.0995, amount=1000)["OrderId"]
+        self.broker.on_tick(2, 21, 1.0994, 1.0996)
+        self.assertEqual(self.broker.order_status(order_id)["Status"], "Working")
+        self.broker.on_tick(3, 21, 1.0993, 1.0995)
+        self.assertEqual(self.broker.order_status(order_id)["FillPrice"], 1.0995)
+
+    def test_convert_to_market_fills_working_order(self):
+        order_id = self.broker.place_limit_order(21, 1.0900, amount=1000)["OrderId"]
+        self.broker.convert_to_market_order(order_id, 21)
+        self.assertEqual(self.broker.order_status(order_id)["FillPrice"], 1.1002)
+        self.assertIn("ErrorInfo", self.broker.convert_to_market_order(order_id, 21))
+
+
+class TestVectorizedBacktest(unittest.TestCase):
+    def test_matches_tick_by_tick_replay(self):
+        rng = np.random.default_rng(7)
+        mid = 1.1 + np.cumsum(rng.normal(0, 1e-4, 500))
+        bid, ask = mid - 5e-5, mid + 5e-5
+        target = np.sign(np.sin(np.arange(500) / 20)) * 1000
+
+        def trade_to_target(broker, i):
+            delta = target[i] - broker.positions.get(21, 0)
+            if delta:
+                broker.place_market_order(21, abs(delta), "Buy" if delta > 0 else "Sell")
+
+        broker = replay(SimulatedBroker(), np.arange(500), np.full(500, 21), bid, ask, trade_to_target)
+        result = backtest_positions(bid, ask, target, lag=0)
+
+        self.assertAlmostEqual(result["pnl"], broker.pnl(21), places=9)
+        self.assertEqual(result["trades"], len(broker.fills))
+
+    def test_sweep_skips_invalid_pairs(self):
+        bid = np.linspace(1.0, 1.1, 1000)
+        results = sweep_ma_crossover(bid, bid + 1e-4, [5, 50], [20, 50])
+        self.assertEqual(sorted((fast, slow) for fast, slow, _, _ in results), [(5, 20), (5, 50)])
+
+
+if __name__ == "__main__":
+    unittest.main()
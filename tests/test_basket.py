@@ -0,0 +1,87 @@
+import time
+import unittest
+
+from bot.basket import MAX_LEGS, place_basket_order, validate_legs
+from bot.client import SaxoClient
+from bot.risk import RiskEngine
+from bot.simulator import SimulatorServer
+
+
+class OrderClient:
+    def __init__(self, risk):
+        self.risk = risk
+        self.posted = []
+        self._ids = iter(range(1, 1000))
+
+    def post(self, path, json=None):
+        self.posted.append(json)
+        return {"OrderId": str(next(self._ids))}
+
+
+class TestValidateLegs(unittest.TestCase):
+    def test_normalises_sides_and_amounts(self):
+        self.assertEqual(validate_legs([("21", 100000.0, "buy"), (17, 5000, "SELL")]),
+                         [(21, 100000, "Buy"), (17, 5000, "Sell")])
+
+    def test_reports_every_problem(self):
+        with self.assertRaises(ValueError) as ctx:
+            validate_legs([(21, -5, "Buy"), (0, 100, "Buy"), (17, 100, "Hold"), (21, 100, "Sell")])
+        message = str(ctx.exception)
+        for expected in ("leg 1: amount", "leg 2: invalid Uic", "leg 3: side", "leg 4: Uic 21"):
+            self.assertIn(expected, message)
+
+
+class TestPlaceBasketOrder(unittest.TestCase):
+    def test_legs_are_sent_concurrently(self):
+        def slow_place(client, account_key, uic, amount, buy_sell):
+            time.sleep(0.1)
+            return {"OrderId": str(uic)} if uic != 31 else {"ErrorInfo": {"ErrorCode": "Rejected"}}
+
+        result = place_basket_order(None, "acc", [(21, 1000, "Buy"), (17, 1000, "Sell"), (31, 1000, "Buy")],
+                                    place=slow_place)
+
+        self.assertLess(result["wall_ms"], 250)
+        self.assertLess(result["skew_ms"], 50)
+        self.assertFalse(result["ok"])
+        self.assertEqual([leg["ok"] for leg in result["legs"]], [True, True, False])
+
+    def test_risk_rejected_leg_stops_the_whole_basket(self):
+        risk = RiskEngine(max_order_size=1_000_000, instruments={21: "EURUSD", 17: "EURGBP"})
+        client = OrderClient(risk)
+        result = place_basket_order(client, "acc", [(21, 500_000, "Buy"), (17, 2_000_000, "Sell")])
+
+        self.assertEqual(client.posted, [])   # the hedge leg is not sent alone
+        self.assertEqual([leg["response"]["ErrorInfo"]["ErrorCode"] for leg in result["legs"]],
+                         ["Risk.basket", "Risk.order_size"])
+        self.assertFalse(result["ok"])
+        self.assertEqual((risk.exposure(21), risk.exposure(17)), (0, 0))
+
+        result = place_basket_order(client, "acc", [(21, 500_000, "Buy"), (17, 500_000, "Sell")])
+        self.assertTrue(result["ok"])
+        self.assertEqual(len(client.posted), 2)
+        self.assertEqual((risk.exposure(21), risk.exposure(17)), (500_000, -500_000))   # reserved once
+
+    def test_largest_basket_is_not_throttled(self):
+        with SimulatorServer(seed=1) as server:
+            client = SaxoClient("token", base_url=server.base_url)
+            waits = []
+            acquire = client.scheduler.acquire
+
+            def timed_acquire(group, *args, **kwargs):
+                waited = acquire(group, *args, **kwargs)
+                waits.append(waited)
+                return waited
+            client.scheduler.acquire = timed_acquire
+
+            result = place_basket_order(client, "sim-account", [(uic, 1000, "Buy") for uic in range(1, MAX_LEGS + 1)])
+            client.close()
+
+        self.assertTrue(result["ok"])
+        self.assertEqual(len(waits), MAX_LEGS)
+        self.assertLess(max(waits), 0.1)   # one more order than the burst waits 0.5s for a token
+        with self.assertRaises(ValueError):
+            validate_legs([(uic, 1000, "Buy") for uic in range(1, MAX_LEGS + 2)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from bot import cli
+from bot.simulator import SimulatorServer
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.server = SimulatorServer(seed=2).start()
+        self.env = mock.patch.dict(os.environ, {"SAXO_TOKEN": "token", "SAXO_BASE_URL": self.server.base_url,
+                                                "SAXO_INSTRUMENT_CACHE": "/nonexistent/instruments.json"})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        self.server.stop()
+
+    def run_cli(self, *argv):
+        out = io.StringIO()
+        status = cli.main(list(argv), out=out)
+        return status, json.loads(out.getvalue())
+
+    def test_quote_accepts_symbols_and_uics(self):
+        status, result = self.run_cli("quote", "EURUSD,31")
+        self.assertEqual(status, 0)
+        self.assertEqual([row["Symbol"] for row in result["quotes"]], ["EURUSD", "USDJPY"])
+        self.assertLess(result["quotes"][0]["Bid"], result["quotes"][0]["Ask"])
+
+    def test_buy_then_positions(self):
+        status, result = self.run_cli("buy", "21", "100000")
+        self.assertEqual(status, 0)
+        self.assertIn("OrderId", result["Response"])
+
+        status, result = self.run_cli("positions")
+        self.assertEqual(status, 0)
+        self.assertEqual(result["net"], [{"Uic": 21, "Amount": 100000}])
+
+    def test_risk_rejection_exits_1(self):
+        status, result = self.run_cli("buy", "EURUSD", "1e9")
+        self.assertEqual(status, 1)
+        self.assertEqual(result["Response"]["ErrorInfo"]["ErrorCode"], "Risk.order_size")
+        self.assertEqual(self.server.gateway.orders, {})
+
+    def test_sell_is_limited_to_the_held_size(self):
+        status, result = self.run_cli("sell", "21", "1000")
+        self.assertEqual(status, 1)
+        self.assertEqual(result["Response"]["ErrorInfo"]["ErrorCode"], "InsufficientPosition")
+        self.assertEqual(self.server.gateway.orders, {})
+
+        self.assertEqual(self.run_cli("buy", "21", "5000")[0], 0)
+        self.assertEqual(self.run_cli("sell", "21", "6000")[0], 1)
+        status, result = self.run_cli("sell", "21", "5000")
+        self.assertEqual(status, 0)
+        self.assertEqual(self.run_cli("positions")[1]["net"], [{"Uic": 21, "Amount": 0}])
+
+    def test_fractional_amount_is_a_usage_error(self):
+        status, result = self.run_cli("buy", "21", "1500.7")
+        self.assertEqual(status, 2)
+        self.assertIn("whole number", result["error"])
+        self.assertEqual(self.server.gateway.orders, {})
+
+    def test_token_file_and_usage_errors(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".token") as f:
+            f.write("from-file\n")
+            f.flush()
+            with mock.patch.dict(os.environ, {"SAXO_TOKEN": ""}):
+                self.assertEqual(cli.read_token(f.name), "from-file")
+                status, result = self.run_cli("quote", "21")
+                self.assertEqual((status, list(result)), (2, ["error"]))
+        self.assertEqual(self.run_cli("quote", "NOTAPAIR")[0], 2)
+
+    def test_profile_switch_writes_stats(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "quote.prof")
+            out = subprocess.run([sys.executable, "main.py", "--profile", path, "quote", "21"], cwd=root,
+                                 capture_output=True, text=True, env=dict(os.environ))
+            self.assertEqual(out.returncode, 0, out.stderr)
+            self.assertEqual(json.loads(out.stdout)["quotes"][0]["Uic"], 21)
+            self.assertTrue(os.path.getsize(path))
+            with open(f"{path}.txt") as f:
+                self.assertIn("cumulative", f.read())
+
+    def test_order_commands_skip_ui_imports(self):
+        code = ("import sys, bot.cli; "
+                "print([m for m in ('rich', 'textual', 'aiohttp', 'websockets', 'numpy', 'bot.core') "
+                "if m in sys.modules])")
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                             cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.assertEqual(out.stdout.strip(), "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
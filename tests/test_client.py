@@ -0,0 +1,28 @@
+import unittest
+from bot.client import SaxoClient, DEFAULT_TIMEOUT, timeout_for
+
+
+class TestSaxoClient(unittest.TestCase):
+    def setUp(self):
+        self.client = SaxoClient("token", base_url="http://localhost:9999/openapi/")
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_headers_and_base_url(self):
+        self.assertEqual(self.client.base_url, "http://localhost:9999/openapi")
+        self.assertEqual(self.client.session.headers["Authorization"], "Bearer token")
+
+    def test_timeout_for_uses_longest_prefix(self):
+        self.assertEqual(timeout_for("/trade/v2/orders"), (3.05, 15))
+        self.assertEqual(timeout_for("/port/v1/positions"), (3.05, 10))
+        self.assertEqual(timeout_for("/ref/v1/instruments"), DEFAULT_TIMEOUT)
+
+    def test_only_gets_are_retried(self):
+        retry = self.client.session.get_adapter("https://gateway.saxobank.com").max_retries
+        self.assertTrue(retry.is_retry("GET", 503))
+        self.assertFalse(retry.is_retry("POST", 503))
+
+
+if __name__ == "__main__":
+    unittest.main()
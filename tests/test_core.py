@@ -1,6 +1,11 @@
 # python -m unittest discover -s tests
 
+import os
 import unittest
+from unittest import mock
+
+from bot.client import STREAM_URL
+from bot.core import RICH_AVAILABLE, SaxoTradingBot
 from bot.utils import format_datetime
 
 class TestUtils(unittest.TestCase):
@@ -9,5 +14,49 @@ class TestUtils(unittest.TestCase):
         formatted = format_datetime(dt)
         self.assertEqual(formatted, "2024-09-01 12:34 UTC")
 
+    def test_format_datetime_with_fractional_seconds(self):
+        self.assertEqual(format_datetime("2024-03-01T08:15:02.123456Z"), "2024-03-01 08:15 UTC")
+
+
+@unittest.skipUnless(RICH_AVAILABLE, "rich not installed")
+class TestTickerRows(unittest.TestCase):
+    def test_rows_show_change_and_errors(self):
+        bot = SaxoTradingBot("token", base_url="http://127.0.0.1:9", instrument_cache="/nonexistent/instruments.json",
+                             quote_feed="")
+        prev = {}
+        bot._ticker_rows([21], {21: {"Quote": {"Bid": 1.0841, "Ask": 1.0843, "Mid": 1.0842}}}, prev, "08:00:00")
+        rows = bot._ticker_rows([21, 31], {21: {"Quote": {"Bid": 1.0842, "Ask": 1.0844, "Mid": 1.0843}}},
+                                prev, "08:00:01")
+        self.assertEqual(rows[0][:4], ("EURUSD", rows[0][1], "1.08420", "1.08440"))
+        self.assertEqual(str(rows[0][1]), "1.08430")
+        self.assertTrue(str(rows[0][4]).startswith("+0.00010"))
+        self.assertEqual((rows[1][0], str(rows[1][1]), rows[1][-1]), ("UIC 31", "ERROR", "08:00:01"))
+        self.assertEqual(prev, {21: 1.0843})
+        bot.client.close()
+
+
+class TestStreamUrl(unittest.TestCase):
+    def bot(self, base_url, **kwargs):
+        bot = SaxoTradingBot("token", base_url=base_url, instrument_cache="/nonexistent/instruments.json",
+                             quote_feed="", **kwargs)
+        bot.client.close()
+        return bot
+
+    @mock.patch.dict(os.environ, {"SAXO_STREAM_URL": ""})
+    def test_stream_follows_the_gateway(self):
+        self.assertEqual(self.bot("https://gateway.saxobank.com/sim/openapi/").stream_url, STREAM_URL)
+        self.assertEqual(self.bot("https://gateway.saxobank.com/openapi").stream_url,
+                         "wss://streaming.saxobank.com/openapi/streamingws/connect")
+        self.assertEqual(self.bot("http://127.0.0.1:9", stream_url="ws://127.0.0.1:9/connect").stream_url,
+                         "ws://127.0.0.1:9/connect")
+
+    @mock.patch.dict(os.environ, {"SAXO_STREAM_URL": ""})
+    def test_other_gateway_without_stream_url_polls(self):
+        bot = self.bot("http://127.0.0.1:9")
+        self.assertIsNone(bot.stream_url)
+        self.assertIsNone(bot.start_price_stream([21]))
+        self.assertIsNone(bot.price_stream)
+
+
 if __name__ == "__main__":
     unittest.main()
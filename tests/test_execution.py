@@ -0,0 +1,36 @@
+import threading
+import unittest
+
+from bot.execution import get_fx_prices
+
+
+class RecordingClient:
+    def __init__(self):
+        self.requested = []
+        self._lock = threading.Lock()
+
+    def get(self, path, params=None):
+        uics = [int(uic) for uic in params["Uics"].split(",")]
+        with self._lock:
+            self.requested.append(uics)
+        # The gateway does not promise to answer in request order
+        return {"Data": [{"Uic": uic, "Quote": {"Mid": uic / 10}} for uic in reversed(uics)]}
+
+
+class TestGetFxPrices(unittest.TestCase):
+    def test_keys_quotes_by_uic(self):
+        prices = get_fx_prices(RecordingClient(), "acc", [16, 21, 31])
+        self.assertEqual(prices[21]["Quote"]["Mid"], 2.1)
+        self.assertEqual(list(prices), [31, 21, 16])
+
+    def test_splits_large_watchlists_into_chunks(self):
+        client = RecordingClient()
+        uics = list(range(1, 121))
+        prices = get_fx_prices(client, "acc", uics, chunk_size=50)
+
+        self.assertEqual(sorted(len(chunk) for chunk in client.requested), [20, 50, 50])
+        self.assertEqual(sorted(prices), uics)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from bot.client import SaxoClient
+from bot.core import SaxoTradingBot
+from bot.instruments import CACHE_VERSION, InstrumentCache, fetch_instrument_details, normalise_symbol
+from bot.simulator import SimulatorServer
+
+
+class TestInstrumentCache(unittest.TestCase):
+    def setUp(self):
+        self.server = SimulatorServer(seed=1).start()
+        self.client = SaxoClient("token", base_url=self.server.base_url)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "refdata", "instruments.json")
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+        self.tmp.cleanup()
+
+    def test_normalise_symbol(self):
+        self.assertEqual(normalise_symbol("eur/usd"), "EURUSD")
+        self.assertEqual(normalise_symbol("EURUSD:xcme"), "EURUSD")
+
+    def test_fetch_follows_pages(self):
+        records = fetch_instrument_details(self.client, page_size=2)
+        self.assertEqual([record["Uic"] for record in records], [16, 17, 21, 22, 31])
+        self.assertEqual(self.server.gateway.requests, 3)
+        usdjpy = records[-1]
+        self.assertEqual((usdjpy["Symbol"], usdjpy["Decimals"], usdjpy["MinimumTradeSize"]), ("USDJPY", 3, 1000))
+
+    def test_refresh_persists_and_reloads_without_network(self):
+        cache = InstrumentCache(self.path, source=self.server.base_url)
+        self.assertTrue(cache.stale)
+        self.assertFalse(cache.load())
+        self.assertTrue(cache.refresh(self.client))
+        self.assertFalse(cache.stale)
+
+        requests = self.server.gateway.requests
+        reloaded = InstrumentCache(self.path, source=self.server.base_url)
+        self.assertTrue(reloaded.load())
+        self.assertEqual(self.server.gateway.requests, requests)
+        self.assertEqual(reloaded[31], "USDJPY")
+        self.assertEqual(reloaded.uic("usd/jpy"), 31)
+        self.assertEqual(reloaded.format_price(31, 149.8234), "149.823")
+        self.assertEqual(reloaded.format_price(21, 1.0842), "1.08420")
+
+    def test_cache_for_other_gateway_or_version_is_ignored(self):
+        InstrumentCache(self.path, source=self.server.base_url).refresh(self.client)
+        self.assertFalse(InstrumentCache(self.path, source="https://elsewhere").load())
+
+        with open(self.path) as f:
+            payload = json.load(f)
+        payload["version"] = CACHE_VERSION + 1
+        with open(self.path, "w") as f:
+            json.dump(payload, f)
+        self.assertFalse(InstrumentCache(self.path, source=self.server.base_url).load())
+
+    def test_background_refresh_when_stale(self):
+        cache = InstrumentCache(self.path, ttl=3600, source=self.server.base_url)
+        seen = []
+        cache.add_listener(lambda c: seen.append(c.fetched_at))
+        cache.start_refresh(self.client)
+        deadline = time.monotonic() + 5
+        while not seen and time.monotonic() < deadline:
+            time.sleep(0.01)
+        cache.stop_refresh()
+        self.assertTrue(os.path.exists(self.path))
+        self.assertIsNotNone(seen[0])
+
+
+class TestBotReferenceData(unittest.TestCase):
+    def test_risk_engine_uses_minimum_trade_size(self):
+        with SimulatorServer(seed=1) as server, tempfile.TemporaryDirectory() as tmp:
+            bot = SaxoTradingBot("token", base_url=server.base_url,
+                                 instrument_cache=os.path.join(tmp, "instruments.json"))
+            bot.setup()
+            bot.instruments.refresh(bot.client)
+
+            resp = bot.place_market_order(21, 500, "Buy")
+            self.assertEqual(resp["ErrorInfo"]["ErrorCode"], "Risk.min_amount")
+            self.assertIn("OrderId", bot.place_market_order(21, 1000, "Buy"))
+            bot.client.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
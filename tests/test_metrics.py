@@ -0,0 +1,65 @@
+import socket
+import unittest
+from unittest import mock
+
+from bot.client import SaxoClient
+from bot.metrics import LatencyHistogram, Metrics, connection_timings, endpoint_name
+from bot.simulator import SimulatorServer
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles_within_bucket_precision(self):
+        histogram = LatencyHistogram()
+        for ms in range(1, 1001):
+            histogram.record(ms / 1000)
+
+        self.assertEqual(histogram.count, 1000)
+        self.assertAlmostEqual(histogram.percentile(50), 0.500, delta=0.500 * 0.02)
+        self.assertAlmostEqual(histogram.percentile(99), 0.990, delta=0.990 * 0.02)
+        self.assertEqual(histogram.percentile(100), 1.0)
+
+    def test_empty(self):
+        self.assertIsNone(LatencyHistogram().percentile(50))
+
+
+class TestMetrics(unittest.TestCase):
+    def test_endpoint_name_collapses_ids(self):
+        self.assertEqual(endpoint_name("DELETE", "/trade/v1/infoprices/subscriptions/ab12/prices-9f"),
+                         "DELETE /trade/v1/infoprices/subscriptions/{id}/{id}")
+        self.assertEqual(endpoint_name("GET", "/port/v1/positions"), "GET /port/v1/positions")
+
+    def test_records_statuses_and_errors(self):
+        metrics = Metrics()
+        metrics.record("GET", "/port/v1/balances", 0.02, status=200, ttfb=0.015, received=300)
+        metrics.record("GET", "/port/v1/balances", 0.05, status=503)
+        metrics.record("GET", "/port/v1/balances", 0.10)
+
+        stats = metrics.snapshot()["endpoints"]["GET /port/v1/balances"]
+        self.assertEqual(stats["requests"], 3)
+        self.assertEqual(stats["errors"], 2)
+        self.assertEqual(stats["statuses"], {"200": 1, "503": 1})
+        self.assertEqual(stats["bytes_received"], 300)
+        self.assertEqual(stats["ttfb"]["count"], 1)
+
+
+class TestTimedConnections(unittest.TestCase):
+    def test_falls_back_to_the_next_address(self):
+        real_getaddrinfo = socket.getaddrinfo
+
+        def getaddrinfo(host, port, *args, **kwargs):
+            if host != "fxbot.test":
+                return real_getaddrinfo(host, port, *args, **kwargs)
+            # The first record refuses connections; the simulator listens on the second
+            return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (address, port))
+                    for address in ("127.0.0.2", "127.0.0.1")]
+
+        with SimulatorServer(seed=1) as server, mock.patch("socket.getaddrinfo", getaddrinfo):
+            port = server.httpd.server_address[1]
+            client = SaxoClient("token", base_url=f"http://fxbot.test:{port}", max_retries=0)
+            self.assertEqual(client.get("/port/v1/clients/me")["ClientKey"], "sim-client")
+            self.assertGreater(connection_timings.dns, 0)
+            client.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
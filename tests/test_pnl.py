@@ -0,0 +1,101 @@
+import unittest
+
+from bot.core import SaxoTradingBot
+from bot.instruments import InstrumentCache
+from bot.pnl import PnLEngine, fill_price
+from bot.simulator import SimulatorServer
+
+
+class TestPnLEngine(unittest.TestCase):
+    def setUp(self):
+        # Seeded cache: EURDKK, EURUSD, USDJPY, GBPUSD, EURGBP
+        self.pnl = PnLEngine(InstrumentCache(path="/nonexistent/instruments.json"))
+
+    def test_fill_price(self):
+        quote = {"Bid": 1.1, "Ask": 1.2}
+        self.assertEqual(fill_price({"OrderId": "1", "ExecutionPrice": 1.15}, "Buy", quote), 1.15)
+        self.assertEqual(fill_price({"OrderId": "1"}, "Buy", quote), 1.2)
+        self.assertEqual(fill_price({"OrderId": "1"}, "Sell", quote), 1.1)
+        self.assertIsNone(fill_price({"OrderId": "1"}, "Sell"))
+
+    def test_blend_partial_close_and_flip(self):
+        self.pnl.on_fill(21, 100_000, 1.10)
+        self.pnl.on_fill(21, 100_000, 1.12)
+        row = self.pnl.by_uic()[21]
+        self.assertEqual(row["amount"], 200_000)
+        self.assertAlmostEqual(row["open_price"], 1.11)
+
+        self.assertAlmostEqual(self.pnl.on_fill(21, -50_000, 1.13), 1000.0)
+        self.assertAlmostEqual(self.pnl.on_fill(21, -250_000, 1.09), -3000.0)
+        row = self.pnl.by_uic()[21]
+        self.assertEqual(row["amount"], -100_000)
+        self.assertAlmostEqual(row["open_price"], 1.09)
+        self.assertAlmostEqual(row["realized"], -2000.0)
+
+    def test_marks_longs_at_bid_shorts_at_ask_in_account_currency(self):
+        self.pnl.load({"Data": [
+            {"PositionBase": {"Uic": 21, "Amount": 100_000, "OpenPrice": 1.0}},
+            {"PositionBase": {"Uic": 17, "Amount": -100_000, "OpenPrice": 0.86}},
+        ]})
+        self.pnl.on_quote(21, {"Bid": 1.25, "Ask": 1.2502, "Mid": 1.2501})
+        self.pnl.on_quote(17, {"Bid": 0.849, "Ask": 0.85, "Mid": 0.8495})
+
+        per_uic = self.pnl.by_uic()
+        self.assertAlmostEqual(per_uic[21]["unrealized"], 25_000.0)  # USD
+        self.assertAlmostEqual(per_uic[17]["unrealized"], 1_000.0)   # GBP
+
+        # EURUSD converts the USD leg and EURGBP the GBP leg into EUR
+        totals = self.pnl.totals()
+        self.assertAlmostEqual(totals["unrealized"], 25_000 / 1.2501 + 1_000 / 0.8495)
+        self.assertEqual(sorted(self.pnl.quote_uics()), [17, 21])
+
+    def test_quotes_seen_before_the_position_are_used(self):
+        self.pnl.on_quote(31, {"Bid": 150.0, "Ask": 150.02})
+        self.pnl.on_fill(31, 100_000, 149.0)
+        self.assertAlmostEqual(self.pnl.by_uic()[31]["unrealized"], 100_000_000 / 1000)
+        self.assertAlmostEqual(self.pnl.totals()["unrealized"], 0.0)  # no EURJPY/JPYEUR pair to convert
+
+    def test_load_keeps_fills_until_positions_book_them(self):
+        self.pnl.load({"Data": [{"PositionBase": {"Uic": 21, "Amount": 100_000, "OpenPrice": 1.10,
+                                                  "SourceOrderId": "1"}}]})
+        self.pnl.apply_order(21, 100_000, "Sell", {"OrderId": "2", "ExecutionPrice": 1.12})
+        self.pnl.load({"Data": [{"PositionBase": {"Uic": 21, "Amount": 100_000, "OpenPrice": 1.10,
+                                                  "SourceOrderId": "1"}}]})
+        row = self.pnl.by_uic()[21]
+        self.assertEqual(row["amount"], 0)
+        self.assertAlmostEqual(row["realized"], 2000.0)   # realized once, not again on reload
+
+        self.pnl.apply_order(21, 50_000, "Buy", {"OrderId": "3", "ExecutionPrice": 1.11})
+        self.pnl.load({"Data": [
+            {"PositionBase": {"Uic": 21, "Amount": 100_000, "OpenPrice": 1.10, "SourceOrderId": "1"}},
+            {"PositionBase": {"Uic": 21, "Amount": -100_000, "OpenPrice": 1.12, "SourceOrderId": "2"}},
+            {"PositionBase": {"Uic": 21, "Amount": 50_000, "OpenPrice": 1.11, "SourceOrderId": "3"}},
+        ]})
+        self.assertEqual(self.pnl.by_uic()[21]["amount"], 50_000)   # each fill booked once
+
+        self.pnl.pending_ttl = 0
+        self.pnl.apply_order(21, 50_000, "Buy", {"OrderId": "4", "ExecutionPrice": 1.11})
+        self.pnl.load({"Data": []})   # never booked within pending_ttl: dropped
+        self.assertEqual(self.pnl.by_uic()[21]["amount"], 0)
+
+
+class TestBotPnL(unittest.TestCase):
+    def test_realized_from_execution_prices(self):
+        with SimulatorServer(seed=3) as server:
+            bot = SaxoTradingBot("token", base_url=server.base_url, instrument_cache="/nonexistent/instruments.json")
+            bot.setup()
+            buy = bot.place_market_order(21, 100_000, "Buy")
+            sell = bot.place_market_order(21, 100_000, "Sell")
+
+            expected = (sell["ExecutionPrice"] - buy["ExecutionPrice"]) * 100_000
+            self.assertAlmostEqual(bot.pnl.by_uic()[21]["realized"], expected)
+            requests = server.gateway.requests
+            totals = bot.portfolio_pnl()  # fetches the EURUSD rate once
+            self.assertAlmostEqual(totals["realized"], expected / bot.quotes.get(21)["Mid"])
+            bot.portfolio_pnl()
+            self.assertEqual(server.gateway.requests, requests + 1)
+            bot.client.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
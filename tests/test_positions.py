@@ -0,0 +1,61 @@
+import unittest
+from bot.positions import PositionBook
+
+
+def _position(position_id, uic, amount, order_id="o0"):
+    return {
+        "PositionId": position_id,
+        "DisplayAndFormat": {"Symbol": "EURUSD"},
+        "PositionBase": {"Uic": uic, "Amount": amount, "SourceOrderId": order_id},
+    }
+
+
+class TestPositionBook(unittest.TestCase):
+    def setUp(self):
+        self.book = PositionBook()
+        self.book.load({"Data": [_position("p1", 21, 100000), _position("p2", 21, 50000), _position("p3", 16, 10000)]})
+
+    def test_size_is_net_per_uic(self):
+        self.assertEqual(self.book.size(21), (150000, "EURUSD"))
+        self.assertEqual(self.book.size("16"), (10000, "EURUSD"))
+        self.assertEqual(self.book.size(31), (0, None))
+
+    def test_deltas_update_and_remove(self):
+        self.book.apply_delta([{"PositionId": "p1", "PositionBase": {"Amount": 40000}}])
+        self.assertEqual(self.book.size(21)[0], 90000)
+        self.assertEqual(self.book.get("p1")["DisplayAndFormat"]["Symbol"], "EURUSD")
+
+        self.book.apply_delta([{"PositionId": "p3", "__meta_deleted": True}])
+        self.assertEqual(self.book.size(16), (0, None))
+        self.assertEqual(len(self.book), 2)
+
+    def test_order_is_pending_until_position_confirms(self):
+        self.assertTrue(self.book.apply_order(21, 30000, "Sell", {"OrderId": "o9"}))
+        self.assertFalse(self.book.apply_order(21, 30000, "Sell", {"ErrorInfo": {"ErrorCode": "X"}}))
+        self.assertEqual(self.book.size(21)[0], 120000)
+
+        # The fill arrives as a new position carrying the order id; it replaces the pending amount
+        self.book.apply_delta([_position("p4", 21, -30000, order_id="o9")])
+        self.assertEqual(self.book.size(21)[0], 120000)
+
+    def test_full_load_keeps_unbooked_orders_pending(self):
+        self.book.apply_order(21, 30000, "Buy", {"OrderId": "o9"})
+        self.book.apply_order(16, 5000, "Buy", {"OrderId": "o10"})
+        self.book.load({"Data": [_position("p1", 21, 100000), _position("p4", 21, 30000, order_id="o9")]})
+        self.assertEqual(self.book.size(21)[0], 130000)   # o9 booked: counted once
+        self.assertEqual(self.book.size(16)[0], 5000)     # o10 not booked yet: still pending
+        self.assertTrue(self.book.has_pending(16))
+        self.assertFalse(self.book.has_pending(21))
+
+        self.book.pending_ttl = 0
+        self.book.load({"Data": []})
+        self.assertEqual(self.book.size(16), (0, None))
+
+    def test_pending_only_size_takes_symbol_from_instruments(self):
+        self.book.apply_order(31, 10000, "Buy", {"OrderId": "o9"})
+        self.assertEqual(self.book.size(31), (10000, None))
+        self.assertEqual(self.book.size(31, symbols={31: "USDJPY"}), (10000, "USDJPY"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+
+from bot.quotes import QuoteBook
+from bot.recorder import INDEX_STRIDE, TickRecorder, load_ticks, select_uic
+
+DAY_START = 1725148800 * 10**9  # 2024-09-01T00:00:00Z
+SECOND = 10**9
+
+
+class TestTickRecorder(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_concurrent_appends_stay_in_time_order(self):
+        recorder = TickRecorder(self.directory, block_rows=1000)
+
+        def feed(uic):
+            for i in range(2000):
+                recorder.append(uic, 1.0 + i, 1.1 + i)
+        threads = [threading.Thread(target=feed, args=(uic,)) for uic in (16, 21)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        day = recorder._day
+        recorder.close()
+
+        ts = load_ticks(self.directory, day)["ts"]
+        self.assertEqual(len(ts), 4000)
+        self.assertTrue(np.all(np.diff(ts) >= 0))
+
+    def test_grows_reopens_and_seeks_by_time(self):
+        rows = 3 * INDEX_STRIDE + 17
+        recorder = TickRecorder(self.directory, block_rows=1000)
+        for i in range(rows // 2):
+            recorder.append(21 if i % 2 else 16, 1.0 + i, 1.1 + i, ts=DAY_START + i * SECOND)
+        recorder.close()
+
+        # A second session on the same day appends after the committed rows
+        recorder = TickRecorder(self.directory, block_rows=1000)
+        for i in range(rows // 2, rows):
+            recorder.append(21 if i % 2 else 16, 1.0 + i, 1.1 + i, ts=DAY_START + i * SECOND)
+        recorder.close()
+
+        ticks = load_ticks(self.directory, "2024-09-01")
+        self.assertEqual(len(ticks["ts"]), rows)
+        np.testing.assert_allclose(ticks["mid"][:3], [1.05, 2.05, 3.05])
+
+        window = load_ticks(self.directory, "2024-09-01", start=DAY_START + 1500 * SECOND,
+                            end=DAY_START + 2500 * SECOND)
+        self.assertEqual(window["ts"][0], DAY_START + 1500 * SECOND)
+        self.assertEqual(len(window["ts"]), 1000)
+        self.assertIsInstance(window["bid"], np.memmap)
+
+        eurusd = select_uic(window, 21)
+        self.assertTrue((eurusd["uic"] == 21).all())
+        self.assertEqual(len(eurusd["uic"]), 500)
+
+    def test_records_quote_book_changes(self):
+        book = QuoteBook()
+        recorder = TickRecorder(self.directory)
+        book.add_listener(recorder.on_quote)
+
+        book.apply([{"Uic": 21, "Quote": {"Bid": 1.1, "Ask": 1.2}}])
+        book.apply([{"Uic": 21, "Quote": {"Bid": 1.1, "Ask": 1.2}}])  # unchanged, not recorded
+        book.apply([{"Uic": 21, "Quote": {"Bid": 1.15}}])
+        day = recorder._day
+        recorder.close()
+
+        ticks = load_ticks(self.directory, day)
+        np.testing.assert_allclose(ticks["bid"], [1.1, 1.15])
+        np.testing.assert_allclose(ticks["mid"], [1.15, 1.175])
+
+    def test_missing_day_is_empty(self):
+        self.assertEqual(len(load_ticks(self.directory, "2000-01-01")["ts"]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import asyncio
+import unittest
+
+from bot.execution import place_limit_order, place_market_order
+from bot.risk import RiskEngine, RiskError, currencies
+
+
+class OrderClient:
+    def __init__(self, risk, response=None):
+        self.risk = risk
+        self.posted = []
+        self.response = response or {"OrderId": "1"}
+
+    def post(self, path, json=None):
+        self.posted.append(json)
+        return self.response
+
+
+class TestRiskEngine(unittest.TestCase):
+    def setUp(self):
+        self.risk = RiskEngine(max_order_size=1_000_000, max_uic_exposure=1_500_000,
+                               max_currency_exposure=2_000_000, currency_limits={"JPY": 1e12},
+                               instruments={21: "EUR/USD", 31: "USDJPY"})
+        self.risk.on_quote(21, {"Mid": 1.10})
+        self.risk.on_quote(31, {"Mid": 150.0})
+
+    def test_currencies(self):
+        self.assertEqual(currencies("EUR/USD"), ("EUR", "USD"))
+        self.assertEqual(currencies("EURUSD"), ("EUR", "USD"))
+        self.assertIsNone(currencies("UIC 21"))
+
+    def test_accepted_order_reserves_exposure(self):
+        self.risk.check(21, 1_000_000, "Buy")
+        self.assertEqual(self.risk.exposure(21), 1_000_000)
+        self.assertEqual(self.risk.currency_exposure("EUR"), 1_000_000)
+        self.assertAlmostEqual(self.risk.currency_exposure("USD"), -1_100_000)
+
+    def test_limits(self):
+        with self.assertRaises(RiskError) as ctx:
+            self.risk.check(21, 2_000_000, "Buy")
+        self.assertEqual(ctx.exception.reason, "order_size")
+
+        self.risk.check(21, 1_000_000, "Buy")
+        with self.assertRaises(RiskError) as ctx:
+            self.risk.check(21, 600_000, "Buy")
+        self.assertEqual(ctx.exception.reason, "uic_exposure")
+        self.assertEqual(self.risk.exposure(21), 1_000_000)
+
+        # Long EURUSD is already -1.1M USD; selling 1M USDJPY would take it to -2.1M
+        with self.assertRaises(RiskError) as ctx:
+            self.risk.check(31, 1_000_000, "Sell")
+        self.assertEqual(ctx.exception.reason, "currency_exposure")
+
+        with self.assertRaises(RiskError) as ctx:
+            self.risk.check(21, 100_000, "Buy", price=1.30)
+        self.assertEqual(ctx.exception.reason, "price_band")
+        self.assertEqual(self.risk.rejected, 4)
+
+    def test_stale_quote_blocks_orders(self):
+        self.risk.max_quote_age = 5
+        self.risk.check(21, 100_000, "Buy")
+        with self.assertRaises(RiskError) as ctx:
+            self.risk.check(22, 100_000, "Buy")
+        self.assertEqual(ctx.exception.reason, "stale_quote")
+
+    def test_load_rebuilds_exposure(self):
+        self.risk.load({"Data": [{"PositionBase": {"Uic": 21, "Amount": 300_000, "OpenPrice": 1.1}}]})
+        self.risk.load({"Data": [{"PositionBase": {"Uic": 31, "Amount": -200_000, "OpenPrice": 149.0}}]})
+        self.assertEqual(self.risk.exposure(21), 0)
+        self.assertEqual(self.risk.currency_exposure("USD"), -200_000)
+        self.assertEqual(self.risk.currency_exposure("JPY"), 200_000 * 149.0)
+
+    def test_load_keeps_reservations_until_positions_book_them(self):
+        in_flight = self.risk.check(21, 500_000, "Buy")
+        accepted = self.risk.settle(self.risk.check(31, 100_000, "Buy"), {"OrderId": "9"})
+        self.risk.load({"Data": []})
+        self.assertEqual((self.risk.exposure(21), self.risk.exposure(31)), (500_000, 100_000))
+
+        self.risk.settle(in_flight, {"ErrorInfo": {"ErrorCode": "MarketClosed"}})
+        self.risk.load({"Data": [{"PositionBase": {"Uic": 31, "Amount": 100_000, "OpenPrice": 150.0,
+                                                   "SourceOrderId": "9"}}]})
+        self.assertEqual((self.risk.exposure(21), self.risk.exposure(31)), (0, 100_000))   # booked once
+        self.assertEqual(accepted, {"OrderId": "9"})
+
+        self.risk.pending_ttl = 0
+        self.risk.settle(self.risk.check(21, 200_000, "Buy"), {"OrderId": "10"})
+        self.risk.load({"Data": []})   # never booked within pending_ttl: dropped
+        self.assertEqual(self.risk.exposure(21), 0)
+
+
+class TestOrderPathChecks(unittest.TestCase):
+    def setUp(self):
+        self.risk = RiskEngine(max_order_size=1_000_000, instruments={21: "EUR/USD"})
+        self.risk.on_quote(21, {"Mid": 1.10})
+
+    def test_rejected_order_is_never_sent(self):
+        client = OrderClient(self.risk)
+        with self.assertRaises(RiskError):
+            place_limit_order(client, "acc", 21, 11.0)
+        self.assertEqual(client.posted, [])
+
+    def test_gateway_rejection_releases_reservation(self):
+        client = OrderClient(self.risk, response={"ErrorInfo": {"ErrorCode": "InsufficientFunds"}})
+        place_market_order(client, "acc", 21, 500_000, buy_sell="Buy")
+        self.assertEqual(len(client.posted), 1)
+        self.assertEqual(self.risk.exposure(21), 0)
+
+        client.response = {"OrderId": "7"}
+        place_market_order(client, "acc", 21, 500_000, buy_sell="Buy")
+        self.assertEqual(self.risk.exposure(21), 500_000)
+
+    def test_async_client_settles_after_response(self):
+        class AsyncOrderClient(OrderClient):
+            async def post(self, path, json=None):
+                return {"ErrorInfo": {"ErrorCode": "MarketClosed"}}
+
+        client = AsyncOrderClient(self.risk)
+        pending = place_market_order(client, "acc", 21, 500_000, buy_sell="Buy")
+        self.assertEqual(self.risk.exposure(21), 500_000)
+        asyncio.run(pending)
+        self.assertEqual(self.risk.exposure(21), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
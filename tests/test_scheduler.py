@@ -0,0 +1,73 @@
+import threading
+import time
+import unittest
+
+from bot.scheduler import RequestScheduler, group_for
+
+
+class TestRequestScheduler(unittest.TestCase):
+    def test_groups(self):
+        self.assertEqual(group_for("/trade/v2/orders"), "orders")
+        self.assertEqual(group_for("/trade/v1/infoprices/list"), "marketdata")
+        self.assertEqual(group_for("/port/v1/positions"), "portfolio")
+        self.assertEqual(group_for("/root/v1/sessions"), "other")
+
+    def test_orders_jump_ahead_of_queued_market_data(self):
+        # The session bucket is the shared bottleneck: one token, refilled every 50 ms
+        scheduler = RequestScheduler(session_limit=(20.0, 1))
+        scheduler.acquire("marketdata")
+        granted = []
+
+        def request(group):
+            scheduler.acquire(group)
+            granted.append(group)
+
+        pollers = [threading.Thread(target=request, args=("marketdata",)) for _ in range(3)]
+        for poller in pollers:
+            poller.start()
+        time.sleep(0.01)
+        order = threading.Thread(target=request, args=("orders",))
+        order.start()
+        for thread in pollers + [order]:
+            thread.join(2)
+
+        self.assertEqual(granted[0], "orders")
+
+    def test_rate_limit_headers_pause_the_group(self):
+        scheduler = RequestScheduler()
+        scheduler.observe("marketdata", 200, {"X-RateLimit-Session-Remaining": "0",
+                                              "X-RateLimit-Session-Reset": "0.2"})
+        self.assertFalse(scheduler.try_acquire("marketdata"))
+        self.assertTrue(scheduler.try_acquire("orders"))
+        self.assertGreaterEqual(scheduler.acquire("marketdata"), 0.1)
+
+    def test_429_uses_retry_after(self):
+        scheduler = RequestScheduler()
+        scheduler.observe("portfolio", 429, {"Retry-After": "5"})
+        self.assertEqual(scheduler.throttled, 1)
+        with self.assertRaises(TimeoutError):
+            scheduler.acquire("portfolio", timeout=0.05)
+
+    def test_identical_requests_are_coalesced(self):
+        scheduler = RequestScheduler()
+        calls = []
+        results = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.1)
+            return {"Data": []}
+
+        threads = [threading.Thread(target=lambda: results.append(scheduler.coalesce("prices", fetch)))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"Data": []}] * 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
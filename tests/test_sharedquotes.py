@@ -0,0 +1,126 @@
+import multiprocessing
+import os
+import time
+import unittest
+
+from bot.core import SaxoTradingBot
+from bot.sharedquotes import HEARTBEAT, HEARTBEAT_OFFSET, SEQ, SharedQuoteReader, SharedQuoteWriter, _slot_offset
+from bot.simulator import SimulatorServer
+
+
+def _read_in_child(name, uic, results):
+    reader = SharedQuoteReader(name)
+    results.put(reader.get(uic))
+    reader.close()
+
+
+class TestSharedQuotes(unittest.TestCase):
+    def setUp(self):
+        self.name = f"fxbot-test-{os.getpid()}"
+        self.writer = SharedQuoteWriter(self.name, capacity=8)
+
+    def tearDown(self):
+        self.writer.close()
+
+    def test_reader_sees_published_quotes(self):
+        reader = SharedQuoteReader(self.name)
+        self.assertIsNone(reader.get(21))
+        self.writer.publish(21, {"Bid": 1.08, "Ask": 1.0802})
+        self.writer.publish(31, {"Bid": 149.8, "Ask": 149.82, "Mid": 149.81})
+        self.assertEqual(reader.get(21), {"Bid": 1.08, "Ask": 1.0802, "Mid": (1.08 + 1.0802) / 2})
+        self.assertEqual(reader.snapshot([31, 99]), {31: {"Uic": 31, "Quote": {"Bid": 149.8, "Ask": 149.82,
+                                                                               "Mid": 149.81}}})
+        self.assertEqual(reader.uics(), [21, 31])
+        self.assertLess(reader.age(21), 5)
+        reader.close()
+
+    def test_reader_in_another_process(self):
+        self.writer.publish(16, {"Bid": 7.46, "Ask": 7.4602})
+        ctx = multiprocessing.get_context("spawn")
+        results = ctx.Queue()
+        child = ctx.Process(target=_read_in_child, args=(self.name, 16, results))
+        child.start()
+        quote = results.get(timeout=20)
+        child.join(20)
+        self.assertEqual(quote["Bid"], 7.46)
+        # The child detaching must not have removed the segment
+        reader = SharedQuoteReader(self.name)
+        self.assertEqual(reader.get(16)["Ask"], 7.4602)
+        reader.close()
+
+    def test_reader_rejects_slot_mid_write(self):
+        self.writer.publish(21, {"Bid": 1.08, "Ask": 1.0802})
+        reader = SharedQuoteReader(self.name, retries=3)
+        SEQ.pack_into(self.writer._buf, _slot_offset(0), 3)  # odd: writer is mid-update
+        with self.assertRaises(RuntimeError):
+            reader.read(21)
+        SEQ.pack_into(self.writer._buf, _slot_offset(0), 4)
+        self.assertEqual(reader.read(21)[0], 1.08)
+        reader.close()
+
+    def test_second_writer_fails_unless_told_the_segment_is_stale(self):
+        self.writer.publish(21, {"Bid": 1.08, "Ask": 1.0802})
+        with self.assertRaises(FileExistsError):
+            SharedQuoteWriter(self.name, capacity=8)
+        reader = SharedQuoteReader(self.name)
+        self.assertEqual(reader.get(21)["Bid"], 1.08)   # the live feed's segment is untouched
+        reader.close()
+
+        # The first feed dies without unlinking; a takeover starts from an empty book
+        self.writer._buf = None
+        self.writer.shm.close()
+        self.writer = SharedQuoteWriter(self.name, capacity=8, replace_stale=True)
+        reader = SharedQuoteReader(self.name)
+        self.assertIsNone(reader.get(21))
+        reader.close()
+
+    def test_full_book(self):
+        for uic in range(8):
+            self.writer.publish(uic + 1, {"Mid": 1.0})
+        with self.assertRaises(ValueError):
+            self.writer.publish(100, {"Mid": 1.0})
+
+    def test_bot_reads_feed_without_gateway_calls(self):
+        with SimulatorServer(seed=1) as server:
+            bot = SaxoTradingBot("token", base_url=server.base_url, quote_feed=self.name)
+            self.writer.publish(21, {"Bid": 1.08, "Ask": 1.0802})
+            prices = bot.get_prices([21])
+            self.assertEqual(prices[21]["Quote"]["Bid"], 1.08)
+            self.assertEqual(bot.quotes.get(21)["Ask"], 1.0802)
+            self.assertEqual(server.gateway.requests, 0)
+
+            bot.get_prices([21, 31])  # 31 is not on the feed: falls back to the gateway
+            self.assertEqual(server.gateway.requests, 1)
+            bot.quote_feed.close()
+            bot.client.close()
+
+    def test_bot_passes_over_stale_feed_quotes(self):
+        with SimulatorServer(seed=1) as server:
+            bot = SaxoTradingBot("token", base_url=server.base_url, quote_feed=self.name, quote_feed_max_age=5)
+            self.writer.publish(21, {"Bid": 1.08, "Ask": 1.0802})
+            HEARTBEAT.pack_into(self.writer._buf, HEARTBEAT_OFFSET, time.time() - 60)
+            self.assertGreater(bot.quote_feed.feed_age(), 5)
+            self.assertEqual(bot.quote_feed.snapshot([21], max_age=5), {})
+
+            prices = bot.get_prices([21])  # the daemon stopped a minute ago: ask the gateway
+            self.assertEqual(server.gateway.requests, 1)
+            self.assertNotEqual(prices[21]["Quote"]["Bid"], 1.08)
+            bot.quote_feed.close()
+            bot.client.close()
+
+    def test_unchanged_quote_stays_fresh_while_the_feed_beats(self):
+        reader = SharedQuoteReader(self.name)
+        self.writer.publish(16, {"Bid": 7.46, "Ask": 7.4602})
+        for _ in range(3):
+            time.sleep(0.1)
+            self.writer.heartbeat()   # the daemon loop: nothing changed, nothing published
+        self.assertGreater(reader.age(16), 0.25)
+        self.assertEqual(reader.snapshot([16], max_age=0.2)[16]["Quote"]["Bid"], 7.46)
+
+        time.sleep(0.25)              # the daemon died
+        self.assertEqual(reader.snapshot([16], max_age=0.2), {})
+        reader.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
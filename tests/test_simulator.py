@@ -0,0 +1,53 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+from bot.core import SaxoTradingBot
+from bot.simulator import ACCOUNT_KEY, CLIENT_KEY, SimulatorServer
+
+
+class TestBotAgainstSimulator(unittest.TestCase):
+    def setUp(self):
+        self.server = SimulatorServer(seed=1).start()
+        self.bot = SaxoTradingBot("token", base_url=self.server.base_url)
+
+    def tearDown(self):
+        self.bot.client.close()
+        self.server.stop()
+
+    def test_setup_order_and_positions_round_trip(self):
+        self.bot.setup()
+        self.assertEqual((self.bot.client_key, self.bot.account_key), (CLIENT_KEY, ACCOUNT_KEY))
+
+        prices = self.bot.get_prices([21, 31])
+        self.assertLess(prices[21]["Quote"]["Bid"], prices[21]["Quote"]["Ask"])
+
+        resp = self.bot.place_market_order(21, 100000, "Buy")
+        self.assertIn("OrderId", resp)
+        self.assertEqual(self.bot.get_position_size(21)[0], 100000)
+
+        self.bot.positions.refresh(self.bot.client, self.bot.client_key)
+        self.assertEqual(self.bot.get_position_size(21), (100000, "EURUSD"))
+
+    def test_buy_then_manage_immediately(self):
+        self.bot.setup()
+        self.bot.positions.refresh(self.bot.client, self.bot.client_key)  # as run() does before the menu
+        self.bot.place_market_order(21, 100000, "Buy")
+        self.assertEqual(self.bot.get_position_size(21), (100000, "EURUSD"))
+
+        out = io.StringIO()
+        with mock.patch("builtins.input", return_value="n"), redirect_stdout(out):
+            self.bot.manage_position(21)
+        self.assertIn("Size: 100,000", out.getvalue())
+        self.assertNotIn("No open position", out.getvalue())
+
+    def test_injected_errors_are_retried_for_gets(self):
+        self.server.gateway.error_rate = 1.0
+        self.bot.client.session.get_adapter(self.server.base_url).max_retries.backoff_factor = 0
+        self.assertEqual(self.bot.get_prices([21]), {})
+        self.assertEqual(self.server.gateway.requests, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import asyncio
+import json
+import os
+import unittest
+
+from websockets.asyncio.server import serve
+
+from bot.streaming import PriceStream, decode_messages, encode_message
+
+with open(os.path.join(os.path.dirname(__file__), "data", "price_deltas.json")) as f:
+    RECORDED = json.load(f)
+
+
+class FakeRestClient:
+    """Stands in for SaxoClient's subscription endpoints"""
+    headers = {"Authorization": "Bearer token"}
+
+    def __init__(self):
+        self.references = []
+        self.deleted = []
+
+    def post(self, path, json=None):
+        self.references.append(json["ReferenceId"])
+        return {"Snapshot": {"Data": RECORDED["snapshot"]}}
+
+    def delete(self, path):
+        self.deleted.append(path)
+
+
+class FailingRestClient(FakeRestClient):
+    """Answers the first subscription with an empty body, then an error, then succeeds"""
+
+    def __init__(self):
+        super().__init__()
+        self.responses = [None, {"ErrorInfo": {"ErrorCode": "ServiceUnavailable", "Message": "try later"}}]
+
+    def post(self, path, json=None):
+        if self.responses:
+            return self.responses.pop(0)
+        return super().post(path, json=json)
+
+
+class ReplayServer:
+    """Local websocket that replays the recorded deltas, dropping the first connection halfway"""
+
+    def __init__(self, rest):
+        self.rest = rest
+        self.connections = 0
+        self.message_id = 0
+
+    async def _reference(self, count):
+        while len(self.rest.references) < count:
+            await asyncio.sleep(0.01)
+        return self.rest.references[-1]
+
+    async def _send(self, ws, reference_id, payload):
+        self.message_id += 1
+        await ws.send(encode_message(self.message_id, reference_id, payload))
+
+    async def handler(self, ws):
+        self.connections += 1
+        reference_id = await self._reference(self.connections)
+        deltas = RECORDED["deltas"]
+        half = len(deltas) // 2
+
+        await self._send(ws, "_heartbeat", [{"ReferenceId": "_heartbeat", "Heartbeats": []}])
+        for delta in (deltas[:half] if self.connections == 1 else deltas[half:]):
+            await self._send(ws, reference_id, delta)
+        if self.connections == 1:
+            return
+        await ws.wait_closed()
+
+
+class TestFrames(unittest.TestCase):
+    def test_round_trip(self):
+        frame = encode_message(7, "prices-1", [{"Uic": 21}]) + encode_message(8, "_heartbeat", [])
+        self.assertEqual(list(decode_messages(frame)), [(7, "prices-1", [{"Uic": 21}]), (8, "_heartbeat", [])])
+
+
+class TestPriceStream(unittest.IsolatedAsyncioTestCase):
+    async def test_replays_deltas_and_resubscribes_after_drop(self):
+        rest = FakeRestClient()
+        server = ReplayServer(rest)
+        async with serve(server.handler, "127.0.0.1", 0) as ws_server:
+            port = ws_server.sockets[0].getsockname()[1]
+            stream = PriceStream(rest, "acc", [21, 31], stream_url=f"ws://127.0.0.1:{port}/connect",
+                                 reconnect_delay=0.01)
+            task = asyncio.create_task(stream.run())
+
+            for _ in range(200):
+                if stream.last_message_id == server.message_id and server.connections == 2 \
+                        and stream.book.get(31)["Bid"] == 149.818:
+                    break
+                await asyncio.sleep(0.01)
+
+            stream._stopping = True
+            await stream._ws.close()
+            await task
+
+        self.assertEqual(stream.reconnects, 1)
+        self.assertEqual(len(rest.references), 2)
+        self.assertEqual(stream.book.get(21), {"Bid": 1.0842, "Ask": 1.08433, "Mid": 1.084265})
+        self.assertEqual(stream.book.get(31), {"Bid": 149.818, "Ask": 149.832, "Mid": 149.825})
+        self.assertEqual(len(rest.deleted), 2)
+
+    async def test_failed_subscribe_backs_off_and_retries(self):
+        rest = FailingRestClient()
+
+        async def handler(ws):
+            await ws.wait_closed()
+
+        async with serve(handler, "127.0.0.1", 0) as ws_server:
+            port = ws_server.sockets[0].getsockname()[1]
+            stream = PriceStream(rest, "acc", [21, 31], stream_url=f"ws://127.0.0.1:{port}/connect",
+                                 reconnect_delay=0.01)
+            task = asyncio.create_task(stream.run())
+
+            for _ in range(200):
+                if stream.connected:
+                    break
+                await asyncio.sleep(0.01)
+
+            stream._stopping = True
+            await stream._ws.close()
+            await task
+
+        self.assertEqual(stream.reconnects, 2)
+        self.assertEqual(len(rest.references), 1)
+        self.assertEqual(stream.book.get(21), {"Bid": 1.08412, "Ask": 1.08425, "Mid": 1.084185})
+        # Only the subscription that was actually created gets deleted
+        self.assertEqual(len(rest.deleted), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()